@@ -0,0 +1 @@
+"""Shared data layer for the Axelar dashboard pages."""
@@ -0,0 +1,356 @@
+"""Persisted address → (dataset, partition, row range) index over the local Parquet store.
+
+Answering "what did this address do?" from the day partitions alone means
+scanning every file of every dataset. The index instead holds, for every
+address, the runs of consecutive rows it owns in each day partition:
+
+    address | dataset | date | row_start | row_stop
+
+sorted by address and written in small row groups, so a lookup reads only the
+row groups whose min/max statistics bracket the address. The rows themselves
+are then taken by position from just the partitions listed, read concurrently.
+
+Each partition is indexed along with its file's mtime and size. A refresh
+re-indexes only the partitions that are new or were rewritten by
+``dashboard.extract`` since, and drops the ones that disappeared. A partition
+rewritten after the last refresh is still answered correctly, by filtering it
+on the address instead of taking rows by position.
+
+Addresses are compared lowercased, so checksummed and plain EVM addresses
+match.
+
+Usage:
+    python -m dashboard.address_index [--root ./data] [--path ./data/_indexes/address_index.parquet] [--rebuild]
+
+Configuration (environment):
+    AXELAR_ADDRESS_INDEX_PATH              index file (default ``<AXELAR_PARQUET_ROOT>/_indexes/address_index.parquet``);
+                                           the index is off when neither is set
+    AXELAR_ADDRESS_INDEX_REFRESH_SECONDS   minimum time between refreshes triggered by page reads (default 300)
+    AXELAR_ADDRESS_INDEX_THREADS           partitions read concurrently by a lookup (default 8)
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from dashboard.parquet_store import DATASETS, PARTITION_KEY, parquet_store
+from dashboard.squid import SQUID_CONTRACTS, symbol
+
+REFRESH_SECONDS = float(os.environ.get("AXELAR_ADDRESS_INDEX_REFRESH_SECONDS", "300"))
+THREADS = int(os.environ.get("AXELAR_ADDRESS_INDEX_THREADS", "8"))
+PARTITIONS_KEY = b"axelar.partitions"
+ROW_GROUP_ROWS = 16384
+
+# The column holding the acting address of each dataset. Squid token
+# transfers are sent by the router, so their user is the recipient.
+ADDRESS_COLUMNS = {
+    "core_transactions": "tx_from",
+    "satellite": "sender",
+    "transfers": "recipient_address",
+    "squid_gmp": "user",
+}
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _row_runs(addresses):
+    """Runs of consecutive rows per address: DataFrame of address, row_start, row_stop (exclusive)."""
+    import pandas as pd
+
+    frame = pd.DataFrame({"address": addresses, "row": np.arange(len(addresses))}).dropna()
+    frame = frame.sort_values(["address", "row"], kind="stable", ignore_index=True)
+    address, row = frame["address"].to_numpy(), frame["row"].to_numpy()
+    starts = np.ones(len(frame), dtype=bool)
+    starts[1:] = (address[1:] != address[:-1]) | (row[1:] != row[:-1] + 1)
+    first = np.flatnonzero(starts)
+    last = np.append(first[1:], len(frame)) - 1
+    return pd.DataFrame({"address": address[first], "row_start": row[first], "row_stop": row[last] + 1})
+
+
+class AddressIndex:
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self.partitions = {}  # "dataset/date" -> signature of the partition file when it was indexed
+        self._checked = 0.0
+
+    # --- Storage --------------------------------------------------------------------------------------------------
+    def _load(self):
+        """(Re)read the partition signatures when another process or a refresh replaced the file."""
+        import pyarrow.parquet as pq
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        metadata = pq.read_schema(self.path).metadata or {}
+        self.partitions = json.loads(metadata.get(PARTITIONS_KEY, b"{}"))
+        self._loaded_mtime = mtime
+
+    def _save(self, frame, partitions):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), PARTITIONS_KEY: json.dumps(partitions).encode()}
+        table = table.replace_schema_metadata(metadata)
+        pq.write_table(table, self.path + ".tmp", compression="zstd", row_group_size=ROW_GROUP_ROWS)
+        os.replace(self.path + ".tmp", self.path)
+
+    # --- Refresh --------------------------------------------------------------------------------------------------
+    def _partition_file(self, dataset, day):
+        return os.path.join(self.root, dataset, f"{PARTITION_KEY}={day}", "part-0.parquet")
+
+    def _scan(self):
+        """Signature of every partition file currently in the store, by ``dataset/date``."""
+        found = {}
+        for dataset in ADDRESS_COLUMNS:
+            base = os.path.join(self.root, dataset)
+            if not os.path.isdir(base):
+                continue
+            for entry in os.listdir(base):
+                if not entry.startswith(f"{PARTITION_KEY}="):
+                    continue
+                day = entry.split("=", 1)[1]
+                path = self._partition_file(dataset, day)
+                if os.path.exists(path):
+                    found[f"{dataset}/{day}"] = _signature(path)
+        return found
+
+    def _index_partition(self, key):
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        dataset, day = key.split("/")
+        column = pq.read_table(self._partition_file(dataset, day), columns=[ADDRESS_COLUMNS[dataset]]).column(0)
+        runs = _row_runs(pc.utf8_lower(column).to_numpy(zero_copy_only=False))
+        return runs.assign(dataset=dataset, date=day)
+
+    def refresh(self, rebuild=False, log=None):
+        """Index the partitions added or rewritten since the last refresh and persist the index."""
+        import pandas as pd
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            self._load()
+            indexed = {} if rebuild else dict(self.partitions)
+            found = self._scan()
+            stale = {key for key, signature in indexed.items() if found.get(key) != signature}
+            fresh = [key for key, signature in found.items() if indexed.get(key) != signature]
+            self._checked = time.monotonic()
+            if not stale and not fresh and os.path.exists(self.path):
+                if log:
+                    log(f"{self.path}: up to date over {len(found):,} partitions")
+                return
+            if indexed and os.path.exists(self.path):
+                kept = pq.read_table(self.path).to_pandas()
+                kept = kept[~(kept["dataset"].astype(str) + "/" + kept["date"].astype(str)).isin(stale)]
+            else:
+                kept = pd.DataFrame(columns=["address", "row_start", "row_stop", "dataset", "date"])
+            with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+                added = list(pool.map(self._index_partition, sorted(fresh)))
+            merged = pd.concat([kept, *added], ignore_index=True)
+            merged = merged.astype({"address": "string", "row_start": "int32", "row_stop": "int32", "dataset": "category", "date": "string"})
+            merged = merged.sort_values("address", kind="stable", ignore_index=True)
+            self._save(merged[["address", "dataset", "date", "row_start", "row_stop"]], found)
+            self.partitions = found
+            self._loaded_mtime = os.stat(self.path).st_mtime_ns
+        if log:
+            log(f"{self.path}: {len(merged):,} runs over {len(found):,} partitions ({len(fresh):,} indexed, {len(stale - set(fresh)):,} dropped)")
+
+    def current(self):
+        """The index, refreshed first when it has not been refreshed lately."""
+        if time.monotonic() - self._checked >= REFRESH_SECONDS:
+            self.refresh()
+        return self
+
+    # --- Lookup ---------------------------------------------------------------------------------------------------
+    def runs(self, address):
+        """Row runs of ``address``: DataFrame of dataset, date, row_start, row_stop."""
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            self._load()
+        if self._loaded_mtime is None:
+            return None
+        table = pq.read_table(self.path, filters=ds.field("address") == address.strip().lower())
+        return table.drop(["address"]).to_pandas()
+
+    def _read_partition(self, address, dataset, day, runs):
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        path = self._partition_file(dataset, day)
+        columns = DATASETS[dataset]["columns"]
+        try:
+            rewritten = _signature(path) != self.partitions.get(f"{dataset}/{day}")
+        except FileNotFoundError:
+            return None
+        if rewritten:
+            table = pq.read_table(path, columns=columns, filters=pc.utf8_lower(ds.field(ADDRESS_COLUMNS[dataset])) == address)
+        else:
+            rows = np.concatenate([np.arange(start, stop) for start, stop in zip(runs["row_start"], runs["row_stop"])])
+            table = pq.read_table(path, columns=columns).take(rows)
+        return table.to_pandas().assign(**{PARTITION_KEY: datetime.date.fromisoformat(day)})
+
+    def history(self, address):
+        """Every indexed row of ``address``, per dataset, as DataFrames with the partition ``date``."""
+        import pandas as pd
+
+        address = address.strip().lower()
+        runs = self.runs(address)
+        if runs is None or not len(runs):
+            return {}
+        groups = list(runs.groupby(["dataset", "date"], observed=True, sort=True))
+        with concurrent.futures.ThreadPoolExecutor(THREADS) as pool:
+            parts = pool.map(lambda item: (item[0][0], self._read_partition(address, *item[0], item[1])), groups)
+            frames = {}
+            for dataset, frame in parts:
+                if frame is not None:
+                    frames.setdefault(dataset, []).append(frame)
+        return {dataset: pd.concat(parts, ignore_index=True) for dataset, parts in frames.items()}
+
+
+# --- Products -------------------------------------------------------------------------------------------------------
+def _path(frame):
+    return frame["source_chain"].astype(str) + "➡" + frame["destination_chain"].astype(str)
+
+
+def _contains(values, needles):
+    lowered = values.fillna("").str.lower()
+    return np.logical_or.reduce([lowered.str.contains(needle.lower(), regex=False) for needle in needles])
+
+
+def _bridge_amounts(bridges):
+    """USD amounts of the bridge transfers, from the Axelarscan transfers on the same tx hash and day."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    days = sorted(set(bridges[PARTITION_KEY]))
+    hashes = sorted(set(bridges["tx_hash"].dropna()))
+    if not hashes:
+        return bridges.assign(amount_usd=np.nan)
+    amounts = parquet_store.read(
+        "transfers", days[0], days[-1], columns=["tx_hash", "amount_usd"],
+        filter=ds.field(PARTITION_KEY).isin(pa.array(days, pa.date32())) & ds.field("tx_hash").isin(hashes)
+    )
+    amounts = amounts.drop(columns=[PARTITION_KEY]).drop_duplicates("tx_hash")
+    return bridges.merge(amounts, on="tx_hash", how="left")
+
+
+def activity(history):
+    """The looked-up rows as one event table per product: Core, Satellite and Squid."""
+    import pandas as pd
+
+    out = {}
+    core = history.get("core_transactions")
+    if core is not None:
+        out["Core"] = pd.DataFrame({
+            "Time": pd.to_datetime(core["block_timestamp"]),
+            "Transaction": core["tx_id"],
+            "Succeeded": core["tx_succeeded"],
+            "Fee (AXL)": core["fee"],
+        })
+    bridges = history.get("satellite")
+    if bridges is not None:
+        bridges = _bridge_amounts(bridges)
+        out["Satellite"] = pd.DataFrame({
+            "Time": pd.to_datetime(bridges["block_timestamp"]),
+            "Transaction": bridges["tx_hash"],
+            "Path": _path(bridges),
+            "Token": bridges["token_symbol"],
+            "Volume ($USD)": bridges["amount_usd"],
+        })
+    swaps = []
+    transfers = history.get("transfers")
+    if transfers is not None:
+        swaps.append(transfers[_contains(transfers["sender_address"], SQUID_CONTRACTS)].assign(service="Token Transfers"))
+    gmp = history.get("squid_gmp")
+    if gmp is not None:
+        gmp = gmp[_contains(gmp["contract_address"], SQUID_CONTRACTS)]
+        swaps.append(gmp.assign(
+            service="GMP", source_chain=gmp["source_chain"].str.lower(), destination_chain=gmp["destination_chain"].str.lower()
+        ))
+    swaps = [frame for frame in swaps if len(frame)]
+    if swaps:
+        swaps = pd.concat(swaps, ignore_index=True)
+        out["Squid"] = pd.DataFrame({
+            "Time": pd.to_datetime(swaps["created_at"]),
+            "Transaction": swaps["id"],
+            "Service": swaps["service"],
+            "Path": _path(swaps),
+            "Token": symbol(swaps["raw_asset"]),
+            "Volume ($USD)": swaps["amount_usd"],
+            "Fee ($USD)": swaps["fee"],
+        })
+    return {product: frame.sort_values("Time", ascending=False, ignore_index=True) for product, frame in out.items()}
+
+
+def summary(products):
+    """One row of summary metrics per product of ``activity()``."""
+    import pandas as pd
+
+    rows = []
+    for product, frame in products.items():
+        time = frame["Time"]
+        rows.append({
+            "Product": product,
+            "Transactions": frame["Transaction"].nunique(),
+            "Active Days": time.dt.date.nunique(),
+            "First Seen": time.min(),
+            "Last Seen": time.max(),
+            "Volume ($USD)": frame["Volume ($USD)"].sum() if "Volume ($USD)" in frame else None,
+            "Unique Paths": frame["Path"].nunique() if "Path" in frame else None,
+            "Tokens": frame["Token"].nunique() if "Token" in frame else None,
+            "Failed": int((~frame["Succeeded"].astype(bool)).sum()) if "Succeeded" in frame else None,
+        })
+    return pd.DataFrame(rows, columns=[
+        "Product", "Transactions", "Active Days", "First Seen", "Last Seen", "Volume ($USD)", "Unique Paths", "Tokens", "Failed",
+    ])
+
+
+def _default_path():
+    path = os.environ.get("AXELAR_ADDRESS_INDEX_PATH")
+    if path:
+        return path
+    root = os.environ.get("AXELAR_PARQUET_ROOT")
+    return os.path.join(root, "_indexes", "address_index.parquet") if root else None
+
+
+def _from_env():
+    path = _default_path()
+    return AddressIndex(path, parquet_store.root) if path and parquet_store is not None else None
+
+
+address_index = _from_env()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=os.environ.get("AXELAR_PARQUET_ROOT"), help="dataset root (default: $AXELAR_PARQUET_ROOT)")
+    parser.add_argument("--path", default=_default_path(), help="index file (default: $AXELAR_ADDRESS_INDEX_PATH)")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every partition instead of the changed ones")
+    args = parser.parse_args(argv)
+    if not args.root or not args.path:
+        parser.error("--root and --path (or AXELAR_PARQUET_ROOT) are required")
+
+    AddressIndex(args.path, args.root).refresh(rebuild=args.rebuild, log=print)
+
+
+if __name__ == "__main__":
+    main()
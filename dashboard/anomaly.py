@@ -0,0 +1,257 @@
+"""Anomaly flags from incrementally maintained rolling statistics.
+
+Each monitored series keeps a rolling window of its last ``WINDOW`` daily
+values (with their running sum and sum of squares) and an exponentially
+weighted mean and variance. A new day updates all of them in O(1); nothing is
+recomputed over the series. A day is scored against the state before it is
+folded in. It is anomalous when it lies more than ``Z_THRESHOLD`` rolling
+standard deviations from the rolling mean, once ``MIN_HISTORY`` days have been
+seen.
+
+The last day of a result is still filling up: it is scored but not folded in,
+and is folded once a later day arrives. Folding only ever takes the days after
+the last folded one, so handing a monitor the same (cached) result on every
+rerun costs nothing.
+
+The monitors are process-wide and only fed by their own sources, so what they
+hold does not depend on what any visitor looks at; a page scoring its own date
+range uses ``Monitor.score``, which folds into a fresh state it then drops.
+The current state (the latest reading of every series) is served at
+``GET /anomalies`` by ``dashboard.api`` and exported as Prometheus gauges for
+alerting.
+
+Configuration (environment):
+    AXELAR_ANOMALY_WINDOW         days in the rolling window (default 28)
+    AXELAR_ANOMALY_ALPHA          smoothing factor of the EWMA (default 0.1)
+    AXELAR_ANOMALY_Z              z-score above which a day is anomalous (default 3)
+    AXELAR_ANOMALY_MIN_HISTORY    days seen before any day is flagged (default 14)
+    AXELAR_ANOMALY_PATH_DAYS      trailing days of Squid path volumes monitored (default 120)
+"""
+import collections
+import datetime
+import math
+import os
+import threading
+
+WINDOW = int(os.environ.get("AXELAR_ANOMALY_WINDOW", "28"))
+ALPHA = float(os.environ.get("AXELAR_ANOMALY_ALPHA", "0.1"))
+Z_THRESHOLD = float(os.environ.get("AXELAR_ANOMALY_Z", "3"))
+MIN_HISTORY = int(os.environ.get("AXELAR_ANOMALY_MIN_HISTORY", "14"))
+PATH_DAYS = int(os.environ.get("AXELAR_ANOMALY_PATH_DAYS", "120"))
+
+Reading = collections.namedtuple("Reading", "day value expected std ewma zscore anomalous")
+
+
+# --- Rolling statistics -------------------------------------------------------------------------------------------
+class RollingStats:
+    """Rolling mean and variance over the last ``window`` values plus an EWMA, each updated in O(1)."""
+
+    __slots__ = ("window", "alpha", "values", "total", "squares", "ewma", "ewvar", "seen")
+
+    def __init__(self, window=WINDOW, alpha=ALPHA):
+        self.window = window
+        self.alpha = alpha
+        self.values = collections.deque(maxlen=window)
+        self.total = 0.0
+        self.squares = 0.0
+        self.ewma = None
+        self.ewvar = 0.0
+        self.seen = 0
+
+    def score(self, day, value):
+        """Reading of ``value`` against the current state, without folding it in."""
+        value = float(value)
+        count = len(self.values)
+        mean = self.total / count if count else math.nan
+        variance = max(self.squares / count - mean * mean, 0.0) if count else math.nan
+        std = math.sqrt(variance) if count > 1 else math.nan
+        zscore = (value - mean) / std if std and std == std else math.nan
+        anomalous = bool(self.seen >= MIN_HISTORY and zscore == zscore and abs(zscore) >= Z_THRESHOLD)
+        ewma = self.ewma if self.ewma is not None else math.nan
+        return Reading(day, value, mean, std, ewma, zscore, anomalous)
+
+    def push(self, value):
+        value = float(value)
+        if len(self.values) == self.window:
+            evicted = self.values[0]
+            self.total -= evicted
+            self.squares -= evicted * evicted
+        self.values.append(value)
+        self.total += value
+        self.squares += value * value
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            delta = value - self.ewma
+            self.ewma += self.alpha * delta
+            self.ewvar = (1 - self.alpha) * (self.ewvar + self.alpha * delta * delta)
+        self.seen += 1
+
+
+class Series:
+    """One monitored series: its rolling state and the reading of every day scored so far."""
+
+    def __init__(self):
+        self.stats = RollingStats()
+        self.folded = None  # last day folded into the state
+        self.readings = {}
+        self.open = None    # reading of the still-filling last day
+
+    def fold(self, days, values):
+        """Fold the days after the last folded one; ``days`` ascending, the last one still open."""
+        for day, value in zip(days[:-1], values[:-1]):
+            if self.folded is not None and day <= self.folded:
+                continue
+            self.readings[day] = self.stats.score(day, value)
+            self.stats.push(value)
+            self.folded = day
+        if len(days) and (self.folded is None or days[-1] > self.folded):
+            self.open = self.stats.score(days[-1], values[-1])
+
+    def latest(self):
+        if self.open is not None:
+            return self.open
+        return self.readings[self.folded] if self.folded is not None else None
+
+
+# --- Monitors -----------------------------------------------------------------------------------------------------
+class Monitor:
+    """Series of ``value`` per ``date`` (and per ``by`` group) in the frames returned by ``source()``."""
+
+    def __init__(self, name, source, date, value, by=None):
+        self.name = name
+        self.source = source
+        self.date = date
+        self.value = value
+        self.by = by
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def update(self, frame=None):
+        """Fold ``frame`` (or a fresh ``source()`` result) into the series."""
+        frame = self.source() if frame is None else frame
+        if not len(frame):
+            return
+        table, last = self._daily(frame)
+        with self._lock:
+            self._fold(self.series, table, last)
+
+    def score(self, frame):
+        """Latest reading of every series of ``frame`` alone, from a fresh state that is not kept.
+
+        For a page's own date range: the process-wide series stay as ``source()`` feeds them.
+        """
+        series = {}
+        if len(frame):
+            self._fold(series, *self._daily(frame))
+        return self._state(series)
+
+    def _daily(self, frame):
+        """Total ``value`` per group and day of ``frame``, and its last day."""
+        import pandas as pd
+
+        days = pd.to_datetime(frame[self.date]).dt.date
+        values = pd.to_numeric(frame[self.value], errors="coerce").fillna(0.0).astype("float64")
+        groups = frame[self.by].astype(str) if self.by else pd.Series("", index=frame.index)
+        table = pd.DataFrame({"group": groups, "day": days, "value": values})
+        return table.groupby(["group", "day"], as_index=False, sort=True)["value"].sum(), days.max()
+
+    @staticmethod
+    def _fold(series_by_group, table, last):
+        import numpy as np
+        import pandas as pd
+
+        for group, rows in table.groupby("group", sort=False):
+            series = series_by_group.setdefault(group, Series())
+            first = rows["day"].iloc[0] if series.folded is None else series.folded
+            # Days without a row are days with nothing: zeros, up to the open day.
+            span = pd.date_range(first, last, freq="D").date
+            filled = rows.set_index("day")["value"].reindex(span, fill_value=0.0)
+            series.fold(list(span), filled.to_numpy(dtype=np.float64))
+
+    def readings(self, frame=None):
+        """Readings of every day scored so far (after folding ``frame``, if given) as a DataFrame."""
+        import pandas as pd
+
+        if frame is not None:
+            self.update(frame)
+        rows = []
+        with self._lock:
+            for group, series in self.series.items():
+                scored = list(series.readings.values()) + ([series.open] if series.open is not None else [])
+                rows.extend((group, *reading) for reading in scored)
+        out = pd.DataFrame(rows, columns=["group", *Reading._fields])
+        out["day"] = pd.to_datetime(out["day"])
+        return out
+
+    def state(self):
+        """Latest reading of every series, as JSON-ready dicts."""
+        with self._lock:
+            return self._state(self.series)
+
+    def _state(self, series_by_group):
+        latest = [(group, series.latest()) for group, series in series_by_group.items()]
+        return [
+            {
+                "monitor": self.name,
+                "series": group or self.name,
+                **{field: _json(value) for field, value in reading._asdict().items()},
+            }
+            for group, reading in latest if reading is not None
+        ]
+
+
+def _json(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return None if isinstance(value, float) and value != value else value
+
+
+def _path_volumes():
+    from dashboard.loaders.squid import load_daily_path_volumes
+
+    today = datetime.date.today()
+    return load_daily_path_volumes(today - datetime.timedelta(days=PATH_DAYS), today)
+
+
+def _loader(name):
+    def source():
+        from dashboard.loaders import user_behaviour
+
+        return getattr(user_behaviour, name)()
+    return source
+
+
+MONITORS = {
+    "failed_transactions": Monitor(
+        "failed_transactions", _loader("load_failed_transactions"), "Date", "Failed Transactions"
+    ),
+    "transaction_fees": Monitor("transaction_fees", _loader("load_txns_fees"), "Date", "Transaction Fees"),
+    "path_volume": Monitor("path_volume", _path_volumes, "Date", "Volume", by="Path"),
+}
+
+
+def state(refresh=False):
+    """Latest reading of every monitored series; ``refresh`` folds in the sources' current results first."""
+    if refresh:
+        for monitor in MONITORS.values():
+            monitor.update()
+    return [reading for monitor in MONITORS.values() for reading in monitor.state()]
+
+
+# --- Charts -------------------------------------------------------------------------------------------------------
+def mark_anomalies(fig, readings, name="Anomaly"):
+    """Add the anomalous ``readings`` to ``fig`` as red markers."""
+    import plotly.graph_objects as go
+
+    flagged = readings[readings["anomalous"]]
+    fig.add_trace(go.Scatter(
+        x=flagged["day"],
+        y=flagged["value"],
+        mode="markers",
+        name=name,
+        marker=dict(color="red", size=10, symbol="x"),
+        customdata=flagged[["expected", "zscore"]],
+        hovertemplate="%{x}<br>%{y:,.0f} (expected %{customdata[0]:,.0f}, z=%{customdata[1]:.1f})<extra></extra>"
+    ))
+    return fig
@@ -0,0 +1,295 @@
+"""Headless HTTP API serving the page loaders' results without rendering a page.
+
+Usage:
+    python -m dashboard.api [--host 127.0.0.1] [--port 8502]
+
+    GET /                                   list the endpoints and their parameters
+    GET /squid/kpis?timeframe=month&start_date=2024-01-01&end_date=2024-06-30&format=csv
+    GET /metrics                            memory and cache metrics in the Prometheus text format
+    GET /anomalies                          latest anomaly reading of every monitored series
+
+Results come from the same loaders, and so the same in-memory and shared
+caches, as the pages. ``format`` is ``json`` (default), ``csv``, ``arrow``
+(IPC stream) or ``parquet``. A complete result carries an ETag and answers a
+matching ``If-None-Match`` with 304. Bodies are sent with chunked encoding in
+slices of ``CHUNK_ROWS``; a streaming loader (Satellite paths) forwards its
+batches as they arrive, without an ETag when the result is not cached yet.
+"""
+import argparse
+import datetime
+import hashlib
+import http.server
+import inspect
+import itertools
+import json
+import threading
+import urllib.parse
+import weakref
+
+from dashboard.loaders import satellite, squid, user_behaviour
+
+CHUNK_ROWS = 10_000
+TIMEFRAMES = ("day", "week", "month")
+
+ENDPOINTS = {
+    "squid/kpis": squid.load_kpi_data,
+    "squid/time-series": squid.load_time_series_data,
+    "squid/source-chains": squid.load_pie_data,
+    "squid/destination-chains": squid.load_pie_data_dest,
+    "squid/symbols": squid.load_pie_data_symbol,
+    "squid/transfer-metrics": squid.load_transfer_metrics,
+    "squid/top-users": squid.load_users,
+    "squid/chain-flows": squid.load_chain_flows,
+    "squid/latency-sketches": squid.load_latency_sketches,
+    "squid/daily-path-volumes": squid.load_daily_path_volumes,
+    "squid/swapper-segments": squid.load_swapper_segments,
+    "satellite/kpis": satellite.get_kpi_data,
+    "satellite/user-time-series": satellite.load_user_time_series_data,
+    "satellite/top-users": satellite.get_table_data,
+    "satellite/paths": satellite.get_path_data,
+    "satellite/daily-chain-pairs": satellite.load_daily_chain_pairs,
+    "user-behaviour/new-users": user_behaviour.load_new_users,
+    "user-behaviour/retention": user_behaviour.load_retention,
+    "user-behaviour/transactions-fees": user_behaviour.load_txns_fees,
+    "user-behaviour/failed-transactions": user_behaviour.load_failed_transactions,
+    "user-behaviour/repeat-users": user_behaviour.load_repeat_users,
+    "user-behaviour/wallet-segments": user_behaviour.load_wallet_segments,
+}
+
+FORMATS = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# --- Parameters ---------------------------------------------------------------------------------------------------
+def parameters(loader):
+    """Query parameters of ``loader``: its arguments except the preview flag."""
+    return [name for name in inspect.signature(loader).parameters if name != "approximate"]
+
+
+def parse_arguments(loader, query):
+    arguments = {}
+    for name in parameters(loader):
+        values = query.get(name)
+        if not values:
+            raise BadRequest(f"missing parameter: {name}")
+        value = values[-1]
+        if name.endswith("_date"):
+            try:
+                value = datetime.date.fromisoformat(value)
+            except ValueError:
+                raise BadRequest(f"{name} must be an ISO date (YYYY-MM-DD)") from None
+        elif name == "timeframe" and value not in TIMEFRAMES:
+            raise BadRequest(f"timeframe must be one of {', '.join(TIMEFRAMES)}")
+        arguments[name] = value
+    return arguments
+
+
+# --- ETags --------------------------------------------------------------------------------------------------------
+_etags = {}
+_etags_lock = threading.Lock()
+
+
+def etag(frame, fmt):
+    """Strong validator of ``frame`` in ``fmt``; the content hash is computed once per cached frame."""
+    import pandas as pd
+
+    with _etags_lock:
+        digest = _etags.get(id(frame))
+    if digest is None:
+        hasher = hashlib.sha256(json.dumps([str(column) for column in frame.columns]).encode("utf-8"))
+        hasher.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+        digest = hasher.hexdigest()[:32]
+        with _etags_lock:
+            _etags[id(frame)] = digest
+        weakref.finalize(frame, _forget_etag, id(frame))
+    return f'"{digest}-{fmt}"'
+
+
+def _forget_etag(frame_id):
+    with _etags_lock:
+        _etags.pop(frame_id, None)
+
+
+# --- Serialisation ------------------------------------------------------------------------------------------------
+class ChunkedWriter:
+    """File-like writer sending each ``write`` as one HTTP/1.1 chunk."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.closed = False
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + bytes(data) + b"\r\n")
+        return len(data)
+
+    def flush(self):
+        self.wfile.flush()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+
+def slices(batches):
+    for batch in batches:
+        if not len(batch):
+            yield batch  # still carries the columns
+        for start in range(0, len(batch), CHUNK_ROWS):
+            yield batch.iloc[start:start + CHUNK_ROWS]
+
+
+def write_body(sink, batches, fmt):
+    """Serialise DataFrame ``batches`` to ``sink`` slice by slice; an empty result still gets its header."""
+    if fmt == "json":
+        sink.write("[")
+        first = True
+        for chunk in slices(batches):
+            if len(chunk):
+                sink.write(("" if first else ",") + chunk.to_json(orient="records", date_format="iso")[1:-1])
+                first = False
+        sink.write("]")
+    elif fmt == "csv":
+        header = True
+        for chunk in slices(batches):
+            if header or len(chunk):
+                sink.write(chunk.to_csv(index=False, header=header))
+                header = False
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        schema = None
+        try:
+            for chunk in slices(batches):
+                if schema is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    schema = table.schema
+                    writer = pa.ipc.new_stream(sink, schema) if fmt == "arrow" else pq.ParquetWriter(sink, schema)
+                elif len(chunk):
+                    table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                else:
+                    continue
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+# --- Handler ------------------------------------------------------------------------------------------------------
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "AxelarDashboardAPI/1.0"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        name = url.path.strip("/")
+        if not name:
+            return self.send_json({endpoint: parameters(loader) for endpoint, loader in ENDPOINTS.items()})
+        if name == "metrics":
+            return self.send_metrics()
+        if name == "anomalies":
+            from dashboard.anomaly import state
+
+            try:
+                return self.send_json(state(refresh=True))
+            except Exception as error:
+                self.log_error("anomalies failed: %r", error)
+                return self.send_error(502, f"anomalies failed: {type(error).__name__}")
+        loader = ENDPOINTS.get(name)
+        if loader is None:
+            return self.send_error(404, f"unknown endpoint: {name}")
+        query = urllib.parse.parse_qs(url.query)
+        fmt = query.pop("format", ["json"])[-1]
+        if fmt not in FORMATS:
+            return self.send_error(400, f"format must be one of {', '.join(FORMATS)}")
+        try:
+            arguments = parse_arguments(loader, query)
+        except BadRequest as error:
+            return self.send_error(400, str(error))
+
+        try:
+            result = loader(**arguments)
+            if inspect.isgenerator(result):
+                first = next(result)
+                second = next(result, None)
+                if second is not None:
+                    # Not cached yet: forward the batches as the warehouse sends them.
+                    return self.send_frames(fmt, [first, second], result)
+                result = first
+        except Exception as error:
+            self.log_error("%s failed: %r", name, error)
+            return self.send_error(502, f"{name} failed: {type(error).__name__}")
+        frame = result
+
+        tag = etag(frame, fmt)
+        if tag in {value.strip() for value in self.headers.get("If-None-Match", "").split(",")}:
+            self.send_response(304)
+            self.send_header("ETag", tag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_frames(fmt, [frame], (), tag)
+
+    def send_frames(self, fmt, head, rest, tag=None):
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATS[fmt])
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Cache-Control", "no-cache")
+        if tag is not None:
+            self.send_header("ETag", tag)
+        self.end_headers()
+        sink = ChunkedWriter(self.wfile)
+        write_body(sink, itertools.chain(head, rest), fmt)
+        sink.close()
+
+    def send_metrics(self):
+        from dashboard.memory import prometheus_metrics
+
+        body = prometheus_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, payload):
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATS["json"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    server = http.server.ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Serving {len(ENDPOINTS)} endpoints on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+"""Byte-budgeted LRU cache for loader results.
+
+Replaces ``st.cache_data`` on the page loaders. Every entry is sized in bytes,
+the whole process shares one memory budget, and each loader can be given its
+own quota so one wide table cannot push every other result out.
+
+Large results that are rarely read are kept as compressed Arrow IPC buffers.
+An entry at least ``AXELAR_CACHE_COMPRESS_MIN_KB`` in size that has not been
+read for ``AXELAR_CACHE_COMPRESS_IDLE_SECONDS`` is compressed on the next
+write to the cache, or right away when the write would otherwise evict. The
+codec depends on how often the entry is read: LZ4 for entries read at least
+``AXELAR_CACHE_LZ4_MIN_HITS`` times, whose decompression is cheap, and ZSTD for
+the rest, which compresses further. A read decompresses the entry and keeps it
+uncompressed while it is in use, so repeated reads return the same frame. It
+is compressed again once idle. An entry is counted at its compressed size,
+and one that does not shrink by at least ``MIN_RATIO`` stays uncompressed.
+
+Configuration (environment):
+    AXELAR_CACHE_BUDGET_MB              global budget for all loaders (default 512)
+    AXELAR_CACHE_TTL_SECONDS            default time-to-live per entry (default 3600)
+    AXELAR_CACHE_COMPRESS_MIN_KB        smallest entry that gets compressed; 0 turns compression off (default 256)
+    AXELAR_CACHE_COMPRESS_IDLE_SECONDS  seconds without a read before an entry is compressed (default 120)
+    AXELAR_CACHE_LZ4_MIN_HITS           reads from which an entry is compressed with LZ4 rather than ZSTD (default 3)
+"""
+import functools
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from dashboard.concurrency import QueryCancelled, SingleFlight
+from dashboard.profiling import span
+from dashboard.schemas import conform
+from dashboard.shared_store import resident_nbytes, shared_store
+
+MB = 1024 * 1024
+
+DEFAULT_BUDGET_BYTES = int(float(os.environ.get("AXELAR_CACHE_BUDGET_MB", "512")) * MB)
+DEFAULT_TTL_SECONDS = float(os.environ.get("AXELAR_CACHE_TTL_SECONDS", "3600"))
+COMPRESS_MIN_BYTES = int(float(os.environ.get("AXELAR_CACHE_COMPRESS_MIN_KB", "256")) * 1024)
+COMPRESS_IDLE_SECONDS = float(os.environ.get("AXELAR_CACHE_COMPRESS_IDLE_SECONDS", "120"))
+LZ4_MIN_HITS = int(os.environ.get("AXELAR_CACHE_LZ4_MIN_HITS", "3"))
+MIN_RATIO = 1.5
+
+
+# --- Sizing -------------------------------------------------------------------------------------------------------
+def sizeof(value) -> int:
+    """Deep size of a cached value in bytes."""
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:
+        try:
+            usage = memory_usage(index=True, deep=True)
+        except TypeError:
+            usage = memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+# --- Compression --------------------------------------------------------------------------------------------------
+def compress(frame, codec):
+    """``frame`` as an Arrow IPC stream compressed with ``codec``; None when Arrow cannot represent it."""
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(frame, preserve_index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+        return None
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=codec)) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def decompress(buffer):
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(buffer).read_all().to_pandas()
+
+
+# --- Cache --------------------------------------------------------------------------------------------------------
+class _Entry:
+    __slots__ = (
+        "loader", "value", "nbytes", "expires_at", "hits", "last_read",
+        "codec", "raw_nbytes", "incompressible", "decompressions", "decompress_seconds",
+    )
+
+    def __init__(self, loader, value, nbytes, expires_at):
+        self.loader = loader
+        self.value = value
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+        self.hits = 0
+        self.last_read = time.monotonic()
+        self.codec = None        # "lz4" or "zstd" while ``value`` is a compressed buffer
+        self.raw_nbytes = nbytes
+        self.incompressible = False
+        self.decompressions = 0
+        self.decompress_seconds = 0.0
+
+
+class _LoaderStats:
+    __slots__ = (
+        "hits", "misses", "coalesced", "evictions", "expirations", "rejected", "entries", "nbytes", "quota",
+        "compressions", "decompressions", "decompress_seconds",
+    )
+
+    def __init__(self, quota):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+        self.entries = 0
+        self.nbytes = 0
+        self.quota = quota
+        self.compressions = 0
+        self.decompressions = 0
+        self.decompress_seconds = 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ResultCache:
+    """Size-aware LRU shared by every loader in the process.
+
+    Entries are evicted least-recently-used first, from the offending loader
+    when it exceeds its quota and from the whole cache when the global budget
+    is exceeded. Values are returned as stored, so callers must copy a frame
+    before mutating it. Large idle frames are compressed (see the module
+    docstring) unless ``compress_min_bytes`` is 0.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES, compress_min_bytes=COMPRESS_MIN_BYTES):
+        self.budget_bytes = budget_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._loaders = {}
+        self._lock = threading.RLock()
+
+    def register(self, loader, quota_bytes=None):
+        with self._lock:
+            stats = self._loaders.get(loader)
+            if stats is None:
+                self._loaders[loader] = _LoaderStats(quota_bytes or self.budget_bytes)
+            elif quota_bytes:
+                stats.quota = quota_bytes
+
+    def get(self, loader, key, count=True):
+        """Return ``(True, value)`` on a hit and ``(False, None)`` on a miss.
+
+        ``count=False`` re-checks without touching the hit/miss counters.
+        """
+        with self._lock:
+            stats = self._loaders[loader]
+            entry = self._entries.get((loader, key))
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.time():
+                self._remove((loader, key))
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                stats.misses += count
+                return False, None
+            self._entries.move_to_end((loader, key))
+            entry.hits += count
+            entry.last_read = time.monotonic()
+            stats.hits += count
+            if entry.codec is None:
+                return True, entry.value
+            buffer = entry.value
+        started = time.perf_counter()
+        value = decompress(buffer)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            entry.decompressions += 1
+            entry.decompress_seconds += elapsed
+            stats.decompressions += 1
+            stats.decompress_seconds += elapsed
+            if self._entries.get((loader, key)) is entry and entry.value is buffer:
+                # Keep it uncompressed while it is being read; compact() compresses it again once idle.
+                self._resize(entry, value, None, entry.raw_nbytes)
+                self._evict(loader)
+        return True, value
+
+    def note_coalesced(self, loader):
+        with self._lock:
+            self._loaders[loader].coalesced += 1
+
+    def put(self, loader, key, value, nbytes=None, ttl=None):
+        if nbytes is None:
+            nbytes = sizeof(value)
+        if self.compress_min_bytes:
+            # Compress idle entries; when this one would not fit, compress cold ones before evicting any.
+            self.compact(needed=max(0, self.nbytes + nbytes - self.budget_bytes))
+        with self._lock:
+            stats = self._loaders[loader]
+            if (loader, key) in self._entries:
+                self._remove((loader, key))
+            if nbytes > min(stats.quota, self.budget_bytes):
+                stats.rejected += 1
+                return False
+            expires_at = time.time() + ttl if ttl else None
+            self._entries[(loader, key)] = _Entry(loader, value, nbytes, expires_at)
+            stats.entries += 1
+            stats.nbytes += nbytes
+            self.nbytes += nbytes
+            self._evict(loader)
+            return True
+
+    def compact(self, idle_seconds=COMPRESS_IDLE_SECONDS, needed=0):
+        """Compress the large entries idle for ``idle_seconds``, or, while ``needed`` bytes must be freed, any large one.
+
+        Least recently used entries go first. Compression runs outside the lock;
+        an entry replaced or read in the meantime is left as it is.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                (cache_key, entry) for cache_key, entry in self._entries.items()
+                if entry.codec is None and not entry.incompressible and entry.nbytes >= self.compress_min_bytes
+                and hasattr(entry.value, "columns")
+                and (needed > 0 or now - entry.last_read >= idle_seconds)
+            ]
+        freed = 0
+        for cache_key, entry in candidates:
+            if freed >= needed and now - entry.last_read < idle_seconds:
+                continue
+            codec = "lz4" if entry.hits >= LZ4_MIN_HITS else "zstd"
+            value, last_read = entry.value, entry.last_read
+            buffer = compress(value, codec)
+            with self._lock:
+                if self._entries.get(cache_key) is not entry or entry.value is not value or entry.last_read != last_read:
+                    continue
+                if buffer is None or buffer.size * MIN_RATIO > entry.raw_nbytes:
+                    entry.incompressible = True
+                    continue
+                freed += entry.nbytes - buffer.size
+                self._resize(entry, buffer, codec, buffer.size)
+                self._loaders[entry.loader].compressions += 1
+
+    def clear(self, loader=None):
+        with self._lock:
+            for cache_key in [k for k in self._entries if loader is None or k[0] == loader]:
+                self._remove(cache_key)
+
+    def stats(self):
+        with self._lock:
+            loaders = {name: s.as_dict() for name, s in self._loaders.items()}
+            for s in loaders.values():
+                s["compressed_entries"] = s["compressed_nbytes"] = s["compressed_raw_nbytes"] = 0
+            for entry in self._entries.values():
+                if entry.codec is not None:
+                    s = loaders[entry.loader]
+                    s["compressed_entries"] += 1
+                    s["compressed_nbytes"] += entry.nbytes
+                    s["compressed_raw_nbytes"] += entry.raw_nbytes
+            for s in loaders.values():
+                s["compression_ratio"] = s["compressed_raw_nbytes"] / s["compressed_nbytes"] if s["compressed_nbytes"] else None
+            totals = {
+                name: sum(s[name] for s in loaders.values())
+                for name in (
+                    "hits", "misses", "coalesced", "evictions", "expirations", "rejected", "entries",
+                    "compressions", "decompressions", "decompress_seconds",
+                    "compressed_entries", "compressed_nbytes", "compressed_raw_nbytes",
+                )
+            }
+            lookups = totals["hits"] + totals["misses"]
+            totals["hit_ratio"] = totals["hits"] / lookups if lookups else 0.0
+            totals["compression_ratio"] = (
+                totals["compressed_raw_nbytes"] / totals["compressed_nbytes"] if totals["compressed_nbytes"] else None
+            )
+            totals["nbytes"] = self.nbytes
+            totals["budget_bytes"] = self.budget_bytes
+            return {"total": totals, "loaders": loaders}
+
+    def entries(self):
+        """One record per cached result: loader, arguments, size as held and uncompressed, codec, hits,
+        decompressions with their mean time, and seconds until expiry."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "loader": loader,
+                    "arguments": ", ".join(f"{name}={value}" for name, value in key),
+                    "nbytes": entry.nbytes,
+                    "raw_nbytes": entry.raw_nbytes,
+                    "codec": entry.codec,
+                    "hits": entry.hits,
+                    "decompressions": entry.decompressions,
+                    "decompress_ms": 1000 * entry.decompress_seconds / entry.decompressions if entry.decompressions else None,
+                    "expires_in": None if entry.expires_at is None else max(0.0, entry.expires_at - now),
+                }
+                for (loader, key), entry in self._entries.items()
+            ]
+
+    def _resize(self, entry, value, codec, nbytes):
+        """Swap ``entry``'s value for its compressed or decompressed form and account for the new size."""
+        stats = self._loaders[entry.loader]
+        stats.nbytes += nbytes - entry.nbytes
+        self.nbytes += nbytes - entry.nbytes
+        entry.value, entry.codec, entry.nbytes = value, codec, nbytes
+
+    def _remove(self, cache_key):
+        entry = self._entries.pop(cache_key)
+        stats = self._loaders[entry.loader]
+        stats.entries -= 1
+        stats.nbytes -= entry.nbytes
+        self.nbytes -= entry.nbytes
+        return entry
+
+    def _evict(self, loader):
+        stats = self._loaders[loader]
+        if stats.nbytes > stats.quota:
+            for cache_key in [k for k in self._entries if k[0] == loader]:
+                if stats.nbytes <= stats.quota:
+                    break
+                self._remove(cache_key)
+                stats.evictions += 1
+        while self.nbytes > self.budget_bytes and self._entries:
+            cache_key = next(iter(self._entries))
+            self._loaders[cache_key[0]].evictions += 1
+            self._remove(cache_key)
+
+
+result_cache = ResultCache()
+flights = SingleFlight()
+
+
+def cache_stats():
+    return result_cache.stats()
+
+
+# --- Decorator ----------------------------------------------------------------------------------------------------
+def _in_script_run():
+    """Whether this thread is running a page (as opposed to a CLI, the API or a worker)."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return False
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+def make_key(signature, args, kwargs):
+    """Hashable key from the call arguments, skipping ``_``-prefixed ones like ``st.cache_data``."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return tuple(
+        (name, repr(value)) for name, value in bound.arguments.items() if not name.startswith("_")
+    )
+
+
+def cached(name=None, quota_mb=None, ttl=DEFAULT_TTL_SECONDS, show_spinner=False, cache=None, shared=True):
+    """Cache a loader's result in the shared byte-budgeted cache.
+
+    ``quota_mb`` caps the bytes this loader may hold, ``ttl`` (seconds) bounds
+    how stale an entry may get. With ``shared`` and a configured
+    ``AXELAR_SHARED_STORE_DIR``, DataFrame results are also published to the
+    cross-process store and looked up there before running the loader. The
+    wrapped function gains ``.clear()`` like a ``st.cache_data`` function.
+
+    A generator loader yields DataFrame batches: calling it yields them as they
+    arrive on a miss and caches their concatenation once the stream is
+    exhausted, while a hit yields the cached frame as a single batch.
+
+    Concurrent misses on the same arguments are coalesced: one caller runs the
+    loader and the others wait for its result instead of issuing the same
+    query. If the running caller is interrupted (its rerun was stopped), a
+    waiter takes over.
+    """
+    store = cache or result_cache
+    second_tier = shared_store if shared else None
+
+    def decorator(func):
+        loader = name or func.__name__
+        signature = inspect.signature(func)
+        store.register(loader, int(quota_mb * MB) if quota_mb else None)
+
+        def lookup(key, count=True):
+            hit, value = store.get(loader, key, count=count)
+            if hit:
+                return True, value
+            if second_tier is not None:
+                value = second_tier.get(loader, key, ttl=ttl)
+                if value is not None:
+                    # Mapped columns are shared with the other workers, not held by this process.
+                    store.put(loader, key, value, nbytes=resident_nbytes(value), ttl=ttl)
+                    return True, value
+            return False, None
+
+        def save(key, value):
+            store.put(loader, key, value, ttl=ttl)
+            if second_tier is not None and hasattr(value, "columns"):
+                second_tier.put(loader, key, value)
+
+        def join(key):
+            """Wait for a running flight of ``key``; returns ``(call, leader, value)``."""
+            while True:
+                call, leader = flights.begin((loader, key))
+                if leader:
+                    # A flight may have completed between the lookup and begin().
+                    hit, value = lookup(key, count=False)
+                    if hit:
+                        flights.finish((loader, key), call, result=value)
+                        return call, False, value
+                    return call, True, None
+                store.note_coalesced(loader)
+                call.done.wait()
+                if call.error is None:
+                    return call, False, call.result
+                # A leader whose run was stopped, or whose query was cancelled for it, failed for its own
+                # session only: take over the flight instead of failing this caller too.
+                if isinstance(call.error, Exception) and not isinstance(call.error, QueryCancelled):
+                    raise call.error
+
+        def run(func, args, kwargs):
+            with span(loader, "loader"):
+                if not show_spinner or not _in_script_run():
+                    return func(*args, **kwargs)
+                import streamlit as st
+
+                with st.spinner(f"Running {loader}(...)"):
+                    return func(*args, **kwargs)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(signature, args, kwargs)
+            hit, value = lookup(key)
+            if hit:
+                return value
+            call, leader, value = join(key)
+            if not leader:
+                return value
+            try:
+                value = conform(loader, run(func, args, kwargs))
+            except BaseException as error:
+                flights.finish((loader, key), call, error=error)
+                raise
+            try:
+                save(key, value)
+            finally:
+                flights.finish((loader, key), call, result=value)
+            return value
+
+        @functools.wraps(func)
+        def stream_wrapper(*args, **kwargs):
+            key = make_key(signature, args, kwargs)
+            hit, value = lookup(key)
+            if hit:
+                yield value
+                return
+            call, leader, value = join(key)
+            if not leader:
+                yield value
+                return
+            import pandas as pd
+
+            batches = []
+            try:
+                for batch in func(*args, **kwargs):
+                    batches.append(batch)
+                    yield batch
+                if not batches:
+                    # An empty stream still yields, and caches, one (empty) frame like a hit does.
+                    batches.append(pd.DataFrame())
+                    yield batches[0]
+                # Batches go out as they arrive; only the cached whole is conformed, so its categories are shared.
+                value = conform(loader, pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0])
+            except BaseException as error:
+                # Only a fully consumed stream is cached; an abandoned one leaves no entry.
+                flights.finish((loader, key), call, error=error)
+                raise
+            try:
+                save(key, value)
+            finally:
+                flights.finish((loader, key), call, result=value)
+
+        def clear():
+            store.clear(loader)
+            if second_tier is not None:
+                second_tier.clear(loader)
+
+        if inspect.isgeneratorfunction(func):
+            wrapper = stream_wrapper
+        wrapper.clear = clear
+        wrapper.loader = loader
+        return wrapper
+
+    return decorator
@@ -0,0 +1,198 @@
+"""Chain dictionary and dense chain × chain matrices of path metrics.
+
+Paths used to be keyed by the string ``source_chain || '➡' || destination_chain``,
+so every groupby over them hashed and compared variable-length strings.
+``CHAINS`` gives each chain name a small integer code for the life of the
+process (codes are only ever added), and a path is the integer
+``source << 16 | destination``: the same in every frame and every date range.
+
+A ``PathCube`` holds, per metric, one ``days × chains × chains`` array over the
+chains present in a range, with a row per calendar day. Filtering paths, a
+date window, totals per source or destination and normalized shares are then
+array slices and reductions. Daily users are distinct per day, so over several
+days they are averaged rather than summed.
+"""
+import threading
+import weakref
+
+import numpy as np
+
+METRICS = {
+    # metric: (dtype, reduction over days, label)
+    "transfers": (np.int32, "sum", "Transfers"),
+    "users": (np.int32, "mean", "Avg Daily Users"),
+    "volume": (np.float64, "sum", "Volume ($USD)"),
+}
+PAIR_SHIFT = 16
+
+_cubes = {}
+
+
+# --- Dictionary ---------------------------------------------------------------------------------------------------
+class ChainDictionary:
+    """Process-wide chain name ↔ integer code mapping."""
+
+    def __init__(self):
+        self._codes = {}
+        self._names = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def encode(self, values):
+        """Code of every chain name in ``values``; -1 where the name is missing."""
+        import pandas as pd
+
+        positions, uniques = pd.factorize(pd.Series(values, copy=False))
+        with self._lock:
+            for name in uniques:
+                if name not in self._codes:
+                    self._codes[name] = len(self._names)
+                    self._names.append(name)
+            mapped = np.array([self._codes[name] for name in uniques] + [-1], dtype=np.int64)
+        return mapped[positions]  # position -1 (missing) picks the trailing -1
+
+    def decode(self, codes):
+        """Chain names of ``codes``; None where a code is -1."""
+        names = np.array(self._names + [None], dtype=object)
+        codes = np.asarray(codes, dtype=np.int64)
+        return names[np.where(codes >= 0, codes, len(self._names))]
+
+
+CHAINS = ChainDictionary()
+
+
+def pair_codes(sources, destinations):
+    """Integer path of every (source, destination) chain pair; -1 where either chain is missing."""
+    source, destination = CHAINS.encode(sources), CHAINS.encode(destinations)
+    return np.where((source >= 0) & (destination >= 0), (source << PAIR_SHIFT) | destination, -1)
+
+
+def path_names(codes, separator="➡"):
+    """``source➡destination`` labels of integer paths; None where a code is -1."""
+    codes = np.asarray(codes, dtype=np.int64)
+    valid = codes >= 0
+    sources = CHAINS.decode(np.where(valid, codes >> PAIR_SHIFT, -1))
+    destinations = CHAINS.decode(np.where(valid, codes & ((1 << PAIR_SHIFT) - 1), -1))
+    labels = np.full(len(codes), None, dtype=object)
+    labels[valid] = sources[valid] + separator + destinations[valid]
+    return labels
+
+
+# --- Cube ---------------------------------------------------------------------------------------------------------
+class PathCube:
+    """Per-day chain × chain matrices: ``values[metric][day, source, destination]``."""
+
+    def __init__(self, days, sources, destinations, values):
+        self.days = days                  # datetime64[D], one per calendar day
+        self.sources = sources            # chain codes of the rows, ascending
+        self.destinations = destinations  # chain codes of the columns, ascending
+        self.values = values
+
+    @classmethod
+    def from_frame(cls, frame, date="date", source="source_chain", destination="destination_chain"):
+        """Cube of the ``METRICS`` columns of a frame with one row per day and chain pair."""
+        import pandas as pd
+
+        src, dst = CHAINS.encode(frame[source]), CHAINS.encode(frame[destination])
+        days = pd.to_datetime(frame[date]).to_numpy(dtype="datetime64[D]")
+        keep = (src >= 0) & (dst >= 0) & ~np.isnat(days)
+        src, dst, days = src[keep], dst[keep], days[keep]
+        calendar = np.arange(days.min(), days.max() + 1) if len(days) else np.array([], dtype="datetime64[D]")
+        chains = np.unique(np.concatenate([src, dst]))
+        index = (
+            (days - calendar[0]).astype(np.int64) if len(days) else np.array([], dtype=np.int64),
+            np.searchsorted(chains, src),
+            np.searchsorted(chains, dst),
+        )
+        values = {}
+        for metric, (dtype, _, _) in METRICS.items():
+            cube = np.zeros((len(calendar), len(chains), len(chains)), dtype=dtype)
+            if metric in frame:
+                np.add.at(cube, index, frame[metric].to_numpy(dtype=np.float64, na_value=0.0)[keep].astype(dtype))
+            values[metric] = cube
+        return cls(calendar, chains, chains, values)
+
+    @property
+    def chains(self):
+        """Names of the chains on either axis."""
+        return list(CHAINS.decode(np.union1d(self.sources, self.destinations)))
+
+    @property
+    def nbytes(self):
+        return sum(cube.nbytes for cube in self.values.values())
+
+    def select(self, sources=None, destinations=None, start=None, end=None):
+        """Sub-cube of the given source and destination chains (names) and days (inclusive)."""
+        rows = np.arange(len(self.sources))
+        cols = np.arange(len(self.destinations))
+        if sources is not None:
+            rows = rows[np.isin(CHAINS.decode(self.sources), list(sources))]
+        if destinations is not None:
+            cols = cols[np.isin(CHAINS.decode(self.destinations), list(destinations))]
+        lo = int(np.searchsorted(self.days, np.datetime64(start, "D"))) if start is not None else 0
+        hi = int(np.searchsorted(self.days, np.datetime64(end, "D"), "right")) if end is not None else len(self.days)
+        values = {metric: cube[lo:hi][:, rows][:, :, cols] for metric, cube in self.values.items()}
+        return PathCube(self.days[lo:hi], self.sources[rows], self.destinations[cols], values)
+
+    def total(self, metric):
+        """Source × destination matrix of ``metric`` over all days of the cube."""
+        _, reduction, _ = METRICS[metric]
+        cube = self.values[metric]
+        if not len(cube):
+            return np.zeros(cube.shape[1:])
+        return cube.mean(axis=0) if reduction == "mean" else cube.sum(axis=0)
+
+    def daily(self, metric):
+        """Per-day total of ``metric`` over every path of the cube."""
+        return self.values[metric].sum(axis=(1, 2))
+
+
+def shares(matrix, by=None):
+    """``matrix`` normalized to shares: of the grand total, or of each ``"source"`` row or ``"destination"`` column."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if by == "source":
+        totals = matrix.sum(axis=1, keepdims=True)
+    elif by == "destination":
+        totals = matrix.sum(axis=0, keepdims=True)
+    else:
+        totals = matrix.sum()
+    return np.divide(matrix, totals, out=np.zeros_like(matrix), where=totals != 0)
+
+
+def path_cube(frame):
+    """Cached ``PathCube`` of a daily chain-pair frame; entries go away with the frame."""
+    frame_id = id(frame)
+    cube = _cubes.get(frame_id)
+    if cube is None:
+        cube = _cubes[frame_id] = PathCube.from_frame(frame)
+        weakref.finalize(frame, _cubes.pop, frame_id, None)
+    return cube
+
+
+# --- Chart --------------------------------------------------------------------------------------------------------
+def chain_heatmap(cube, metric="transfers", normalize=None, title="Source ➡ Destination"):
+    """Heatmap of ``metric`` with sources as rows and destinations as columns; empty chains left out."""
+    import plotly.express as px
+
+    matrix = cube.total(metric)
+    sources, destinations = CHAINS.decode(cube.sources), CHAINS.decode(cube.destinations)
+    rows, cols = matrix.any(axis=1), matrix.any(axis=0)
+    matrix = matrix[rows][:, cols]
+    label = METRICS[metric][2]
+    if normalize:
+        matrix = shares(matrix, by=None if normalize == "total" else normalize)
+        label = "Share"
+    fig = px.imshow(
+        matrix,
+        x=list(destinations[cols]),
+        y=list(sources[rows]),
+        labels=dict(x="Destination Chain", y="Source Chain", color=label),
+        color_continuous_scale="Blues",
+        aspect="auto",
+        title=title
+    )
+    if normalize:
+        fig.update_coloraxes(colorbar_tickformat=".0%")
+    return fig
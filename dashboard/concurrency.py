@@ -0,0 +1,206 @@
+"""Request coalescing and admission control for warehouse work.
+
+``SingleFlight`` lets concurrent callers asking for the same key share one
+execution: the first caller runs it, the others wait and receive its result.
+``AdmissionController`` caps how many warehouse queries run at once and
+queues the rest first-come first-served, reporting each waiter's position.
+``QueryRegistry`` tracks the warehouse queries in flight per session and run
+so that the ones a newer run has superseded can be cancelled. A query
+cancelled that way fails with ``QueryCancelled``, which callers coalesced
+onto it from other sessions retry instead of raising.
+"""
+import contextlib
+import itertools
+import os
+import threading
+
+
+class QueryCancelled(Exception):
+    """The warehouse query was aborted because the run it was started for has been superseded."""
+
+
+# --- Single flight ------------------------------------------------------------------------------------------------
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def begin(self, key):
+        """Return ``(call, leader)``; the leader must end the call with ``finish``."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        with self._lock:
+            self._calls.pop(key, None)
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    @staticmethod
+    def wait(call):
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key, fn):
+        """Run ``fn()`` once for all concurrent callers with the same ``key``."""
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call)
+        try:
+            result = fn()
+        except BaseException as error:
+            self.finish(key, call, error=error)
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+# --- Admission control --------------------------------------------------------------------------------------------
+class AdmissionController:
+    def __init__(self, max_concurrent):
+        self.max_concurrent = max_concurrent
+        self._condition = threading.Condition()
+        self._tickets = itertools.count()
+        self._queue = []
+        self._running = 0
+        self.admitted = 0
+        self.queued = 0
+
+    def position(self, ticket):
+        """1-based place of ``ticket`` in the queue, or 0 once admitted."""
+        with self._condition:
+            return self._queue.index(ticket) + 1 if ticket in self._queue else 0
+
+    @contextlib.contextmanager
+    def slot(self, on_wait=None, poll_interval=0.5):
+        """Hold one of the concurrent query slots for the duration of the block.
+
+        ``on_wait(position)`` is called while queued whenever the position
+        changes, and with 0 once the query is admitted after having waited.
+        """
+        with self._condition:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            waited = False
+            last_position = None
+            try:
+                while self._running >= self.max_concurrent or self._queue[0] != ticket:
+                    if not waited:
+                        waited = True
+                        self.queued += 1
+                    position = self._queue.index(ticket) + 1
+                    if on_wait is not None and position != last_position:
+                        last_position = position
+                        self._condition.release()
+                        try:
+                            on_wait(position)
+                        finally:
+                            self._condition.acquire()
+                        continue
+                    self._condition.wait(poll_interval)
+            except BaseException:
+                # A waiter that gives up (e.g. its rerun was stopped) leaves the queue.
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+                raise
+            self._queue.pop(0)
+            self._running += 1
+            self.admitted += 1
+            self._condition.notify_all()
+        try:
+            if waited and on_wait is not None:
+                on_wait(0)
+            yield
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "running": self._running,
+                "waiting": len(self._queue),
+                "admitted": self.admitted,
+                "queued": self.queued,
+            }
+
+
+# --- Query registry -----------------------------------------------------------------------------------------------
+class QueryRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries = {}
+        self._superseded = set()
+        self.cancelled = 0
+
+    def register(self, session, run, query_id, cancel):
+        """Track ``query_id`` for ``run`` of ``session``.
+
+        Queries the session still has in flight from an earlier run are
+        superseded: they are dropped from the registry and ``cancel(query_id)``
+        is called for each of them.
+        """
+        with self._lock:
+            queries = self._queries.setdefault(session, {})
+            superseded = [(other, entry[1]) for other, entry in queries.items() if entry[0] is not run]
+            for other, _ in superseded:
+                del queries[other]
+                self._superseded.add(other)
+            queries[query_id] = (run, cancel)
+            self.cancelled += len(superseded)
+        for other, cancel_other in superseded:
+            cancel_other(other)
+
+    def was_superseded(self, query_id):
+        """True when ``query_id`` was cancelled because a newer run of its session started a query."""
+        with self._lock:
+            return query_id in self._superseded
+
+    def unregister(self, session, query_id):
+        with self._lock:
+            self._superseded.discard(query_id)
+            queries = self._queries.get(session)
+            if queries is not None:
+                queries.pop(query_id, None)
+                if not queries:
+                    del self._queries[session]
+
+    def note_cancelled(self):
+        with self._lock:
+            self.cancelled += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._queries),
+                "in_flight": sum(len(queries) for queries in self._queries.values()),
+                "cancelled": self.cancelled,
+            }
+
+
+admission = AdmissionController(int(os.environ.get("AXELAR_WAREHOUSE_MAX_CONCURRENT", "4")))
+running_queries = QueryRegistry()
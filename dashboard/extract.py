@@ -0,0 +1,151 @@
+"""Land the columns the Satellite, Squid and Wallet Lookup pages use into the local Parquet store.
+
+Usage:
+    python -m dashboard.extract --root ./data [--start 2024-01-01] [--end 2024-01-31]
+                                [--datasets core_transactions satellite transfers squid_gmp] [--chunk-days 7]
+
+Without ``--start`` each dataset resumes from the last extracted day (which is
+pulled again, as it may have been partial) or from its origin. ``--end``
+defaults to today. Each chunk of days is queried once and written as one
+partition per day, replacing what was there.
+"""
+import argparse
+import datetime
+import os
+
+from dashboard.parquet_store import DATASETS, ParquetStore
+from dashboard.squid import SQUID_CONTRACTS
+
+QUERIES = {
+    "core_transactions": """
+        SELECT
+            block_timestamp::date AS "date",
+            block_timestamp AS "block_timestamp",
+            tx_id AS "tx_id",
+            tx_from AS "tx_from",
+            tx_succeeded AS "tx_succeeded",
+            fee / POW(10, 6) AS "fee"
+        FROM axelar.core.fact_transactions
+        WHERE block_timestamp::date >= '{start}' AND block_timestamp::date <= '{end}'
+    """,
+    "satellite": """
+        SELECT
+            block_timestamp::date AS "date",
+            block_timestamp AS "block_timestamp",
+            tx_hash AS "tx_hash",
+            source_chain AS "source_chain",
+            destination_chain AS "destination_chain",
+            sender AS "sender",
+            token_symbol AS "token_symbol"
+        FROM AXELAR.DEFI.EZ_BRIDGE_SATELLITE
+        WHERE block_timestamp::date >= '{start}' AND block_timestamp::date <= '{end}'
+    """,
+    "transfers": """
+        SELECT
+            created_at::date AS "date",
+            created_at AS "created_at",
+            id AS "id",
+            SPLIT_PART(id, '_', 1) AS "tx_hash",
+            LOWER(data:send:original_source_chain) AS "source_chain",
+            LOWER(data:send:original_destination_chain) AS "destination_chain",
+            sender_address AS "sender_address",
+            recipient_address AS "recipient_address",
+            CASE
+              WHEN IS_ARRAY(data:send:amount) OR IS_OBJECT(data:send:amount) THEN NULL
+              ELSE TRY_TO_DOUBLE(data:send:amount::STRING)
+            END AS "amount",
+            CASE
+              WHEN IS_ARRAY(data:send:amount) OR IS_ARRAY(data:link:price) THEN NULL
+              WHEN IS_OBJECT(data:send:amount) OR IS_OBJECT(data:link:price) THEN NULL
+              ELSE TRY_TO_DOUBLE(data:send:amount::STRING) * TRY_TO_DOUBLE(data:link:price::STRING)
+            END AS "amount_usd",
+            CASE
+              WHEN IS_ARRAY(data:send:fee_value) OR IS_OBJECT(data:send:fee_value) THEN NULL
+              ELSE TRY_TO_DOUBLE(data:send:fee_value::STRING)
+            END AS "fee",
+            data:link:asset::STRING AS "raw_asset"
+        FROM axelar.axelscan.fact_transfers
+        WHERE status = 'executed'
+          AND simplified_status = 'received'
+          AND created_at::date >= '{start}' AND created_at::date <= '{end}'
+    """,
+    "squid_gmp": """
+        SELECT
+            created_at::date AS "date",
+            created_at AS "created_at",
+            id AS "id",
+            data:call.chain::STRING AS "source_chain",
+            data:call.returnValues.destinationChain::STRING AS "destination_chain",
+            data:call.transaction.from::STRING AS "user",
+            data:approved:returnValues:contractAddress::STRING AS "contract_address",
+            CASE
+              WHEN IS_ARRAY(data:amount) OR IS_OBJECT(data:amount) THEN NULL
+              ELSE TRY_TO_DOUBLE(data:amount::STRING)
+            END AS "amount",
+            CASE
+              WHEN IS_ARRAY(data:value) OR IS_OBJECT(data:value) THEN NULL
+              ELSE TRY_TO_DOUBLE(data:value::STRING)
+            END AS "amount_usd",
+            COALESCE(
+              CASE
+                WHEN IS_ARRAY(data:gas:gas_used_amount) OR IS_OBJECT(data:gas:gas_used_amount)
+                  OR IS_ARRAY(data:gas_price_rate:source_token.token_price.usd) OR IS_OBJECT(data:gas_price_rate:source_token.token_price.usd)
+                THEN NULL
+                ELSE TRY_TO_DOUBLE(data:gas:gas_used_amount::STRING) * TRY_TO_DOUBLE(data:gas_price_rate:source_token.token_price.usd::STRING)
+              END,
+              CASE
+                WHEN IS_ARRAY(data:fees:express_fee_usd) OR IS_OBJECT(data:fees:express_fee_usd) THEN NULL
+                ELSE TRY_TO_DOUBLE(data:fees:express_fee_usd::STRING)
+              END
+            ) AS "fee",
+            data:symbol::STRING AS "raw_asset"
+        FROM axelar.axelscan.fact_gmp
+        WHERE status = 'executed'
+          AND simplified_status = 'received'
+          AND ({contracts})
+          AND created_at::date >= '{start}' AND created_at::date <= '{end}'
+    """,
+}
+
+
+def extraction_query(dataset, start, end):
+    contracts = " OR ".join(
+        f"data:approved:returnValues:contractAddress ILIKE '%{address}%'" for address in SQUID_CONTRACTS
+    )
+    return QUERIES[dataset].format(start=start.isoformat(), end=end.isoformat(), contracts=contracts)
+
+
+def extract(store, dataset, start, end, chunk_days=7, log=print):
+    from dashboard.warehouse import read_sql
+
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + datetime.timedelta(days=chunk_days - 1), end)
+        frame = read_sql(extraction_query(dataset, chunk_start, chunk_end))
+        store.write_range(dataset, frame, chunk_start, chunk_end)
+        log(f"{dataset}: {chunk_start} .. {chunk_end}  {len(frame):,} rows")
+        chunk_start = chunk_end + datetime.timedelta(days=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=os.environ.get("AXELAR_PARQUET_ROOT"), help="dataset root (default: $AXELAR_PARQUET_ROOT)")
+    parser.add_argument("--start", type=datetime.date.fromisoformat)
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date.today())
+    parser.add_argument("--datasets", nargs="+", choices=sorted(DATASETS), default=sorted(DATASETS))
+    parser.add_argument("--chunk-days", type=int, default=7)
+    args = parser.parse_args(argv)
+    if not args.root:
+        parser.error("--root or AXELAR_PARQUET_ROOT is required")
+
+    store = ParquetStore(args.root)
+    for dataset in args.datasets:
+        start = args.start
+        if start is None:
+            manifest = store.manifest(dataset)
+            start = manifest["end"] if manifest else DATASETS[dataset]["origin"]
+        extract(store, dataset, start, args.end, chunk_days=args.chunk_days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Persisted sender → first-seen index for the Satellite new vs. returning users.
+
+Whether a sender is new in a period depends on their first bridge transfer
+ever, so the chart query used to aggregate all of ``EZ_BRIDGE_SATELLITE`` on
+every call. This index keeps that aggregate on disk instead: one row per
+sender with the timestamp of their first transfer, plus a watermark (the
+latest ``block_timestamp`` folded in). Refreshing it only reads the rows from
+the watermark's day on and keeps the earlier timestamp of each sender, so a
+refresh is idempotent and late rows of that day are picked up too.
+
+With the index, a period's new users are the active senders whose first-seen
+timestamp truncates to that period: the chart only needs the range's own
+activity, from the local Parquet store or a date-bounded warehouse scan.
+
+Usage:
+    python -m dashboard.first_seen [--path ./data/_indexes/satellite_first_seen.parquet] [--rebuild]
+
+Configuration (environment):
+    AXELAR_FIRST_SEEN_PATH              index file (default ``<AXELAR_PARQUET_ROOT>/_indexes/satellite_first_seen.parquet``);
+                                        the index is off when neither is set
+    AXELAR_FIRST_SEEN_REFRESH_SECONDS   minimum time between refreshes triggered by page reads (default 300)
+"""
+import argparse
+import datetime
+import os
+import threading
+import time
+
+from dashboard.parquet_store import DATASETS, parquet_store
+from dashboard.sqlfuncs import date_trunc
+
+REFRESH_SECONDS = float(os.environ.get("AXELAR_FIRST_SEEN_REFRESH_SECONDS", "300"))
+WATERMARK_KEY = b"axelar.watermark"
+
+FIRST_SEEN_QUERY = """
+    SELECT sender AS "sender", MIN(block_timestamp) AS "first_seen", MAX(block_timestamp) AS "last_seen"
+    FROM axelar.defi.ez_bridge_satellite
+    {where}
+    GROUP BY 1
+"""
+
+ACTIVITY_QUERY = """
+    SELECT DISTINCT
+        DATE_TRUNC('{timeframe}', block_timestamp) AS "activity_date",
+        sender AS "sender"
+    FROM axelar.defi.ez_bridge_satellite
+    WHERE DATE_TRUNC('{timeframe}', block_timestamp)::date >= '{start}'
+      AND DATE_TRUNC('{timeframe}', block_timestamp)::date <= '{end}'
+      -- Implied by the period bound (no row of a period starting in the range is earlier); kept for pruning.
+      AND block_timestamp::date >= '{start}'
+"""
+
+
+class FirstSeenIndex:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        # (sorted pandas Index of sender addresses, aligned datetime64[ns] first-seen array), replaced
+        # as one tuple so readers never pair the senders of one version with the timestamps of another.
+        self._index = None
+        self.watermark = None
+        self._checked = 0.0
+
+    # --- Storage --------------------------------------------------------------------------------------------------
+    def _load(self):
+        """(Re)read the file when another process or a refresh replaced it."""
+        import pandas as pd
+        import pyarrow.parquet as pq
+
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        table = pq.read_table(self.path)
+        watermark = (table.schema.metadata or {}).get(WATERMARK_KEY)
+        frame = table.to_pandas()
+        self._index = (pd.Index(frame["sender"]), pd.to_datetime(frame["first_seen"]).to_numpy())
+        self.watermark = pd.Timestamp(watermark.decode()) if watermark else None
+        self._loaded_mtime = mtime
+
+    def _save(self, frame, watermark):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = {**(table.schema.metadata or {}), WATERMARK_KEY: watermark.isoformat().encode()}
+        table = table.replace_schema_metadata(metadata)
+        pq.write_table(table, self.path + ".tmp", compression="zstd")
+        os.replace(self.path + ".tmp", self.path)
+
+    # --- Refresh --------------------------------------------------------------------------------------------------
+    def _new_rows(self, since, until):
+        """First and last timestamp per sender among the rows from day ``since`` on (all rows when None).
+
+        Read from the local Parquet store when it holds every day up to ``until``, else from the warehouse.
+        """
+        if parquet_store is not None and parquet_store.covers_history("satellite", until):
+            rows = parquet_store.read("satellite", since, columns=["sender", "block_timestamp"])
+            return rows.groupby("sender", as_index=False)["block_timestamp"].agg(first_seen="min", last_seen="max")
+        from dashboard.warehouse import read_sql
+
+        where = f"WHERE block_timestamp::date >= '{since.isoformat()}'" if since else ""
+        return read_sql(FIRST_SEEN_QUERY.format(where=where))
+
+    def refresh(self, until=None, rebuild=False, log=None):
+        """Fold the rows since the watermark's day into the index and persist it."""
+        import pandas as pd
+
+        with self._lock:
+            self._load()
+            since = None if rebuild or self.watermark is None else self.watermark.date()
+            rows = self._new_rows(since, until or datetime.date.today())
+            first = pd.DataFrame({"sender": rows["sender"], "first_seen": pd.to_datetime(rows["first_seen"]).astype("datetime64[ns]")})
+            if since is not None and self._index is not None:
+                senders, known = self._index
+                first = pd.concat([pd.DataFrame({"sender": senders, "first_seen": known}), first], ignore_index=True)
+            merged = first.groupby("sender", as_index=False, sort=True)["first_seen"].min()
+            latest = pd.to_datetime(rows["last_seen"]).max()
+            if pd.isna(latest):
+                latest = self.watermark if self.watermark is not None else pd.Timestamp(DATASETS["satellite"]["origin"])
+            elif self.watermark is not None:
+                latest = max(latest, self.watermark)
+            self._save(merged, latest)
+            self._index = (pd.Index(merged["sender"]), merged["first_seen"].to_numpy(dtype="datetime64[ns]"))
+            self.watermark = pd.Timestamp(latest)
+            self._loaded_mtime = os.stat(self.path).st_mtime_ns
+            self._checked = time.monotonic()
+        if log:
+            log(f"{self.path}: {len(merged):,} senders, watermark {self.watermark}")
+
+    def current(self, end_date):
+        """The index, refreshed first when it stops before ``end_date`` and has not been refreshed lately."""
+        with self._lock:
+            self._load()
+        stale = self.watermark is None or self.watermark.date() < end_date
+        if stale and time.monotonic() - self._checked >= REFRESH_SECONDS:
+            self.refresh(until=end_date)
+        return self
+
+    # --- Lookup ---------------------------------------------------------------------------------------------------
+    def lookup(self, senders):
+        """First-seen timestamps of ``senders``; NaT for senders the index does not know yet."""
+        import numpy as np
+
+        index = self._index
+        if index is None:
+            return np.full(len(senders), np.datetime64("NaT"), dtype="datetime64[ns]")
+        known, timestamps = index
+        positions = known.get_indexer(senders)
+        first = timestamps[positions]
+        first[positions < 0] = np.datetime64("NaT")
+        return first
+
+    def user_time_series(self, timeframe, activity):
+        """New, returning and total senders per period from the range's distinct (period, sender) rows."""
+        import pandas as pd
+
+        activity = activity.assign(activity_date=pd.to_datetime(activity["activity_date"]))
+        first = pd.Series(self.lookup(activity["sender"]), index=activity.index)
+        # Senders newer than the watermark are first seen inside the range itself.
+        first = first.fillna(activity.groupby("sender")["activity_date"].transform("min"))
+        new = (date_trunc(timeframe, first) == activity["activity_date"]).rename("new")
+        grouped = new.groupby(activity["activity_date"])
+        out = pd.DataFrame({
+            "New Users": grouped.sum(),
+            "Returning Users": grouped.size() - grouped.sum(),
+            "Total Users": grouped.size(),
+        })
+        out.index.name = "Date"
+        return out.reset_index().sort_values("Date", ignore_index=True)
+
+
+# --- Range activity -------------------------------------------------------------------------------------------------
+def activity_query(timeframe, start_date, end_date):
+    return ACTIVITY_QUERY.format(timeframe=timeframe, start=start_date.strftime("%Y-%m-%d"), end=end_date.strftime("%Y-%m-%d"))
+
+
+def local_activity(timeframe, start_date, end_date):
+    """Distinct (period, sender) rows of the range from the local Parquet store, periods starting in the range."""
+    import pandas as pd
+
+    df = parquet_store.read("satellite", start_date, end_date, columns=["block_timestamp", "sender"])
+    activity = pd.DataFrame({"activity_date": date_trunc(timeframe, df["block_timestamp"]), "sender": df["sender"]})
+    activity = activity[activity["activity_date"].dt.date >= pd.Timestamp(start_date).date()]
+    return activity.drop_duplicates(ignore_index=True)
+
+
+def _default_path():
+    path = os.environ.get("AXELAR_FIRST_SEEN_PATH")
+    if path:
+        return path
+    root = os.environ.get("AXELAR_PARQUET_ROOT")
+    return os.path.join(root, "_indexes", "satellite_first_seen.parquet") if root else None
+
+
+def _from_env():
+    path = _default_path()
+    return FirstSeenIndex(path) if path else None
+
+
+first_seen = _from_env()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=_default_path(), help="index file (default: $AXELAR_FIRST_SEEN_PATH)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild from all history instead of the watermark on")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("--path, AXELAR_FIRST_SEEN_PATH or AXELAR_PARQUET_ROOT is required")
+
+    FirstSeenIndex(args.path).refresh(rebuild=args.rebuild, log=print)
+
+
+if __name__ == "__main__":
+    main()
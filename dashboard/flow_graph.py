@@ -0,0 +1,201 @@
+"""Cross-chain flow graph: chains as nodes, source ➡ destination flows as weighted edges.
+
+The graph is networkx's sparse dict-of-dicts adjacency, built straight from
+the path aggregates the pages already load. Layout positions are cached per
+graph signature (the set of chains and edges). When only the edge weights
+change, as they do when the date range moves, the cached layout is warm-started
+for a few iterations instead of being recomputed from scratch, so redraws stay
+interactive and the chains keep their place on screen.
+"""
+import collections
+import math
+import threading
+
+import pandas as pd
+
+LAYOUT_ITERATIONS = 50
+WARM_ITERATIONS = 8
+EDGE_WIDTH_BUCKETS = 5
+
+
+# --- Graph --------------------------------------------------------------------------------------------------------
+def split_paths(paths, column="🔀Path", separator="➡"):
+    """Add ``source_chain`` and ``destination_chain`` columns parsed from a ``source➡destination`` column."""
+    parts = paths[column].str.split(separator, n=1, expand=True).reindex(columns=[0, 1])
+    return paths.assign(source_chain=parts[0], destination_chain=parts[1])
+
+
+def build_graph(flows, transfers, volume, source="source_chain", destination="destination_chain"):
+    """Directed chain graph with ``transfers`` and ``volume`` on each edge.
+
+    Rows with a missing chain are skipped. The layout weight is the log of the
+    transfer count, so a few very busy routes do not collapse the picture.
+    """
+    import networkx as nx
+
+    graph = nx.DiGraph()
+    for src, dst, count, usd in flows[[source, destination, transfers, volume]].itertuples(index=False):
+        if pd.isna(src) or pd.isna(dst):
+            continue
+        count = 0 if pd.isna(count) else int(count)
+        usd = 0.0 if pd.isna(usd) else float(usd)
+        if graph.has_edge(src, dst):
+            count += graph[src][dst]["transfers"]
+            usd += graph[src][dst]["volume"]
+        graph.add_edge(src, dst, transfers=count, volume=usd, weight=math.log1p(count))
+    return graph
+
+
+def graph_signature(graph):
+    return (
+        tuple(sorted(map(str, graph.nodes))),
+        tuple(sorted((str(src), str(dst)) for src, dst in graph.edges)),
+    )
+
+
+# --- Layout -------------------------------------------------------------------------------------------------------
+class LayoutCache:
+    def __init__(self, max_entries=64, seed=7):
+        self.max_entries = max_entries
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._layouts = collections.OrderedDict()
+        self._last_positions = {}
+        self.hits = 0
+        self.warm_starts = 0
+        self.misses = 0
+
+    def layout(self, graph):
+        """Node positions for ``graph``, reusing or warm-starting a cached layout when possible."""
+        import networkx as nx
+
+        if graph.number_of_nodes() == 0:
+            return {}
+        signature = graph_signature(graph)
+        weights = tuple(
+            round(weight, 3)
+            for _, _, weight in sorted(graph.edges(data="weight"), key=lambda edge: (str(edge[0]), str(edge[1])))
+        )
+        with self._lock:
+            cached = self._layouts.get(signature)
+            if cached is not None:
+                self._layouts.move_to_end(signature)
+                if cached[1] == weights:
+                    self.hits += 1
+                    return cached[0]
+                self.warm_starts += 1
+                initial, iterations = cached[0], WARM_ITERATIONS
+            else:
+                self.misses += 1
+                # Chains seen in earlier layouts start where they were last drawn.
+                initial = {node: self._last_positions[node] for node in graph if node in self._last_positions}
+                iterations = LAYOUT_ITERATIONS
+
+        positions = nx.spring_layout(
+            graph.to_undirected(as_view=True),
+            pos=initial or None,
+            iterations=iterations,
+            weight="weight",
+            seed=self.seed
+        )
+        positions = {node: (float(x), float(y)) for node, (x, y) in positions.items()}
+
+        with self._lock:
+            self._layouts[signature] = (positions, weights)
+            self._layouts.move_to_end(signature)
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+            self._last_positions.update(positions)
+        return positions
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._layouts), "hits": self.hits, "warm_starts": self.warm_starts, "misses": self.misses}
+
+
+layouts = LayoutCache()
+
+
+# --- Figure -------------------------------------------------------------------------------------------------------
+def flow_figure(graph, positions, metric="transfers", title="Cross-Chain Flows", color="#717aff"):
+    """Plotly network of ``graph``: edge width and node size follow ``metric`` ("transfers" or "volume")."""
+    import plotly.graph_objects as go
+
+    def describe(transfers, volume):
+        return f"{transfers:,} transfers<br>${volume:,.0f}"
+
+    edges = [(src, dst, data) for src, dst, data in graph.edges(data=True) if src != dst]
+    largest = max((data[metric] for _, _, data in edges), default=0) or 1
+
+    fig = go.Figure()
+    buckets = collections.defaultdict(lambda: ([], []))
+    mid_x, mid_y, mid_text = [], [], []
+    for src, dst, data in edges:
+        (x0, y0), (x1, y1) = positions[src], positions[dst]
+        bucket = min(EDGE_WIDTH_BUCKETS - 1, int(EDGE_WIDTH_BUCKETS * math.sqrt(data[metric] / largest)))
+        xs, ys = buckets[bucket]
+        xs.extend([x0, x1, None])
+        ys.extend([y0, y1, None])
+        mid_x.append(x0 + (x1 - x0) * 0.6)
+        mid_y.append(y0 + (y1 - y0) * 0.6)
+        mid_text.append(f"{src} ➡ {dst}<br>{describe(data['transfers'], data['volume'])}")
+    for bucket, (xs, ys) in sorted(buckets.items()):
+        fig.add_trace(go.Scatter(
+            x=xs, y=ys, mode="lines", hoverinfo="skip", showlegend=False,
+            line=dict(width=1 + 2 * bucket, color=color), opacity=0.25 + 0.12 * bucket
+        ))
+    fig.add_trace(go.Scatter(
+        x=mid_x, y=mid_y, mode="markers", hovertext=mid_text, hoverinfo="text", showlegend=False,
+        marker=dict(size=6, symbol="diamond", color=color, opacity=0.6)
+    ))
+
+    nodes = list(graph.nodes)
+    totals = {node: {"out": [0, 0.0], "in": [0, 0.0]} for node in nodes}
+    throughput = {node: 0.0 for node in nodes}
+    for src, dst, data in graph.edges(data=True):
+        for node, side in ((src, "out"), (dst, "in")):
+            totals[node][side][0] += data["transfers"]
+            totals[node][side][1] += data["volume"]
+        throughput[src] += data[metric]
+        if dst != src:
+            throughput[dst] += data[metric]
+    busiest = max(throughput.values(), default=0) or 1
+    fig.add_trace(go.Scatter(
+        x=[positions[node][0] for node in nodes],
+        y=[positions[node][1] for node in nodes],
+        mode="markers+text",
+        text=[str(node) for node in nodes],
+        textposition="top center",
+        hovertext=[
+            f"{node}<br>out: {describe(*totals[node]['out'])}<br>in: {describe(*totals[node]['in'])}" for node in nodes
+        ],
+        hoverinfo="text",
+        showlegend=False,
+        marker=dict(
+            size=[8 + 32 * math.sqrt(throughput[node] / busiest) for node in nodes],
+            color=color,
+            line=dict(width=1, color="white")
+        )
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False, scaleanchor="x"),
+        height=600,
+        margin=dict(l=10, r=10, t=50, b=10)
+    )
+    return fig
+
+
+def chain_flow_chart(flows, transfers, volume, key, title="Cross-Chain Flows", **kwargs):
+    """Draw the flow network of ``flows`` with a selector for the edge weight."""
+    import streamlit as st
+
+    metric = st.radio("Edge weight", ["Transfers", "Volume ($USD)"], horizontal=True, key=f"{key}_metric")
+    graph = build_graph(flows, transfers, volume, **kwargs)
+    if graph.number_of_nodes() == 0:
+        st.info("No cross-chain flows in the selected range.")
+        return graph
+    fig = flow_figure(graph, layouts.layout(graph), metric="transfers" if metric == "Transfers" else "volume", title=title)
+    st.plotly_chart(fig, use_container_width=True)
+    return graph
@@ -0,0 +1,93 @@
+"""Fuse sibling aggregates over the same base rows into one GROUPING SETS query.
+
+Several loaders scan the same events and differ only in what they group by
+(Squid's source chain, destination chain and symbol breakdowns). A
+``FusedQuery`` declares the shared base, the union of their group keys and
+measures, and one ``GroupingSet`` per loader. It compiles to a single
+statement:
+
+    SELECT GROUPING_ID(k1, k2, ...) AS "_set", k1, k2, ..., m1, m2, ...
+    FROM (<base with the key columns added>)
+    GROUP BY GROUPING SETS ((k1), (k2), (k1, k2), ...)
+    QUALIFY <per-set row limits>
+
+so the base is scanned once, and ``split`` cuts the result back into one
+frame per set, with each loader's own column names, order and limit.
+``GROUPING_ID`` tells a set's rows apart from a NULL key in another set.
+"""
+
+
+class GroupingSet:
+    """One sibling aggregate: ``keys`` and ``measures`` map its output columns to fused columns."""
+
+    def __init__(self, name, keys, measures, order_by=None, ascending=False, limit=None, drop_null_keys=False):
+        self.name = name
+        self.keys = keys
+        self.measures = measures
+        self.order_by = order_by
+        self.ascending = ascending
+        self.limit = limit
+        self.drop_null_keys = drop_null_keys
+
+
+class FusedQuery:
+    def __init__(self, keys, measures, sets):
+        """``keys`` and ``measures`` map fused column names to SQL over the base rows."""
+        self.keys = keys
+        self.measures = measures
+        self.sets = sets
+
+    def set_id(self, grouping_set):
+        """``GROUPING_ID`` of the set's rows: a 1 bit for every fused key the set does not group by."""
+        grouped = set(grouping_set.keys.values())
+        width = len(self.keys)
+        return sum(1 << (width - 1 - index) for index, key in enumerate(self.keys) if key not in grouped)
+
+    def sql(self, base):
+        keys = ", ".join(f'"{key}"' for key in self.keys)
+        key_columns = ",\n        ".join(f'{expression} AS "{key}"' for key, expression in self.keys.items())
+        measures = ",\n    ".join(f'{expression} AS "{name}"' for name, expression in self.measures.items())
+        sets = ", ".join(
+            "(" + ", ".join(f'"{key}"' for key in dict.fromkeys(grouping_set.keys.values())) + ")"
+            for grouping_set in self.sets
+        )
+        limits = [
+            f'(GROUPING_ID({keys}) = {self.set_id(grouping_set)} AND ROW_NUMBER() OVER ('
+            f'PARTITION BY GROUPING_ID({keys}) '
+            f'ORDER BY {self.measures[grouping_set.measures[grouping_set.order_by]]} '
+            f'{"ASC" if grouping_set.ascending else "DESC"}) <= {grouping_set.limit})'
+            for grouping_set in self.sets if grouping_set.limit
+        ]
+        unlimited = [str(self.set_id(grouping_set)) for grouping_set in self.sets if not grouping_set.limit]
+        if unlimited:
+            limits.insert(0, f"GROUPING_ID({keys}) IN ({', '.join(unlimited)})")
+        qualify = f"\nQUALIFY {' OR '.join(limits)}" if any(grouping_set.limit for grouping_set in self.sets) else ""
+        return f"""
+SELECT
+    GROUPING_ID({keys}) AS "_set",
+    {keys},
+    {measures}
+FROM (
+    SELECT
+        *,
+        {key_columns}
+    FROM ({base})
+)
+GROUP BY GROUPING SETS ({sets}){qualify}
+"""
+
+    def split(self, frame):
+        """``{set name: frame}`` with each set's rows, columns, order and limit."""
+        parts = {}
+        for grouping_set in self.sets:
+            columns = {**grouping_set.keys, **grouping_set.measures}
+            part = frame.loc[frame["_set"] == self.set_id(grouping_set), list(columns.values())]
+            part.columns = list(columns)
+            if grouping_set.drop_null_keys:
+                part = part.dropna(subset=list(grouping_set.keys))
+            if grouping_set.order_by:
+                part = part.sort_values(grouping_set.order_by, ascending=grouping_set.ascending, kind="stable")
+            if grouping_set.limit:
+                part = part.head(grouping_set.limit)
+            parts[grouping_set.name] = part.reset_index(drop=True)
+        return parts
@@ -0,0 +1,132 @@
+"""End-to-end swap latency as mergeable quantile sketches per day, path and service.
+
+A latency (seconds from an event's creation to its execution, see
+``dashboard.squid_events``) is counted in the logarithmic bucket
+``ceil(log_gamma(latency))`` with ``gamma = (1 + a) / (1 - a)``: every value in
+a bucket is within a relative ``a`` of the bucket's representative value, so
+any quantile read from the counts is too. The warehouse returns the counts
+per day, path, service and bucket. Two sketches merge by adding their counts,
+so the p50/p95/p99 of any range, path or service selection is a sum over
+those rows, with no second pass over the events.
+
+With the local Parquet store configured, the rows of every closed day are
+also kept there (dataset ``squid_latency_<a>``), so a range only queries the
+warehouse for the days the store does not hold yet, plus today's, which is
+still filling.
+
+Configuration (environment):
+    AXELAR_LATENCY_ACCURACY   relative accuracy ``a`` of the quantiles (default 0.01); stored
+                              sketches of another accuracy are not reused
+"""
+import datetime
+import math
+import os
+import threading
+
+import numpy as np
+
+RELATIVE_ACCURACY = float(os.environ.get("AXELAR_LATENCY_ACCURACY", "0.01"))
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+ZERO_BUCKET = -(2**15)  # latencies of zero (or clock skew below it)
+QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+DATASET = f"squid_latency_{RELATIVE_ACCURACY:g}"
+COLUMNS = ["source_chain", "destination_chain", "service", "bucket", "count"]
+
+_store_lock = threading.Lock()
+
+SKETCH_QUERY = """
+    SELECT
+        created_at::date AS "date",
+        source_chain AS "source_chain",
+        destination_chain AS "destination_chain",
+        "Service" AS "service",
+        IFF(latency > 0, CEIL(LN(latency) / LN({gamma})), {zero}) AS "bucket",
+        COUNT(*) AS "count"
+    FROM ({source})
+    WHERE latency IS NOT NULL
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def sketch_query(source):
+    """Bucket counts per day, path and service of the events selected by ``source``."""
+    return SKETCH_QUERY.format(source=source, gamma=repr(GAMMA), zero=ZERO_BUCKET)
+
+
+def bucket_of(latencies):
+    """Sketch bucket of each latency, as in ``SKETCH_QUERY``."""
+    latencies = np.asarray(latencies, dtype=np.float64)
+    buckets = np.full(latencies.shape, ZERO_BUCKET, dtype=np.int64)
+    positive = latencies > 0
+    buckets[positive] = np.ceil(np.log(latencies[positive]) / math.log(GAMMA))
+    return buckets
+
+
+def value_of(buckets):
+    """Representative latency of each bucket: within ``RELATIVE_ACCURACY`` of every value in it."""
+    buckets = np.asarray(buckets, dtype=np.float64)
+    values = 2 * GAMMA ** buckets / (GAMMA + 1)
+    return np.where(buckets == ZERO_BUCKET, 0.0, values)
+
+
+def merge(sketches, by=()):
+    """Sketch rows summed over everything but ``by``: one row per (``by`` values, bucket)."""
+    return sketches.groupby([*by, "bucket"], as_index=False, sort=True)["count"].sum()
+
+
+def quantiles(sketches, by=(), qs=QUANTILES):
+    """``Swaps`` and the ``qs`` latency quantiles in seconds per ``by`` group of the merged sketches."""
+    import pandas as pd
+
+    merged = merge(sketches, by)
+    rows = []
+    groups = merged.groupby(list(by), sort=False) if by else [((), merged)]
+    for key, group in groups:
+        counts = group["count"].to_numpy(dtype=np.int64)
+        cumulative = np.cumsum(counts)
+        total = int(cumulative[-1]) if len(cumulative) else 0
+        if not total:
+            continue
+        key = key if isinstance(key, tuple) else (key,)
+        row = dict(zip(by, key), Swaps=total)
+        buckets = group["bucket"].to_numpy()
+        for name, q in qs.items():
+            # Nearest-rank quantile: the bucket holding the value of rank q * (n - 1).
+            index = int(np.searchsorted(cumulative, q * (total - 1), side="right"))
+            row[name] = float(value_of(buckets[min(index, len(buckets) - 1)]))
+        rows.append(row)
+    return pd.DataFrame(rows, columns=[*by, "Swaps", *qs])
+
+
+# --- Persisted sketches -------------------------------------------------------------------------------------------
+def stored_sketches(store, start_date, end_date, fetch, today=None):
+    """Sketch rows of ``[start_date, end_date]``, reading the days ``store`` holds and fetching the rest.
+
+    ``fetch(start, end)`` returns the rows of a range from the warehouse. Fetched
+    closed days are written to the store, so each is fetched once; the store
+    holds one contiguous range, so a range before or after it is fetched
+    together with the gap up to it. Today's rows are fetched on every call.
+    """
+    import pandas as pd
+
+    today = today or datetime.date.today()
+    last_closed = today - datetime.timedelta(days=1)
+    parts = []
+    closed_end = min(end_date, last_closed)
+    if start_date <= closed_end:
+        with _store_lock:
+            held = store.manifest(DATASET)
+            if held is None:
+                missing = [(start_date, closed_end)]
+            else:
+                missing = []
+                if start_date < held["start"]:
+                    missing.append((start_date, held["start"] - datetime.timedelta(days=1)))
+                if closed_end > held["end"]:
+                    missing.append((held["end"] + datetime.timedelta(days=1), closed_end))
+            for lo, hi in missing:
+                store.write_range(DATASET, fetch(lo, hi), lo, hi)
+        parts.append(store.read(DATASET, start_date, closed_end, columns=COLUMNS))
+    if end_date >= today:
+        parts.append(fetch(max(start_date, today), end_date))
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
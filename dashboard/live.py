@@ -0,0 +1,201 @@
+"""Live "last 24 hours" tail of the newest events, in fixed-size minute buckets.
+
+A ``LiveFeed`` polls the warehouse for the rows newer than the last timestamp
+it has seen, already aggregated per minute, and folds them into a
+``MinuteRing``: one slot per minute of the window, reused as the window
+slides, so memory and the size of each poll stay constant however long a
+panel is left open. Feeds are shared by the whole process; however many
+sessions show a panel, each feed polls at most once per interval.
+
+Every slot carries the revision it last changed in. A panel keeps its own copy
+of the window and applies only the slots changed since its last revision.
+
+Configuration (environment):
+    AXELAR_LIVE_POLL_SECONDS      seconds between polls and panel refreshes (default 30)
+    AXELAR_LIVE_WINDOW_MINUTES    length of the window (default 1440)
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+POLL_SECONDS = float(os.environ.get("AXELAR_LIVE_POLL_SECONDS", "30"))
+WINDOW_MINUTES = int(os.environ.get("AXELAR_LIVE_WINDOW_MINUTES", "1440"))
+
+MINUTE_NS = 60 * 10**9
+
+
+# --- Ring buffer --------------------------------------------------------------------------------------------------
+class MinuteRing:
+    """Per-minute sums of ``metrics`` over the last ``minutes`` minutes."""
+
+    def __init__(self, metrics, minutes=WINDOW_MINUTES):
+        self.metrics = list(metrics)
+        self.minutes = minutes
+        self._minute = np.full(minutes, -1, dtype=np.int64)  # epoch minute held by each slot
+        self._values = np.zeros((minutes, len(self.metrics)))
+        self._revisions = np.zeros(minutes, dtype=np.int64)
+        self.revision = 0
+        self.latest = -1
+
+    def add(self, minutes, values):
+        """Add ``values`` (one row per entry of ``minutes``, epoch minutes) to their buckets."""
+        minutes = np.asarray(minutes, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(minutes), len(self.metrics))
+        if len(minutes):
+            self.latest = max(self.latest, int(minutes.max()))
+        keep = minutes > self.latest - self.minutes
+        minutes, values = minutes[keep], values[keep]
+        if not len(minutes):
+            return
+        self.revision += 1
+        slots = minutes % self.minutes
+        # A slot still holding an older minute has slid out of the window: start it over.
+        stale = self._minute[slots] != minutes
+        self._values[slots[stale]] = 0
+        self._minute[slots[stale]] = minutes[stale]
+        np.add.at(self._values, slots, np.nan_to_num(values))
+        self._revisions[slots] = self.revision
+
+    def _frame(self, mask):
+        import pandas as pd
+
+        mask &= self._minute > self.latest - self.minutes
+        order = np.argsort(self._minute[mask], kind="stable")
+        frame = pd.DataFrame(self._values[mask][order], columns=self.metrics)
+        frame.insert(0, "Minute", pd.to_datetime(self._minute[mask][order] * MINUTE_NS))
+        return frame
+
+    def snapshot(self):
+        """``(revision, frame)`` of every minute in the window."""
+        return self.revision, self._frame(self._minute >= 0)
+
+    def changes(self, since):
+        """``(revision, frame)`` of the minutes changed after revision ``since``."""
+        return self.revision, self._frame(self._revisions > since)
+
+    @property
+    def nbytes(self):
+        return self._minute.nbytes + self._values.nbytes + self._revisions.nbytes
+
+
+# --- Feeds --------------------------------------------------------------------------------------------------------
+class LiveFeed:
+    """A ``MinuteRing`` kept current by polling ``query(since)`` for the rows after ``since``.
+
+    ``query`` returns SQL yielding one row per minute: ``"minute"``, the
+    ``"last_seen"`` timestamp of its newest row, and one column per metric.
+    """
+
+    def __init__(self, name, metrics, query, window_minutes=WINDOW_MINUTES, poll_seconds=POLL_SECONDS):
+        self.name = name
+        self.query = query
+        self.poll_seconds = poll_seconds
+        self.ring = MinuteRing(metrics, window_minutes)
+        self.last_seen = None
+        self.polled_at = None
+        self._polled = 0.0
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """Fold in the rows newer than the last one seen, unless the feed was polled within the interval."""
+        import pandas as pd
+
+        from dashboard.warehouse import read_sql
+
+        with self._lock:
+            if time.monotonic() - self._polled < self.poll_seconds:
+                return
+            since = self.last_seen
+            if since is None:
+                since = pd.Timestamp.now(tz="UTC").tz_localize(None).floor("min") - pd.Timedelta(minutes=self.ring.minutes)
+            frame = read_sql(self.query(since))
+            self._polled = time.monotonic()
+            self.polled_at = pd.Timestamp.now(tz="UTC").tz_localize(None)
+            if not len(frame):
+                return
+            minutes = pd.to_datetime(frame["minute"]).to_numpy(dtype="datetime64[ns]").astype(np.int64) // MINUTE_NS
+            self.ring.add(minutes, frame[self.ring.metrics].to_numpy(dtype=np.float64, na_value=0.0))
+            self.last_seen = max(since, pd.to_datetime(frame["last_seen"]).max())
+
+
+def _literal(timestamp):
+    return timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _core_transactions(since):
+    return f"""
+    SELECT
+        DATE_TRUNC('minute', block_timestamp) AS "minute",
+        MAX(block_timestamp) AS "last_seen",
+        COUNT(DISTINCT tx_id) AS "Transactions",
+        COUNT(DISTINCT IFF(tx_succeeded = FALSE, tx_id, NULL)) AS "Failed Transactions",
+        SUM(IFF(tx_succeeded = TRUE, fee, 0)) / POW(10, 6) AS "Transaction Fees"
+    FROM axelar.core.fact_transactions
+    WHERE block_timestamp > '{_literal(since)}'
+    GROUP BY 1
+    """
+
+
+def _squid_swaps(since):
+    import pandas as pd
+
+    from dashboard import squid_events
+
+    return f"""
+    SELECT
+        DATE_TRUNC('minute', created_at) AS "minute",
+        MAX(created_at) AS "last_seen",
+        COUNT(DISTINCT id) AS "Swaps",
+        SUM(amount_usd) AS "Swap Volume"
+    FROM ({squid_events.source(since.date(), pd.Timestamp.now(tz="UTC").date())})
+    WHERE created_at > '{_literal(since)}'
+    GROUP BY 1
+    """
+
+
+FEEDS = {
+    "core_transactions": LiveFeed(
+        "core_transactions", ["Transactions", "Failed Transactions", "Transaction Fees"], _core_transactions
+    ),
+    "squid_swaps": LiveFeed("squid_swaps", ["Swaps", "Swap Volume"], _squid_swaps),
+}
+
+
+# --- Panel --------------------------------------------------------------------------------------------------------
+def live_panel(feed_name, charts, key="live"):
+    """Toggleable panel redrawing ``charts`` (``[(title, [metrics], color)]``) from a feed every poll interval."""
+    import streamlit as st
+
+    if not st.toggle("🔴Live: last 24 hours", key=f"{key}_enabled", help=f"Polls for new rows every {POLL_SECONDS:.0f}s"):
+        return
+    feed = FEEDS[feed_name]
+
+    @st.fragment(run_every=feed.poll_seconds)
+    def panel():
+        import pandas as pd
+        import plotly.express as px
+
+        feed.poll()
+        state = st.session_state.get(f"{key}_window")
+        if state is None or state[0] > feed.ring.revision:
+            revision, window = feed.ring.snapshot()
+        else:
+            revision, changed = feed.ring.changes(state[0])
+            window = state[1]
+            if len(changed):
+                window = pd.concat([window[~window["Minute"].isin(changed["Minute"])], changed], ignore_index=True)
+                window = window[window["Minute"] > changed["Minute"].max() - pd.Timedelta(minutes=feed.ring.minutes)]
+                window = window.sort_values("Minute", ignore_index=True)
+        st.session_state[f"{key}_window"] = (revision, window)
+
+        columns = st.columns(len(charts))
+        for column, (title, metrics, color) in zip(columns, charts):
+            fig = px.line(window, x="Minute", y=metrics, title=title, color_discrete_sequence=color)
+            fig.update_layout(xaxis_title="", yaxis_title="", legend_title="")
+            column.plotly_chart(fig, use_container_width=True)
+        if feed.last_seen is not None:
+            st.caption(f"Latest event {feed.last_seen:%Y-%m-%d %H:%M:%S} UTC · polled {feed.polled_at:%H:%M:%S} UTC")
+
+    panel()
@@ -0,0 +1 @@
+"""Cached page loaders, importable without rendering a page."""
@@ -0,0 +1,209 @@
+"""Cached loaders behind the Satellite page.
+
+Each loader answers from the local Parquet store when it covers the range and
+otherwise queries the warehouse. New vs. returning users are classified against
+the persisted first-seen index when it is configured. ``get_path_data`` streams
+the download of its warehouse result in batches; the grouped and sorted query
+itself completes before the first one. ``load_daily_chain_pairs`` feeds the
+chain × chain matrices of ``dashboard.chain_matrix``.
+"""
+from dashboard import satellite
+from dashboard.cache import cached
+from dashboard.first_seen import activity_query, first_seen, local_activity
+from dashboard.preview import approximate_sql
+from dashboard.warehouse import iter_batches, read_sql
+
+__all__ = [
+    "get_kpi_data",
+    "load_user_time_series_data",
+    "get_table_data",
+    "get_path_data",
+    "load_daily_chain_pairs",
+]
+
+
+@cached(quota_mb=8)
+def get_kpi_data(start_date, end_date, approximate=False):
+    if satellite.covers(start_date, end_date):
+        return satellite.kpis(start_date, end_date)
+    query = f"""
+    WITH overview AS (
+      WITH tab1 AS (
+        SELECT block_timestamp::date AS date, tx_hash, source_chain, destination_chain, sender, token_symbol
+        FROM AXELAR.DEFI.EZ_BRIDGE_SATELLITE
+        WHERE block_timestamp::date >= '{start_date}'
+      ),
+      tab2 AS (
+        SELECT 
+            created_at::date AS date, 
+            LOWER(data:send:original_source_chain) AS source_chain, 
+            LOWER(data:send:original_destination_chain) AS destination_chain,
+            sender_address AS user,
+            CASE WHEN TRY_TO_DOUBLE(data:send:amount::STRING) IS NOT NULL THEN TRY_TO_DOUBLE(data:send:amount::STRING) END AS amount,
+            CASE 
+              WHEN TRY_TO_DOUBLE(data:send:amount::STRING) IS NOT NULL AND TRY_TO_DOUBLE(data:link:price::STRING) IS NOT NULL 
+              THEN TRY_TO_DOUBLE(data:send:amount::STRING) * TRY_TO_DOUBLE(data:link:price::STRING) END AS amount_usd,
+            SPLIT_PART(id, '_', 1) as tx_hash
+        FROM axelar.axelscan.fact_transfers
+        WHERE status = 'executed' 
+          AND simplified_status = 'received'
+          AND created_at::date >= '{start_date}'
+      )
+      SELECT tab1.date, tab1.tx_hash, tab1.source_chain, tab1.destination_chain, sender, token_symbol, amount, amount_usd
+      FROM tab1 
+      LEFT JOIN tab2 ON tab1.tx_hash=tab2.tx_hash
+    )
+    SELECT 
+      COUNT(DISTINCT tx_hash) AS transfers, 
+      COUNT(DISTINCT sender) AS users,
+      ROUND(SUM(amount_usd)) AS volume_usd,
+      round(COUNT(distinct sender)/count(distinct date)) as avg_daily_users,
+      round(count(distinct tx_hash)/count(distinct date)) as avg_daily_txns,
+      round(sum(amount_usd)/count(distinct date)) as avg_daily_volume
+    FROM overview
+    WHERE date >= '{start_date}' AND date <= '{end_date}';
+    """
+    df = read_sql(approximate_sql(query) if approximate else query)
+    return df
+
+
+@cached(quota_mb=64)
+def load_user_time_series_data(timeframe, start_date, end_date, approximate=False):
+    if first_seen is not None:
+        # First activity comes from the persisted index; only the range itself is read.
+        if satellite.covers(start_date, end_date):
+            activity = local_activity(timeframe, start_date, end_date)
+        else:
+            activity = read_sql(activity_query(timeframe, start_date, end_date))
+        return first_seen.current(end_date).user_time_series(timeframe, activity)
+    if satellite.covers_history(end_date):
+        return satellite.user_time_series(timeframe, start_date, end_date)
+
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
+
+    query = f"""
+    WITH UserRegistrations AS (
+    SELECT
+        sender,
+        MIN(DATE_TRUNC('{timeframe}', block_timestamp)) AS first_registration_date
+    FROM axelar.defi.ez_bridge_satellite
+    GROUP BY sender
+),
+date_activity AS (
+    SELECT
+        DATE_TRUNC('{timeframe}', block_timestamp) AS activity_date,
+        sender
+    FROM axelar.defi.ez_bridge_satellite
+    GROUP BY DATE_TRUNC('{timeframe}', block_timestamp), sender
+),
+NewAndReturning AS (
+    SELECT
+        a.activity_date,
+        a.sender,
+        CASE 
+            WHEN a.activity_date = u.first_registration_date THEN 'New'
+            ELSE 'Returning'
+        END AS user_type
+    FROM date_activity a
+    JOIN UserRegistrations u ON a.sender = u.sender
+)
+
+SELECT
+    activity_date AS "Date",
+    COUNT(DISTINCT CASE WHEN user_type = 'New' THEN sender ELSE NULL END) AS "New Users",
+    COUNT(DISTINCT CASE WHEN user_type = 'Returning' THEN sender ELSE NULL END) AS "Returning Users",
+    COUNT(DISTINCT sender) AS "Total Users"
+FROM NewAndReturning
+WHERE activity_date::date >= '{start_str}' AND activity_date::date <= '{end_str}'
+GROUP BY 1
+ORDER BY 1
+    """
+
+    return read_sql(approximate_sql(query) if approximate else query)
+
+
+# --- Top users and paths over the shared overview rows -----------------------------------------------------------
+OVERVIEW = """
+    WITH tab1 AS (
+      SELECT block_timestamp::date AS date, tx_hash, source_chain, destination_chain, sender, token_symbol
+      FROM AXELAR.DEFI.EZ_BRIDGE_SATELLITE
+      WHERE block_timestamp::date >= '{start_date}' AND block_timestamp::date <= '{end_date}'
+    ),
+    tab2 AS (
+      SELECT 
+          created_at::date AS date, 
+          LOWER(data:send:original_source_chain) AS source_chain, 
+          LOWER(data:send:original_destination_chain) AS destination_chain,
+          sender_address AS user,
+          CASE WHEN TRY_TO_DOUBLE(data:send:amount::STRING) IS NOT NULL THEN TRY_TO_DOUBLE(data:send:amount::STRING) END AS amount,
+          CASE 
+            WHEN TRY_TO_DOUBLE(data:send:amount::STRING) IS NOT NULL AND TRY_TO_DOUBLE(data:link:price::STRING) IS NOT NULL 
+            THEN TRY_TO_DOUBLE(data:send:amount::STRING) * TRY_TO_DOUBLE(data:link:price::STRING) END AS amount_usd,
+          SPLIT_PART(id, '_', 1) as tx_hash
+      FROM axelar.axelscan.fact_transfers
+      WHERE status = 'executed' 
+        AND simplified_status = 'received'
+        AND created_at::date >= '{start_date}' AND created_at::date <= '{end_date}'
+    )
+    SELECT tab1.date, tab1.tx_hash, tab1.source_chain, tab1.destination_chain, sender, token_symbol, amount, amount_usd
+    FROM tab1 
+    LEFT JOIN tab2 ON tab1.tx_hash=tab2.tx_hash
+"""
+
+@cached(quota_mb=32)
+def get_table_data(start_date, end_date):
+    if satellite.covers(start_date, end_date):
+        return satellite.top_users(start_date, end_date)
+    query = f"""
+    SELECT
+      sender AS "👥Address",
+      COUNT(DISTINCT tx_hash) AS "🚀Number of Transfers",
+      COUNT(DISTINCT (source_chain || '➡' || destination_chain)) AS "🔀Number of Unique Paths",
+      COUNT(DISTINCT date::date) AS "📋#Activity Days",
+      MIN(date::date) AS "📅First Transfer Date"
+    FROM ({OVERVIEW.format(start_date=start_date, end_date=end_date)})
+    GROUP BY 1
+    ORDER BY 2 DESC
+    LIMIT 100
+    """
+    return read_sql(query)
+
+
+@cached(quota_mb=64)
+def get_path_data(start_date, end_date):
+    if satellite.covers(start_date, end_date):
+        yield satellite.paths(start_date, end_date)
+        return
+    query = f"""
+    SELECT
+      source_chain || '➡' || destination_chain AS "🔀Path",
+      COUNT(DISTINCT sender) AS "👥Number of AddressES",
+      COUNT(DISTINCT tx_hash) AS "🚀Number of Transfers",
+      ROUND(SUM(amount_usd)) AS "💸Volume of Transfers ($USD)",
+      COUNT(DISTINCT date::date) AS "📋#Activity Days",
+      MIN(date::date) AS "📅First Transfer Date"
+    FROM ({OVERVIEW.format(start_date=start_date, end_date=end_date)})
+    GROUP BY 1
+    ORDER BY 2 DESC
+    """
+    yield from iter_batches(query)
+
+
+@cached(quota_mb=64)
+def load_daily_chain_pairs(start_date, end_date):
+    """Transfers, senders and volume per day and chain pair, the rows of a ``PathCube``."""
+    if satellite.covers(start_date, end_date):
+        return satellite.daily_chain_pairs(start_date, end_date)
+    query = f"""
+    SELECT
+        date AS "date",
+        source_chain AS "source_chain",
+        destination_chain AS "destination_chain",
+        COUNT(DISTINCT tx_hash) AS "transfers",
+        COUNT(DISTINCT sender) AS "users",
+        SUM(amount_usd) AS "volume"
+    FROM ({OVERVIEW.format(start_date=start_date, end_date=end_date)})
+    GROUP BY 1, 2, 3
+    """
+    return read_sql(query)
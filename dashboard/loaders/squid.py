@@ -0,0 +1,257 @@
+"""Cached loaders behind the Squid page.
+
+Each loader answers from the local Parquet store when it covers the range and
+otherwise queries the warehouse, aggregating the typed event projection of
+``dashboard.squid_events`` rather than parsing the events' JSON itself.
+Importing this module renders nothing, so the same loaders (and their cache
+entries) can serve callers other than the page.
+"""
+from dashboard import latency, segments, squid, squid_events
+from dashboard.cache import cached
+from dashboard.fusion import FusedQuery, GroupingSet
+from dashboard.parquet_store import parquet_store
+from dashboard.preview import approximate_sql
+from dashboard.warehouse import iter_batches, read_sql
+
+__all__ = [
+    "load_kpi_data",
+    "load_time_series_data",
+    "load_pie_data",
+    "load_pie_data_dest",
+    "load_pie_data_symbol",
+    "load_transfer_metrics",
+    "load_users",
+    "load_chain_flows",
+    "load_latency_sketches",
+    "load_daily_path_volumes",
+    "load_swapper_segments",
+]
+
+
+@cached(quota_mb=8)
+def load_kpi_data(timeframe, start_date, end_date, approximate=False):
+    if squid.covers(start_date, end_date):
+        return squid.kpis(start_date, end_date)
+    
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
+
+    query = f"""
+    WITH axelar_service AS ({squid_events.source(start_date, end_date)})
+    SELECT 
+        COUNT(DISTINCT id) AS Number_of_Transfers, 
+        COUNT(DISTINCT user) AS Number_of_Users, 
+        ROUND(SUM(amount_usd)) AS Volume_of_Transfers,
+        round(((count(distinct created_at::date)*24*60*60)/count(distinct id))) as Avg_Swap_Time,
+        round(count(distinct id)/count(distinct user)) as Avg_Swap_Count_per_User,
+        round(sum(amount_usd)/count(distinct user)) as Avg_Swap_Volume_per_User
+    FROM axelar_service
+    WHERE created_at::date >= '{start_str}' 
+      AND created_at::date <= '{end_str}'
+    """
+
+    df = read_sql(approximate_sql(query) if approximate else query)
+    return df
+
+
+@cached(quota_mb=64)
+def load_time_series_data(timeframe, start_date, end_date, approximate=False):
+    if squid.covers(start_date, end_date):
+        return squid.time_series(timeframe, start_date, end_date)
+
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
+
+    query = f"""
+    WITH axelar_service AS ({squid_events.source(start_date, end_date)})
+    SELECT 
+        DATE_TRUNC('{timeframe}', created_at) AS Date,
+        COUNT(DISTINCT id) AS Swap_Count, 
+        COUNT(DISTINCT user) AS Swapper_Count, 
+        ROUND(SUM(amount_usd)) AS Swap_Volume,
+        round(sum(amount_usd)/count(distinct user)) as Swap_Volume_per_Swapper
+    FROM axelar_service
+    WHERE created_at::date >= '{start_str}' 
+      AND created_at::date <= '{end_str}'
+    GROUP BY 1
+    ORDER BY 1
+    """
+
+    return read_sql(approximate_sql(query) if approximate else query)
+
+
+# --- Chain and token breakdowns: one GROUPING SETS scan for all four -----------------------------------------------
+BREAKDOWNS = FusedQuery(
+    keys={"src": "source_chain", "dst": "destination_chain", "symbol": squid.symbol_sql("raw_asset")},
+    measures={"swaps": "COUNT(DISTINCT id)", "swappers": "COUNT(DISTINCT user)", "volume": "ROUND(SUM(amount_usd))"},
+    sets=[
+        GroupingSet(
+            "by_source_chain",
+            keys={"SOURCE_CHAIN": "src"},
+            measures={"SWAP_COUNT": "swaps", "SWAPPER_COUNT": "swappers", "SWAP_VOLUME": "volume"},
+            order_by="SWAP_COUNT"
+        ),
+        GroupingSet(
+            "by_destination_chain",
+            keys={"DESTINATION_CHAIN": "dst"},
+            measures={"SWAP_COUNT": "swaps", "SWAPPER_COUNT": "swappers", "SWAP_VOLUME": "volume"},
+            order_by="SWAP_COUNT"
+        ),
+        GroupingSet(
+            "by_symbol",
+            keys={"SYMBOL": "symbol"},
+            measures={"SWAP_COUNT": "swaps", "SWAP_VOLUME": "volume"},
+            order_by="SWAP_COUNT",
+            drop_null_keys=True
+        ),
+        GroupingSet(
+            "source_chain_symbol",
+            keys={"Source Chain": "src", "Symbol": "symbol"},
+            measures={"Volume of Transfers (USD)": "volume", "Number of Transfers": "swaps"},
+            order_by="Number of Transfers"
+        ),
+    ]
+)
+
+
+@cached(quota_mb=32)
+def load_breakdowns(start_date, end_date, approximate=False):
+    """All four breakdowns of the range from the warehouse, as the fused (unsplit) result."""
+    query = BREAKDOWNS.sql(squid_events.source(start_date, end_date))
+    return read_sql(approximate_sql(query) if approximate else query)
+
+
+def _breakdown(name, start_date, end_date, approximate=False):
+    return BREAKDOWNS.split(load_breakdowns(start_date, end_date, approximate=approximate))[name]
+
+
+@cached(quota_mb=16)
+def load_pie_data(start_date, end_date, approximate=False):
+    if squid.covers(start_date, end_date):
+        return squid.by_source_chain(start_date, end_date)
+    return _breakdown("by_source_chain", start_date, end_date, approximate)
+
+
+@cached(quota_mb=16)
+def load_pie_data_dest(start_date, end_date, approximate=False):
+    if squid.covers(start_date, end_date):
+        return squid.by_destination_chain(start_date, end_date)
+    return _breakdown("by_destination_chain", start_date, end_date, approximate)
+
+
+@cached(quota_mb=16)
+def load_pie_data_symbol(start_date, end_date):
+    if squid.covers(start_date, end_date):
+        return squid.by_symbol(start_date, end_date)
+    return _breakdown("by_symbol", start_date, end_date)
+
+
+@cached(quota_mb=32)
+def load_transfer_metrics(start_date, end_date):
+    if squid.covers(start_date, end_date):
+        return squid.source_chain_symbol_metrics(start_date, end_date)
+    return _breakdown("source_chain_symbol", start_date, end_date)
+
+
+@cached(quota_mb=32)
+def load_users(start_date, end_date):
+    if squid.covers(start_date, end_date):
+        return squid.top_users(start_date, end_date)
+
+    query = f"""
+    WITH axelar_service AS ({squid_events.source(start_date, end_date, lower_chains=True)}),
+
+    overview AS (
+        SELECT * FROM axelar_service
+    )
+
+    SELECT 
+        user AS "Swapper", 
+        COUNT(DISTINCT id) AS "Swap Count", 
+        ROUND(SUM(amount_usd), 1) AS "Swap Volume", 
+        COUNT(DISTINCT raw_asset) AS "Swapped Token Count",
+        COUNT(DISTINCT (source_chain || '➡' || destination_chain)) AS "Path Count", 
+        ROUND(SUM(fee), 1) AS "Paid Swap Fee"
+    FROM overview
+    WHERE created_at::DATE >= '{start_date}'
+      AND created_at::DATE <= '{end_date}'
+    GROUP BY 1
+    ORDER BY 2 DESC
+    LIMIT 20;
+    """
+    return read_sql(query)
+
+
+@cached(quota_mb=8)
+def load_chain_flows(start_date, end_date):
+    if squid.covers(start_date, end_date):
+        return squid.chain_flows(start_date, end_date)
+
+    query = f"""
+    WITH axelar_service AS ({squid_events.source(start_date, end_date, lower_chains=True)})
+
+    SELECT 
+        source_chain AS "SOURCE_CHAIN", 
+        destination_chain AS "DESTINATION_CHAIN", 
+        COUNT(DISTINCT id) AS "SWAP_COUNT", 
+        ROUND(SUM(amount_usd)) AS "SWAP_VOLUME"
+    FROM axelar_service
+    WHERE created_at::DATE >= '{start_date}'
+      AND created_at::DATE <= '{end_date}'
+      AND source_chain IS NOT NULL
+      AND destination_chain IS NOT NULL
+    GROUP BY 1, 2
+    ORDER BY 3 DESC;
+    """
+    return read_sql(query)
+
+
+@cached(quota_mb=32)
+def load_latency_sketches(start_date, end_date):
+    """Latency sketch rows (bucket counts per day, path and service) of the range; see ``dashboard.latency``."""
+    if parquet_store is not None:
+        return latency.stored_sketches(parquet_store, start_date, end_date, _fetch_latency_sketches)
+    return _fetch_latency_sketches(start_date, end_date)
+
+
+def _fetch_latency_sketches(start_date, end_date):
+    return read_sql(latency.sketch_query(squid_events.source(start_date, end_date, lower_chains=True)))
+
+
+@cached(quota_mb=32)
+def load_daily_path_volumes(start_date, end_date):
+    if squid.covers(start_date, end_date):
+        return squid.daily_path_volumes(start_date, end_date)
+
+    query = f"""
+    WITH axelar_service AS ({squid_events.source(start_date, end_date, lower_chains=True)})
+    SELECT
+        created_at::date AS "Date",
+        source_chain || '➡' || destination_chain AS "Path",
+        SUM(amount_usd) AS "Volume"
+    FROM axelar_service
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    """
+    return read_sql(query)
+
+
+@cached(quota_mb=1)
+def load_swapper_segments(start_date, end_date):
+    """Wallet segments of every swapper in the range; see ``dashboard.segments``."""
+    if squid.covers(start_date, end_date):
+        return segments.segment([squid.wallet_features(start_date, end_date)])
+
+    query = f"""
+    WITH axelar_service AS ({squid_events.source(start_date, end_date, lower_chains=True)})
+    SELECT
+        COUNT(DISTINCT id) AS "txns",
+        COUNT(DISTINCT created_at::date) AS "days",
+        COUNT(DISTINCT (source_chain || '➡' || destination_chain)) AS "paths",
+        SUM(amount_usd) AS "volume",
+        SUM(fee) AS "fees",
+        COUNT(DISTINCT raw_asset) AS "tokens"
+    FROM axelar_service
+    GROUP BY user
+    """
+    return segments.segment(iter_batches(query))
@@ -0,0 +1,139 @@
+"""Cached loaders behind the User Behaviour page.
+
+The page's queries run over all of ``FACT_TRANSACTIONS`` and take no
+parameters; each loader runs its query through the shared ``run_query`` cache,
+except the wallet segmentation, which streams one row per wallet through
+``dashboard.segments`` and caches only the per-segment summary.
+"""
+from dashboard import segments
+from dashboard.cache import cached
+from dashboard.warehouse import iter_batches, read_sql
+
+__all__ = [
+    "load_new_users",
+    "load_retention",
+    "load_txns_fees",
+    "load_failed_transactions",
+    "load_repeat_users",
+    "load_wallet_segments",
+]
+
+
+@cached(quota_mb=256, ttl=3600, show_spinner=True)
+def run_query(query: str):
+    return read_sql(query)
+
+
+QUERY_NEW_USERS = """
+WITH tab1 AS (
+    SELECT tx_from, MIN(block_timestamp::date) AS first_txn_date
+    FROM AXELAR.CORE.FACT_TRANSACTIONS
+    WHERE tx_succeeded='TRUE'
+    GROUP BY 1
+)
+SELECT 
+    DATE_TRUNC('day', first_txn_date) AS "Date",
+    COUNT(DISTINCT tx_from) AS "New Users"
+FROM tab1
+GROUP BY 1
+ORDER BY 1;
+"""
+
+
+def load_new_users():
+    return run_query(QUERY_NEW_USERS)
+
+
+QUERY_RETENTION = """
+with overview as (
+WITH FirstTransaction AS (
+  SELECT 
+    tx_from,
+    MIN(block_timestamp) AS first_transaction_time
+  FROM axelar.core.fact_transactions
+  where tx_succeeded='TRUE'
+  GROUP BY tx_from
+)
+
+SELECT 
+  DATE(FirstTransaction.first_transaction_time) AS "Cohort Date",
+  DATE(transactions.block_timestamp) AS "Date",
+  COUNT(DISTINCT transactions.tx_from) AS "Retained Users"
+FROM axelar.core.fact_transactions AS transactions
+JOIN FirstTransaction ON transactions.tx_from = FirstTransaction.tx_from
+WHERE transactions.block_timestamp > FirstTransaction.first_transaction_time
+GROUP BY 1, 2
+ORDER BY 2)
+
+select "Date", sum("Retained Users") as "Retained Users"
+from overview 
+group by 1
+order by 1
+"""
+
+
+def load_retention():
+    return run_query(QUERY_RETENTION)
+
+
+QUERY_TXNS_FEES = """
+SELECT 
+    DATE_TRUNC('day', block_timestamp) AS "Date", 
+    COUNT(DISTINCT tx_id) AS "Number of Transactions",
+    ROUND(SUM(fee)/POW(10,6)) AS "Transaction Fees"
+FROM AXELAR.CORE.FACT_TRANSACTIONS
+WHERE tx_succeeded = TRUE
+GROUP BY 1
+ORDER BY 1;
+"""
+
+
+def load_txns_fees():
+    return run_query(QUERY_TXNS_FEES)
+
+
+QUERY_FAILED = """
+SELECT 
+  DATE(block_timestamp) AS "Date",
+  COUNT(DISTINCT tx_id) AS "Failed Transactions"
+FROM axelar.core.fact_transactions
+WHERE tx_succeeded = FALSE
+GROUP BY 1
+ORDER BY 1;
+"""
+
+
+def load_failed_transactions():
+    return run_query(QUERY_FAILED)
+
+
+QUERY_REPEAT_USERS = """
+SELECT 
+  tx_from as "User",
+  DATE(block_timestamp) AS "Txn Date",
+  COUNT(distinct tx_id) AS "Txns Count"
+FROM axelar.core.fact_transactions
+GROUP BY "Txn Date", "User"
+HAVING COUNT(distinct tx_id) > 1
+ORDER BY "Txns Count" DESC
+LIMIT 100;
+"""
+
+
+def load_repeat_users():
+    return run_query(QUERY_REPEAT_USERS)
+
+
+QUERY_WALLET_FEATURES = """
+SELECT
+  COUNT(DISTINCT tx_id) AS "txns",
+  COUNT(DISTINCT block_timestamp::date) AS "days",
+  SUM(fee) / POW(10, 6) AS "fees"
+FROM axelar.core.fact_transactions
+GROUP BY tx_from;
+"""
+
+
+@cached(quota_mb=1, ttl=3600, show_spinner=True)
+def load_wallet_segments():
+    return segments.segment(iter_batches(QUERY_WALLET_FEATURES))
@@ -0,0 +1,118 @@
+"""Measure import cost and time-to-first-paint of the dashboard pages.
+
+Usage:
+    python -m dashboard.measure_startup [--runs N]
+
+Import times are taken in a fresh interpreter per module with
+``-X importtime``. First paint is measured by running each page with
+Streamlit's ``AppTest`` and stopping it at its first warehouse query, which
+gives the time and number of elements rendered before any data is fetched,
+for a cold first run and for warm reruns.
+"""
+import argparse
+import contextlib
+import glob
+import importlib
+import io
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "streamlit",
+    "pandas",
+    "plotly.express",
+    "plotly.graph_objects",
+    "snowflake.connector",
+    "cryptography.hazmat.primitives.serialization",
+    "networkx",
+    "dashboard.cache",
+    "dashboard.warehouse",
+]
+
+
+class _FirstQuery(Exception):
+    pass
+
+
+def import_time_ms(module):
+    """Cumulative import time of ``module`` in a fresh interpreter, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    pattern = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| \s*" + re.escape(module) + r"$")
+    for line in result.stderr.splitlines():
+        match = pattern.search(line)
+        if match:
+            return int(match.group(1)) / 1000
+    return None
+
+
+def first_paint(page, runs):
+    """Seconds and element count until ``page`` issues its first query, per run."""
+    from streamlit.testing.v1 import AppTest
+
+    import dashboard.warehouse as warehouse
+
+    for loaders in ("satellite", "squid", "user_behaviour"):
+        importlib.import_module(f"dashboard.loaders.{loaders}")
+
+    def stop(query, *args, **kwargs):
+        raise _FirstQuery()
+
+    # The loaders bind the query functions at import: patch every dashboard module holding one.
+    patched = []
+    for name, module in list(sys.modules.items()):
+        if name != "dashboard" and not name.startswith("dashboard."):
+            continue
+        for function in ("read_sql", "iter_batches"):
+            original = getattr(warehouse, function)
+            if getattr(module, function, None) is original:
+                patched.append((module, function, original))
+                setattr(module, function, stop)
+    try:
+        app = AppTest.from_file(page, default_timeout=60)
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            # The stopped script is reported as an uncaught exception; keep it out of the output.
+            with contextlib.redirect_stderr(io.StringIO()):
+                app.run()
+            timings.append((time.perf_counter() - started, len(list(app.main))))
+        return timings
+    finally:
+        for module, function, original in patched:
+            setattr(module, function, original)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="reruns per page (first one is cold)")
+    args = parser.parse_args(argv)
+
+    print("Import time (cold, cumulative)")
+    for module in MODULES:
+        ms = import_time_ms(module)
+        print(f"  {module:<48} {'n/a' if ms is None else f'{ms:8.1f} ms'}")
+
+    sys.path.insert(0, ROOT)
+    print("\nTime to first paint (until first warehouse query)")
+    for page in sorted(glob.glob(os.path.join(ROOT, "pages", "*.py"))):
+        timings = first_paint(page, args.runs)
+        cold, warm = timings[0], timings[1:]
+        line = f"  {os.path.basename(page):<40} cold {cold[0] * 1000:8.1f} ms ({cold[1]} elements)"
+        if warm:
+            line += f"  rerun {min(t for t, _ in warm) * 1000:8.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Memory accounting: what the process holds and who holds it.
+
+Reports the deep size of every cached loader result (by loader and
+arguments), the other in-process caches, what each browser session keeps in
+its session state, the live DataFrames and Plotly figures in the process, and
+the process RSS sampled over time. The admin page draws these; ``/metrics``
+on the API, or a standalone listener, exports them in the Prometheus text
+format.
+
+Configuration (environment):
+    AXELAR_RSS_SAMPLE_SECONDS   interval between RSS samples (default 10)
+    AXELAR_RSS_HISTORY          samples kept (default 2160, six hours at the default interval)
+    AXELAR_METRICS_PORT         serve /metrics on this port from the dashboard process; off when unset
+    AXELAR_METRICS_HOST         address the /metrics listener binds (default 127.0.0.1; 0.0.0.0 for all interfaces)
+"""
+import collections
+import gc
+import http.server
+import os
+import sys
+import threading
+import time
+
+from dashboard import anomaly
+from dashboard.cache import result_cache, sizeof
+
+SAMPLE_SECONDS = float(os.environ.get("AXELAR_RSS_SAMPLE_SECONDS", "10"))
+HISTORY = int(os.environ.get("AXELAR_RSS_HISTORY", "2160"))
+
+
+# --- Process ------------------------------------------------------------------------------------------------------
+def rss_bytes():
+    """Resident set size of this process (psutil if installed, else /proc, else the peak from getrusage)."""
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Background thread keeping ``(timestamp, rss)`` samples in a ring buffer."""
+
+    def __init__(self, interval=SAMPLE_SECONDS, history=HISTORY):
+        self.interval = interval
+        self.samples = collections.deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+        return self
+
+    def sample(self):
+        self.samples.append((time.time(), rss_bytes()))
+
+    def history(self):
+        return list(self.samples)
+
+    def _run(self):
+        while True:
+            self.sample()
+            time.sleep(self.interval)
+
+
+rss = RssSampler()
+
+
+# --- Caches -------------------------------------------------------------------------------------------------------
+def cache_entries():
+    """Every result cache entry, largest first."""
+    return sorted(result_cache.entries(), key=lambda entry: entry["nbytes"], reverse=True)
+
+
+def other_caches():
+    """Size of the caches outside the result cache: ``{name: {"entries": n, "nbytes": n}}``."""
+    from dashboard import chain_matrix, first_seen, flow_graph, live, shared_store, tables
+
+    caches = {}
+    with flow_graph.layouts._lock:
+        layouts = list(flow_graph.layouts._layouts.values())
+    caches["flow_layouts"] = {"entries": len(layouts), "nbytes": sum(sizeof(layout) for layout in layouts)}
+
+    orders = [order for per_frame in list(tables._orders.values()) for order in list(per_frame.values())]
+    caches["sorted_orders"] = {
+        "entries": len(orders),
+        "nbytes": sum(order.order.nbytes + order.keys.nbytes + getattr(order.uniques, "nbytes", 0) for order in orders),
+    }
+
+    cubes = list(chain_matrix._cubes.values())
+    caches["path_cubes"] = {"entries": len(cubes), "nbytes": sum(cube.nbytes for cube in cubes)}
+
+    api = sys.modules.get("dashboard.api")
+    if api is not None:
+        caches["api_etags"] = {"entries": len(api._etags), "nbytes": sys.getsizeof(api._etags)}
+
+    loaded = first_seen.first_seen._index if first_seen.first_seen is not None else None
+    if loaded is not None:
+        senders, first = loaded
+        caches["first_seen_index"] = {"entries": len(senders), "nbytes": senders.memory_usage(deep=True) + first.nbytes}
+
+    for name, feed in live.FEEDS.items():
+        caches[f"live_{name}"] = {"entries": feed.ring.minutes, "nbytes": feed.ring.nbytes}
+
+    if shared_store.shared_store is not None:
+        files, nbytes = shared_store.shared_store.usage()
+        # Memory-mapped, so shared by every process rather than part of this one's heap.
+        caches["shared_store"] = {"entries": files, "nbytes": nbytes}
+    return caches
+
+
+# --- Sessions -----------------------------------------------------------------------------------------------------
+def session_usage():
+    """Per browser session: its id, number of session state keys, their deep size and the largest keys.
+
+    Empty outside a running Streamlit server (CLIs, the API process).
+    """
+    try:
+        from streamlit.runtime import Runtime
+    except ImportError:
+        return []
+    if not Runtime.exists():
+        return []
+    manager = getattr(Runtime.instance(), "_session_mgr", None)
+    if manager is None:
+        return []
+
+    sessions = []
+    for info in manager.list_sessions():
+        session = info.session
+        try:
+            state = dict(session.session_state.filtered_state)
+        except Exception:
+            # A session being torn down can disappear under us.
+            continue
+        sizes = {key: sizeof(value) for key, value in state.items()}
+        largest = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:3]
+        sessions.append({
+            "session": session.id,
+            "active": manager.is_active_session(session.id),
+            "keys": len(sizes),
+            "nbytes": sum(sizes.values()),
+            "largest": ", ".join(f"{key} ({nbytes:,} B)" for key, nbytes in largest),
+        })
+    return sorted(sessions, key=lambda session: session["nbytes"], reverse=True)
+
+
+# --- Live objects -------------------------------------------------------------------------------------------------
+def live_objects():
+    """Count and deep size of the DataFrames and Plotly figures alive in the process.
+
+    Walks the garbage collector's object list, so it costs a few hundred
+    milliseconds on a busy process; call it on demand, not per rerun.
+    """
+    import pandas as pd
+
+    try:
+        from plotly.basedatatypes import BaseFigure
+    except ImportError:
+        BaseFigure = ()
+    counts = {"DataFrame": [0, 0], "Figure": [0, 0]}
+    for obj in gc.get_objects():
+        if isinstance(obj, pd.DataFrame):
+            counts["DataFrame"][0] += 1
+            counts["DataFrame"][1] += sizeof(obj)
+        elif BaseFigure and isinstance(obj, BaseFigure):
+            counts["Figure"][0] += 1
+            # Serialised size: what the figure costs to keep and to send to the browser.
+            counts["Figure"][1] += len(obj.to_json())
+    return {kind: {"count": count, "nbytes": nbytes} for kind, (count, nbytes) in counts.items()}
+
+
+# --- Metrics ------------------------------------------------------------------------------------------------------
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_metrics():
+    """All gauges and counters in the Prometheus text exposition format."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            rendered = ",".join(f'{key}="{_label(label)}"' for key, label in labels.items())
+            lines.append(f"{name}{{{rendered}}} {value}" if rendered else f"{name} {value}")
+
+    metric("axelar_process_rss_bytes", "gauge", "Resident set size of the dashboard process.", [({}, rss_bytes())])
+
+    stats = result_cache.stats()
+    metric("axelar_cache_budget_bytes", "gauge", "Global byte budget of the result cache.",
+           [({}, stats["total"]["budget_bytes"])])
+    loaders = stats["loaders"]
+    metric("axelar_cache_bytes", "gauge", "Bytes held in the result cache per loader.",
+           [({"loader": name}, s["nbytes"]) for name, s in loaders.items()])
+    metric("axelar_cache_quota_bytes", "gauge", "Byte quota of each loader.",
+           [({"loader": name}, s["quota"]) for name, s in loaders.items()])
+    metric("axelar_cache_entries", "gauge", "Entries in the result cache per loader.",
+           [({"loader": name}, s["entries"]) for name, s in loaders.items()])
+    for counter in ("hits", "misses", "coalesced", "evictions", "expirations", "rejected", "compressions", "decompressions"):
+        metric(f"axelar_cache_{counter}_total", "counter", f"Result cache {counter} per loader.",
+               [({"loader": name}, s[counter]) for name, s in loaders.items()])
+    metric("axelar_cache_decompress_seconds_total", "counter", "Time spent decompressing cached results per loader.",
+           [({"loader": name}, s["decompress_seconds"]) for name, s in loaders.items()])
+    metric("axelar_cache_compressed_bytes", "gauge", "Bytes held by compressed entries per loader.",
+           [({"loader": name}, s["compressed_nbytes"]) for name, s in loaders.items()])
+    metric("axelar_cache_compressed_raw_bytes", "gauge", "Uncompressed size of the compressed entries per loader.",
+           [({"loader": name}, s["compressed_raw_nbytes"]) for name, s in loaders.items()])
+    metric("axelar_cache_entry_bytes", "gauge", "Deep size of each cached result.",
+           [({"loader": entry["loader"], "arguments": entry["arguments"]}, entry["nbytes"]) for entry in cache_entries()])
+
+    caches = other_caches()
+    metric("axelar_aux_cache_bytes", "gauge", "Bytes held by the caches outside the result cache.",
+           [({"cache": name}, cache["nbytes"]) for name, cache in caches.items()])
+    metric("axelar_aux_cache_entries", "gauge", "Entries in the caches outside the result cache.",
+           [({"cache": name}, cache["entries"]) for name, cache in caches.items()])
+
+    readings = anomaly.state()
+    metric("axelar_anomaly_zscore", "gauge", "Z-score of the latest day of each monitored series.",
+           [({"monitor": r["monitor"], "series": r["series"]}, r["zscore"]) for r in readings if r["zscore"] is not None])
+    metric("axelar_anomaly_active", "gauge", "1 when the latest day of a monitored series is anomalous.",
+           [({"monitor": r["monitor"], "series": r["series"]}, int(r["anomalous"])) for r in readings])
+
+    sessions = session_usage()
+    metric("axelar_sessions", "gauge", "Browser sessions known to the server.", [({}, len(sessions))])
+    # Totals only: a series per session id would grow without bound as sessions come and go.
+    metric("axelar_session_state_bytes", "gauge", "Deep size of the session state of all sessions.",
+           [({}, sum(session["nbytes"] for session in sessions))])
+    metric("axelar_session_state_max_bytes", "gauge", "Deep size of the largest session's session state.",
+           [({}, max((session["nbytes"] for session in sessions), default=0))])
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            return self.send_error(404)
+        body = prometheus_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+_metrics_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host=None):
+    """Serve ``/metrics`` from this process on ``host``:``port`` (defaults from the environment); idempotent."""
+    global _metrics_server
+    port = port or os.environ.get("AXELAR_METRICS_PORT")
+    host = host or os.environ.get("AXELAR_METRICS_HOST", "127.0.0.1")
+    if not port:
+        return None
+    with _metrics_lock:
+        if _metrics_server is None:
+            _metrics_server = http.server.ThreadingHTTPServer((host, int(port)), MetricsHandler)
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics", daemon=True).start()
+    return _metrics_server
+
+
+def start_monitoring():
+    """Start the RSS sampler, and the metrics listener when configured; safe to call on every rerun."""
+    rss.start()
+    start_metrics_server()
@@ -0,0 +1,177 @@
+"""Local, day-partitioned Parquet copy of the event tables the pages read.
+
+Layout (Hive style, one directory per day):
+
+    <root>/<dataset>/date=2024-05-01/part-0.parquet
+    <root>/<dataset>/_manifest.json        # contiguous range that has been extracted
+
+Reads go through ``pyarrow.dataset`` with a filter on the ``date`` partition
+key, so only the day directories inside the requested range are opened, and
+with a column list, so only the needed columns are decoded.
+
+Configuration (environment):
+    AXELAR_PARQUET_ROOT    dataset root; loaders use the warehouse when unset
+"""
+import datetime
+import json
+import os
+import shutil
+import tempfile
+
+PARTITION_KEY = "date"
+MANIFEST = "_manifest.json"
+
+# Columns landed per dataset (besides the ``date`` partition key) and the
+# first day the source tables have data, used for full-history aggregates.
+DATASETS = {
+    "core_transactions": {
+        "columns": ["block_timestamp", "tx_id", "tx_from", "tx_succeeded", "fee"],
+        "origin": datetime.date(2021, 1, 1),
+    },
+    "satellite": {
+        "columns": ["block_timestamp", "tx_hash", "source_chain", "destination_chain", "sender", "token_symbol"],
+        "origin": datetime.date(2021, 1, 1),
+    },
+    "transfers": {
+        "columns": [
+            "created_at", "id", "tx_hash", "source_chain", "destination_chain", "sender_address",
+            "recipient_address", "amount", "amount_usd", "fee", "raw_asset",
+        ],
+        "origin": datetime.date(2021, 1, 1),
+    },
+    "squid_gmp": {
+        "columns": [
+            "created_at", "id", "source_chain", "destination_chain", "user", "contract_address",
+            "amount", "amount_usd", "fee", "raw_asset",
+        ],
+        "origin": datetime.date(2021, 1, 1),
+    },
+}
+
+
+def _as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+class ParquetStore:
+    def __init__(self, root):
+        self.root = root
+
+    # --- Manifest -------------------------------------------------------------------------------------------------
+    def manifest(self, dataset):
+        try:
+            with open(os.path.join(self.root, dataset, MANIFEST)) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return {name: datetime.date.fromisoformat(manifest[name]) for name in ("start", "end")}
+
+    def _write_manifest(self, dataset, start, end):
+        path = os.path.join(self.root, dataset, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"start": start.isoformat(), "end": end.isoformat()}, f)
+        os.replace(path + ".tmp", path)
+
+    def covers(self, dataset, start_date, end_date):
+        """True when every day in ``[start_date, end_date]`` has been extracted."""
+        manifest = self.manifest(dataset)
+        return (
+            manifest is not None
+            and manifest["start"] <= _as_date(start_date)
+            and _as_date(end_date) <= manifest["end"]
+        )
+
+    def covers_history(self, dataset, end_date):
+        """True when the dataset holds every day from its origin up to ``end_date``."""
+        return self.covers(dataset, DATASETS[dataset]["origin"], end_date)
+
+    # --- Writing --------------------------------------------------------------------------------------------------
+    def write_range(self, dataset, frame, start_date, end_date):
+        """Replace the day partitions of ``[start_date, end_date]`` with the rows of ``frame``.
+
+        ``frame`` carries a ``date`` column with the partition day of every
+        row; days without rows end up with no directory. The manifest grows to
+        include the range as long as it stays contiguous.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        start_date, end_date = _as_date(start_date), _as_date(end_date)
+        base = os.path.join(self.root, dataset)
+        os.makedirs(base, exist_ok=True)
+        days = {}
+        if len(frame):
+            for day, rows in frame.groupby(frame[PARTITION_KEY].map(_as_date), sort=True):
+                days[day] = rows.drop(columns=[PARTITION_KEY])
+        day = start_date
+        while day <= end_date:
+            target = os.path.join(base, f"{PARTITION_KEY}={day.isoformat()}")
+            rows = days.get(day)
+            if rows is None:
+                shutil.rmtree(target, ignore_errors=True)
+            else:
+                staging = tempfile.mkdtemp(dir=base, prefix=".staging-")
+                table = pa.Table.from_pandas(rows, preserve_index=False)
+                pq.write_table(table, os.path.join(staging, "part-0.parquet"), compression="zstd")
+                shutil.rmtree(target, ignore_errors=True)
+                os.replace(staging, target)
+            day += datetime.timedelta(days=1)
+
+        manifest = self.manifest(dataset)
+        if manifest is None:
+            self._write_manifest(dataset, start_date, end_date)
+        elif start_date <= manifest["end"] + datetime.timedelta(days=1) and end_date >= manifest["start"] - datetime.timedelta(days=1):
+            self._write_manifest(dataset, min(start_date, manifest["start"]), max(end_date, manifest["end"]))
+
+    # --- Reading --------------------------------------------------------------------------------------------------
+    def _dataset(self, dataset):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        partitioning = ds.partitioning(pa.schema([(PARTITION_KEY, pa.date32())]), flavor="hive")
+        return ds.dataset(
+            os.path.join(self.root, dataset),
+            format="parquet",
+            partitioning=partitioning,
+            exclude_invalid_files=False,
+            ignore_prefixes=[".", "_"],
+        )
+
+    def read(self, dataset, start_date=None, end_date=None, columns=None, filter=None):
+        """Rows of ``dataset`` between two days (inclusive) as a DataFrame.
+
+        The date bounds prune partitions before any file is opened; ``columns``
+        limits decoding to the listed columns (``date`` is always available);
+        ``filter`` is an extra ``pyarrow.dataset`` expression pushed down to the
+        row groups.
+        """
+        import pyarrow.dataset as ds
+
+        if not os.path.isdir(os.path.join(self.root, dataset)):
+            import pandas as pd
+
+            return pd.DataFrame(columns=[PARTITION_KEY] + list(columns or DATASETS[dataset]["columns"]))
+        expression = None
+        if start_date is not None:
+            expression = ds.field(PARTITION_KEY) >= _as_date(start_date)
+        if end_date is not None:
+            upper = ds.field(PARTITION_KEY) <= _as_date(end_date)
+            expression = upper if expression is None else expression & upper
+        if filter is not None:
+            expression = filter if expression is None else expression & filter
+        if columns is not None:
+            columns = [PARTITION_KEY] + [c for c in columns if c != PARTITION_KEY]
+        table = self._dataset(dataset).to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+
+def _from_env():
+    root = os.environ.get("AXELAR_PARQUET_ROOT")
+    return ParquetStore(root) if root else None
+
+
+parquet_store = _from_env()
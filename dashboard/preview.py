@@ -0,0 +1,123 @@
+"""Opt-in fast preview: approximate numbers first, exact ones swapped in when ready.
+
+With the preview on, each section starts its exact load in the background
+and waits for it up to a latency target. If the exact result is not ready by
+then, the section is drawn from the approximate variant of the same query
+(``COUNT(DISTINCT ...)`` replaced by ``APPROX_COUNT_DISTINCT``), marked as an
+estimate, and redrawn in place once the exact load finishes. The estimate is
+the whole query with approximate distinct counts; it is not sampled and has no
+deadline of its own.
+
+The background loads belong to the run that started them: their queries are
+registered under its session, and once the session's next run creates its
+``Refinement`` the ones still queued or running are cancelled.
+"""
+import concurrent.futures
+import os
+import re
+import threading
+import time
+
+from dashboard.profiling import submit
+from dashboard.warehouse import background_run
+
+TARGET_SECONDS = float(os.environ.get("AXELAR_PREVIEW_TARGET_SECONDS", "2"))
+
+_COUNT_DISTINCT = re.compile(r"\bCOUNT\s*\(\s*DISTINCT\s+", re.IGNORECASE)
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="exact-refinement")
+_STOP_KEY = "_preview_stop"
+
+
+def approximate_sql(query):
+    """``query`` with every exact distinct count replaced by Snowflake's HyperLogLog estimate."""
+    return _COUNT_DISTINCT.sub("APPROX_COUNT_DISTINCT(", query)
+
+
+def _yield_check():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return getattr(ctx, "yield_check", None) if ctx is not None else None
+
+
+def _wait(futures, timeout=None, poll_interval=0.25):
+    """Wait for the first of ``futures`` to finish, giving way to a newer rerun while waiting."""
+    yield_check = _yield_check()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        remaining = poll_interval if deadline is None else min(poll_interval, deadline - time.monotonic())
+        if remaining <= 0:
+            return set()
+        done, _ = concurrent.futures.wait(futures, timeout=remaining, return_when=concurrent.futures.FIRST_COMPLETED)
+        if done:
+            return done
+        if yield_check is not None:
+            yield_check()
+
+
+def _stop_previous_run(stop):
+    """Cancel the background loads of the session's previous run and hand ``stop`` to the next one."""
+    import streamlit as st
+
+    previous = st.session_state.get(_STOP_KEY)
+    if previous is not None:
+        previous.set()
+    st.session_state[_STOP_KEY] = stop
+
+
+def _unless_stopped(stop, loader, *args):
+    if stop.is_set():
+        raise concurrent.futures.CancelledError
+    return loader(*args)
+
+
+class Refinement:
+    def __init__(self, enabled, target_seconds=TARGET_SECONDS):
+        self.enabled = enabled
+        self.target_seconds = target_seconds
+        self._pending = {}
+        self._stop = threading.Event()
+        _stop_previous_run(self._stop)
+
+    def show(self, loader, args, draw):
+        """Draw ``loader(*args)`` with ``draw(df, estimate)``, previewing it if the exact load is slow.
+
+        ``loader`` must accept ``approximate=True``; without the preview it is
+        simply called and drawn in place.
+        """
+        if not self.enabled:
+            draw(loader(*args), estimate=False)
+            return
+        import streamlit as st
+
+        placeholder = st.empty()
+        with background_run(self._stop):
+            exact = submit(_executor, _unless_stopped, self._stop, loader, *args)
+        if _wait({exact}, timeout=self.target_seconds):
+            with placeholder.container():
+                draw(exact.result(), estimate=False)
+            return
+        with placeholder.container():
+            st.caption("≈ Estimated with approximate distinct counts; exact figures are loading…")
+            draw(loader(*args, approximate=True), estimate=True)
+        self._pending[exact] = (placeholder, draw)
+
+    def finish(self):
+        """Swap every previewed section for its exact result as the background loads complete."""
+        while self._pending:
+            for exact in _wait(set(self._pending)):
+                placeholder, draw = self._pending.pop(exact)
+                with placeholder.container():
+                    draw(exact.result(), estimate=False)
+
+
+def preview_toggle(key):
+    import streamlit as st
+
+    return st.sidebar.toggle(
+        "⚡Fast preview",
+        key=key,
+        help="Show estimates first on large ranges and replace them with exact figures as they arrive."
+    )
@@ -0,0 +1,303 @@
+"""Opt-in profiling of page reruns, written as Chrome trace files.
+
+Switch it on with ``AXELAR_PROFILE=1`` for every rerun; ``AXELAR_PROFILE=sample``
+also runs a sampling profiler on the script thread. Where the deployment sets
+``AXELAR_PROFILE_ALLOW_URL=1``, ``?profile=1`` / ``?profile=sample`` in the page
+URL does the same for one browser tab; otherwise visitors cannot turn it on.
+Each profiled rerun writes ``<page>-<timestamp>.trace.json`` to
+``AXELAR_PROFILE_DIR`` (default ``./profiles``), which Perfetto
+(ui.perfetto.dev), ``chrome://tracing`` or speedscope open as a flame chart.
+Only the newest ``AXELAR_PROFILE_KEEP`` traces are kept.
+
+A page marks its sections with ``profiler.section("Row 1")``; each section
+runs until the next one starts. Inside a section, spans are recorded for
+warehouse queries (the query, the fetch, and the queue wait around them), loader calls, figure construction
+(``plotly.express`` and ``go.Figure``) and element emission (every ``st.*``
+element call). Whatever a section spends outside those spans is recorded as
+``transform`` time: the page's own DataFrame work.
+
+Configuration (environment):
+    AXELAR_PROFILE              ``1`` to profile every rerun, ``sample`` to add stack sampling
+    AXELAR_PROFILE_ALLOW_URL    ``1`` to let the ``?profile=`` query parameter switch profiling (default off)
+    AXELAR_PROFILE_DIR          directory for the trace files (default ./profiles)
+    AXELAR_PROFILE_KEEP         trace files kept in the directory, oldest removed first (default 50)
+    AXELAR_PROFILE_INTERVAL_MS  stack sampling interval (default 5)
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+
+OFF = ("", "0", "false", "off")
+PROFILE_DIR = pathlib.Path(os.environ.get("AXELAR_PROFILE_DIR", "profiles"))
+PROFILE_KEEP = int(os.environ.get("AXELAR_PROFILE_KEEP", "50"))
+ALLOW_URL = os.environ.get("AXELAR_PROFILE_ALLOW_URL", "").lower() not in OFF
+SAMPLE_INTERVAL = float(os.environ.get("AXELAR_PROFILE_INTERVAL_MS", "5")) / 1000
+TRACE_SUFFIX = ".trace.json"
+
+_current = contextvars.ContextVar("axelar_profile", default=None)
+
+
+def _now_us():
+    return time.perf_counter_ns() / 1000
+
+
+# --- Spans --------------------------------------------------------------------------------------------------------
+def span(name, category):
+    """Context manager recording ``name`` in the current rerun's trace; a no-op when not profiling."""
+    trace = _current.get()
+    if trace is None:
+        return contextlib.nullcontext()
+    return trace.span(name, category)
+
+
+def traced(category, name=None):
+    """Decorator form of ``span`` for ``category``, named after the function by default."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.span(label, category):
+                return func(*args, **kwargs)
+        wrapper.__profiled__ = True
+        return wrapper
+    return decorator
+
+
+class Trace:
+    """Complete ("X") trace events of one rerun, from any thread that inherits its context."""
+
+    def __init__(self, page, sample=False):
+        self.page = page
+        self.events = []
+        self._lock = threading.Lock()
+        self._section = None
+        self._sampler = _StackSampler(threading.get_ident()) if sample else None
+        _current.set(self)
+        self.started = _now_us()
+        _instrument()
+        if self._sampler is not None:
+            self._sampler.start()
+
+    @contextlib.contextmanager
+    def span(self, name, category):
+        start = _now_us()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, _now_us())
+
+    def add(self, name, category, start, end, tid=None):
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "ts": start, "dur": max(end - start, 0),
+                "pid": os.getpid(), "tid": threading.get_ident() if tid is None else tid,
+            })
+
+    def section(self, name):
+        """End the running section, if any, and start ``name``."""
+        self._close_section()
+        self._section = (name, _now_us(), len(self.events))
+
+    def _close_section(self):
+        if self._section is None:
+            return
+        name, start, first = self._section
+        end = _now_us()
+        self._section = None
+        thread = threading.get_ident()
+        with self._lock:
+            children = sorted(
+                (event["ts"], event["ts"] + event["dur"])
+                for event in self.events[first:] if event["tid"] == thread
+            )
+        # Gaps between the top-level spans on the script thread are the page's own work.
+        cursor = start
+        for child_start, child_end in children:
+            if child_start > cursor:
+                self.add("transform", "transform", cursor, child_start)
+            cursor = max(cursor, child_end)
+        if end > cursor:
+            self.add("transform", "transform", cursor, end)
+        self.add(name, "section", start, end)
+
+    def finish(self):
+        """Close the last section, stop sampling and write the trace; returns its path."""
+        self._close_section()
+        _current.set(None)
+        end = _now_us()
+        self.add(f"rerun {self.page}", "rerun", self.started, end)
+        events = list(self.events)
+        thread_names = {threading.get_ident(): "script"}
+        if self._sampler is not None:
+            events.extend(self._sampler.stop())
+            thread_names[_StackSampler.TID] = "samples"
+        for thread in threading.enumerate():
+            thread_names.setdefault(thread.ident, thread.name)
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": label}}
+            for tid, label in thread_names.items()
+        )
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        path = PROFILE_DIR / f"{self.page}-{time.strftime('%Y%m%d-%H%M%S')}-{int(end) % 1_000_000:06d}{TRACE_SUFFIX}"
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        _prune_traces()
+        return path
+
+
+def _prune_traces(keep=None):
+    """Remove all but the newest ``keep`` trace files from ``PROFILE_DIR``."""
+    keep = PROFILE_KEEP if keep is None else keep
+    traces = []
+    for path in PROFILE_DIR.glob(f"*{TRACE_SUFFIX}"):
+        try:
+            traces.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    for _, path in sorted(traces, reverse=True)[keep:]:
+        path.unlink(missing_ok=True)
+
+
+class _NullProfiler:
+    enabled = False
+
+    def section(self, name):
+        pass
+
+    def finish(self):
+        return None
+
+
+class PageProfiler:
+    """What a page holds on to: sections while it runs and the trace file once it is done."""
+
+    enabled = True
+
+    def __init__(self, page, sample):
+        self.trace = Trace(page, sample=sample)
+
+    def section(self, name):
+        self.trace.section(name)
+
+    def finish(self):
+        import streamlit as st
+
+        path = self.trace.finish()
+        st.caption(f"⏱️Profile of this rerun written to `{path}`")
+        return path
+
+
+def page_profiler(page):
+    """Profiler for this rerun of ``page``: active when enabled by the environment, or by an allowed ``?profile=``."""
+    mode = os.environ.get("AXELAR_PROFILE", "")
+    if ALLOW_URL:
+        try:
+            import streamlit as st
+
+            mode = st.query_params.get("profile", mode)
+        except Exception:
+            pass
+    # A rerun stopped before finish() must not leave its trace collecting this one's spans.
+    _current.set(None)
+    if mode.lower() in OFF:
+        return _NullProfiler()
+    return PageProfiler(page, sample=mode == "sample")
+
+
+def submit(executor, func, *args, **kwargs):
+    """``executor.submit`` that carries the current trace into the worker thread."""
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+# --- Instrumentation ----------------------------------------------------------------------------------------------
+_instrumented = False
+_instrument_lock = threading.Lock()
+
+EMITTERS = (
+    "plotly_chart", "dataframe", "table", "markdown", "metric", "caption", "subheader", "title",
+    "info", "warning", "bar_chart", "line_chart", "write",
+)
+
+
+def _instrument():
+    """Wrap Plotly figure construction and Streamlit element calls in spans, once per process.
+
+    The wrappers only look up the current trace when no rerun is being profiled,
+    so leaving them installed costs nothing measurable.
+    """
+    global _instrumented
+    with _instrument_lock:
+        if _instrumented:
+            return
+        _instrumented = True
+
+        import plotly.express as px
+        from plotly.basedatatypes import BaseFigure
+        from streamlit.delta_generator import DeltaGenerator
+
+        for name in dir(px):
+            func = getattr(px, name)
+            if not name.startswith("_") and inspect.isfunction(func) and not getattr(func, "__profiled__", False):
+                setattr(px, name, traced("figure", f"px.{name}")(func))
+        BaseFigure.__init__ = traced("figure", "Figure")(BaseFigure.__init__)
+        for name in EMITTERS:
+            method = getattr(DeltaGenerator, name, None)
+            if method is not None and not getattr(method, "__profiled__", False):
+                setattr(DeltaGenerator, name, traced("emit", f"st.{name}")(method))
+
+
+# --- Sampling -----------------------------------------------------------------------------------------------------
+class _StackSampler:
+    """Samples one thread's Python stack and folds consecutive samples into nested spans."""
+
+    TID = 1
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self._events = []
+        self._open = []  # [(frame label, start)] from the outermost frame inwards
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._fold([], _now_us())
+        return self._events
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self._fold(stack[::-1], _now_us())
+
+    def _fold(self, stack, now):
+        common = 0
+        while common < min(len(stack), len(self._open)) and self._open[common][0] == stack[common]:
+            common += 1
+        for label, start in reversed(self._open[common:]):
+            self._events.append({
+                "name": label, "cat": "sample", "ph": "X", "ts": start, "dur": now - start,
+                "pid": os.getpid(), "tid": self.TID,
+            })
+        self._open = self._open[:common] + [(label, now) for label in stack[common:]]
@@ -0,0 +1,118 @@
+"""Satellite bridge aggregates computed from the local Parquet store.
+
+Mirrors the SQL of the Satellite page: bridge transfers from
+``EZ_BRIDGE_SATELLITE`` left-joined on tx hash to the executed Axelarscan
+transfers that carry their USD amount.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.chain_matrix import pair_codes, path_names
+from dashboard.parquet_store import parquet_store
+from dashboard.sqlfuncs import date_trunc, sql_round
+
+
+def covers(start_date, end_date):
+    return (
+        parquet_store is not None
+        and parquet_store.covers("satellite", start_date, end_date)
+        and parquet_store.covers("transfers", start_date, end_date)
+    )
+
+
+def covers_history(end_date):
+    return parquet_store is not None and parquet_store.covers_history("satellite", end_date)
+
+
+def overview(start_date, end_date):
+    """Bridge transfers in the range with the USD amount of their Axelarscan transfer."""
+    bridges = parquet_store.read(
+        "satellite", start_date, end_date,
+        columns=["tx_hash", "source_chain", "destination_chain", "sender", "token_symbol"]
+    )
+    amounts = parquet_store.read("transfers", start_date, end_date, columns=["tx_hash", "amount", "amount_usd"])
+    return bridges.merge(amounts.drop(columns=["date"]), on="tx_hash", how="left")
+
+
+def _path(frame):
+    """Integer path of each row (see ``dashboard.chain_matrix``); NaN where a chain is missing."""
+    codes = pair_codes(frame["source_chain"], frame["destination_chain"])
+    return pd.Series(codes, index=frame.index).where(codes >= 0)
+
+
+# --- Aggregates -------------------------------------------------------------------------------------------------------
+def kpis(start_date, end_date):
+    df = overview(start_date, end_date)
+    transfers = df["tx_hash"].nunique()
+    users = df["sender"].nunique()
+    volume = df["amount_usd"].sum(min_count=1)
+    days = df["date"].nunique()
+    return pd.DataFrame([{
+        "TRANSFERS": transfers,
+        "USERS": users,
+        "VOLUME_USD": sql_round(volume),
+        "AVG_DAILY_USERS": sql_round(users / days) if days else None,
+        "AVG_DAILY_TXNS": sql_round(transfers / days) if days else None,
+        "AVG_DAILY_VOLUME": sql_round(volume / days) if days else None,
+    }])
+
+
+def top_users(start_date, end_date, limit=100):
+    df = overview(start_date, end_date)
+    df = df.assign(path=_path(df))
+    grouped = df.groupby("sender", dropna=False)
+    out = pd.DataFrame({
+        "🚀Number of Transfers": grouped["tx_hash"].nunique(),
+        "🔀Number of Unique Paths": grouped["path"].nunique(),
+        "📋#Activity Days": grouped["date"].nunique(),
+        "📅First Transfer Date": grouped["date"].min(),
+    })
+    out.index.name = "👥Address"
+    return out.reset_index().sort_values("🚀Number of Transfers", ascending=False, ignore_index=True).head(limit)
+
+
+def paths(start_date, end_date):
+    df = overview(start_date, end_date)
+    df = df.assign(path=_path(df))
+    grouped = df.groupby("path", dropna=False)
+    out = pd.DataFrame({
+        "👥Number of AddressES": grouped["sender"].nunique(),
+        "🚀Number of Transfers": grouped["tx_hash"].nunique(),
+        "💸Volume of Transfers ($USD)": sql_round(grouped["amount_usd"].sum(min_count=1)),
+        "📋#Activity Days": grouped["date"].nunique(),
+        "📅First Transfer Date": grouped["date"].min(),
+    })
+    out.index = pd.Index(path_names(out.index.to_series().fillna(-1).to_numpy(dtype=np.int64)), name="🔀Path")
+    return out.sort_index(na_position="last").reset_index().sort_values("👥Number of AddressES", ascending=False, ignore_index=True)
+
+
+def daily_chain_pairs(start_date, end_date):
+    """Transfers, senders and volume per day and (source, destination) chain pair."""
+    df = overview(start_date, end_date)
+    grouped = df.groupby(["date", "source_chain", "destination_chain"])
+    return pd.DataFrame({
+        "transfers": grouped["tx_hash"].nunique(),
+        "users": grouped["sender"].nunique(),
+        "volume": grouped["amount_usd"].sum(),
+    }).reset_index()
+
+
+def user_time_series(timeframe, start_date, end_date):
+    """New, returning and total senders per period; first activity is taken over all history."""
+    df = parquet_store.read("satellite", columns=["block_timestamp", "sender"], end_date=end_date)
+    df = df.assign(activity_date=date_trunc(timeframe, df["block_timestamp"]))
+    activity = df[["activity_date", "sender"]].drop_duplicates()
+    first = activity.groupby("sender")["activity_date"].transform("min")
+    activity = activity.assign(new=activity["activity_date"] == first)
+    in_range = activity[
+        (activity["activity_date"].dt.date >= pd.Timestamp(start_date).date())
+        & (activity["activity_date"].dt.date <= pd.Timestamp(end_date).date())
+    ]
+    grouped = in_range.groupby("activity_date")
+    out = pd.DataFrame({
+        "New Users": grouped["new"].sum(),
+        "Returning Users": grouped["new"].size() - grouped["new"].sum(),
+        "Total Users": grouped["sender"].nunique(),
+    })
+    out.index.name = "Date"
+    return out.reset_index().sort_values("Date", ignore_index=True)
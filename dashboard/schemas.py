@@ -0,0 +1,125 @@
+"""Output dtypes of the loaders, enforced before a result is cached.
+
+Results arrive with the warehouse connector's defaults: 64-bit numbers, and
+object columns for chain names, symbols, paths and dates. Each loader's
+columns are declared here and converted once, in ``cached``, so every copy of
+a result (in memory, in the shared store, behind the API) is the compact one
+and the pages group and plot typed columns instead of parsing objects.
+
+Kinds:
+    category   low-cardinality labels (chains, symbols, paths, services)
+    int        integers narrowed to int32 when the values fit
+    float      float32 when every value survives the round trip, else float64
+    date       datetime64
+Columns a result does not have are ignored, and so are loaders that are not
+listed; single-row KPI results are left alone, there is nothing to save.
+"""
+SCHEMAS = {
+    # Squid
+    "load_time_series_data": {
+        "DATE": "date", "SWAP_COUNT": "int", "SWAPPER_COUNT": "int",
+        "SWAP_VOLUME": "float", "SWAP_VOLUME_PER_SWAPPER": "float",
+    },
+    "load_pie_data": {"SOURCE_CHAIN": "category", "SWAP_COUNT": "int", "SWAPPER_COUNT": "int", "SWAP_VOLUME": "float"},
+    "load_pie_data_dest": {"DESTINATION_CHAIN": "category", "SWAP_COUNT": "int", "SWAPPER_COUNT": "int", "SWAP_VOLUME": "float"},
+    "load_pie_data_symbol": {"SYMBOL": "category", "SWAP_COUNT": "int", "SWAP_VOLUME": "float"},
+    "load_transfer_metrics": {
+        "Source Chain": "category", "Symbol": "category",
+        "Volume of Transfers (USD)": "float", "Number of Transfers": "int",
+    },
+    "load_users": {
+        "Swap Count": "int", "Swap Volume": "float", "Swapped Token Count": "int",
+        "Path Count": "int", "Paid Swap Fee": "float",
+    },
+    "load_chain_flows": {
+        "SOURCE_CHAIN": "category", "DESTINATION_CHAIN": "category", "SWAP_COUNT": "int", "SWAP_VOLUME": "float",
+    },
+    "load_latency_sketches": {
+        "date": "date", "source_chain": "category", "destination_chain": "category", "service": "category",
+        "bucket": "int", "count": "int",
+    },
+    "load_daily_path_volumes": {"Date": "date", "Path": "category", "Volume": "float"},
+    # Satellite
+    "load_user_time_series_data": {
+        "Date": "date", "New Users": "int", "Returning Users": "int", "Total Users": "int",
+    },
+    "get_table_data": {
+        "🚀Number of Transfers": "int", "🔀Number of Unique Paths": "int",
+        "📋#Activity Days": "int", "📅First Transfer Date": "date",
+    },
+    "get_path_data": {
+        "🔀Path": "category", "👥Number of AddressES": "int", "🚀Number of Transfers": "int",
+        "💸Volume of Transfers ($USD)": "float", "📋#Activity Days": "int", "📅First Transfer Date": "date",
+    },
+    "load_daily_chain_pairs": {
+        "date": "date", "source_chain": "category", "destination_chain": "category",
+        "transfers": "int", "users": "int", "volume": "float",
+    },
+    # User Behaviour: every query goes through run_query, so this is the union of their columns.
+    "run_query": {
+        "Date": "date", "Txn Date": "date", "Cohort Date": "date",
+        "New Users": "int", "Retained Users": "int", "Number of Transactions": "int",
+        "Transaction Fees": "float", "Failed Transactions": "int", "Txns Count": "int",
+    },
+}
+
+
+# --- Conversions --------------------------------------------------------------------------------------------------
+def _int(series):
+    import numpy as np
+    import pandas as pd
+
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return series
+    if pd.api.types.is_float_dtype(series):
+        if not (series == np.floor(series)).all():
+            return series
+    info = np.iinfo(np.int32)
+    # Not narrower than int32: page code multiplies and adds these columns.
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        return series.astype(np.int64)
+    return series.astype(np.int32)
+
+
+def _float(series):
+    import numpy as np
+    import pandas as pd
+
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors="coerce")
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+        return pd.Series(narrow, index=series.index, name=series.name)
+    return series.astype(np.float64)
+
+
+def _date(series):
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors="coerce")
+
+
+def _category(series):
+    import pandas as pd
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype("category")
+
+
+CONVERTERS = {"int": _int, "float": _float, "date": _date, "category": _category}
+
+
+def conform(loader, frame):
+    """``frame`` with its columns converted to the dtypes declared for ``loader``."""
+    schema = SCHEMAS.get(loader)
+    if not schema or not hasattr(frame, "columns"):
+        return frame
+    columns = {
+        column: CONVERTERS[kind](frame[column])
+        for column, kind in schema.items() if column in frame.columns
+    }
+    return frame.assign(**columns) if columns else frame
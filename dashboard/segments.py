@@ -0,0 +1,126 @@
+"""Wallet segmentation over every wallet, in bounded memory.
+
+The warehouse aggregates one feature row per wallet (transactions, active
+days, unique paths, volume, fees, tokens) and streams the rows in batches.
+Each batch is cut into chunks of ``CHUNK_ROWS`` rows. A process pool buckets
+each chunk with vectorized rules and returns only per-segment totals. At most
+two chunks per worker are in flight, so memory depends on the chunk size
+rather than the number of wallets. A process that is itself a pool worker
+(a snapshot worker, for instance) buckets in its own thread: its parent
+already runs the work in parallel, and a nested pool would keep the worker
+from exiting.
+
+Segments, first matching rule wins:
+    🐋Whales         volume of at least AXELAR_SEGMENT_WHALE_USD
+    🤖Bots           at least AXELAR_SEGMENT_BOT_TXNS_PER_DAY transactions per active day
+    🔁Power Users    active on at least AXELAR_SEGMENT_POWER_DAYS days
+    🌱Casual Users   everyone else
+
+Configuration (environment):
+    AXELAR_SEGMENT_WORKERS              worker processes; 0 buckets in the calling thread (default: CPU count)
+    AXELAR_SEGMENT_CHUNK_ROWS           wallets per chunk (default 250000)
+    AXELAR_SEGMENT_WHALE_USD            (default 100000)
+    AXELAR_SEGMENT_BOT_TXNS_PER_DAY     (default 50)
+    AXELAR_SEGMENT_POWER_DAYS           (default 10)
+"""
+import collections
+import os
+import threading
+
+import numpy as np
+
+WORKERS = int(os.environ.get("AXELAR_SEGMENT_WORKERS", str(os.cpu_count() or 1)))
+CHUNK_ROWS = int(os.environ.get("AXELAR_SEGMENT_CHUNK_ROWS", "250000"))
+WHALE_USD = float(os.environ.get("AXELAR_SEGMENT_WHALE_USD", "100000"))
+BOT_TXNS_PER_DAY = float(os.environ.get("AXELAR_SEGMENT_BOT_TXNS_PER_DAY", "50"))
+POWER_DAYS = float(os.environ.get("AXELAR_SEGMENT_POWER_DAYS", "10"))
+
+FEATURES = ["txns", "days", "paths", "volume", "fees", "tokens"]
+SEGMENTS = ["🐋Whales", "🤖Bots", "🔁Power Users", "🌱Casual Users"]
+
+
+# --- Bucketing ----------------------------------------------------------------------------------------------------
+def features(batch):
+    """``batch``'s feature columns as a float matrix in ``FEATURES`` order; absent features are zero."""
+    columns = {str(column).lower(): column for column in batch.columns}
+    matrix = np.zeros((len(batch), len(FEATURES)))
+    for index, name in enumerate(FEATURES):
+        if name in columns:
+            matrix[:, index] = batch[columns[name]].to_numpy(dtype=np.float64, na_value=0.0)
+    return matrix
+
+
+def classify(matrix, thresholds=(WHALE_USD, BOT_TXNS_PER_DAY, POWER_DAYS)):
+    """Segment index of every row of a feature matrix."""
+    whale_usd, bot_rate, power_days = thresholds
+    txns, days, volume = matrix[:, 0], matrix[:, 1], matrix[:, 3]
+    rate = np.divide(txns, days, out=np.zeros_like(txns), where=days > 0)
+    return np.select(
+        [volume >= whale_usd, rate >= bot_rate, days >= power_days],
+        [0, 1, 2],
+        default=3
+    )
+
+
+def _totals(matrix, thresholds):
+    """Wallets and feature sums per segment of one chunk: an array of ``len(SEGMENTS)`` x (1 + features)."""
+    codes = classify(matrix, thresholds)
+    totals = np.zeros((len(SEGMENTS), 1 + len(FEATURES)))
+    totals[:, 0] = np.bincount(codes, minlength=len(SEGMENTS))
+    for index in range(len(FEATURES)):
+        totals[:, 1 + index] = np.bincount(codes, weights=matrix[:, index], minlength=len(SEGMENTS))
+    return totals
+
+
+# --- Pool ---------------------------------------------------------------------------------------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor(workers):
+    global _pool
+    import concurrent.futures
+    import multiprocessing
+
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the server process has threads, which fork would copy mid-flight.
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def segment(batches, workers=WORKERS, chunk_rows=CHUNK_ROWS):
+    """Per-segment summary of the wallet feature rows in ``batches`` (DataFrames with ``FEATURES`` columns)."""
+    import pandas as pd
+
+    thresholds = (WHALE_USD, BOT_TXNS_PER_DAY, POWER_DAYS)
+    totals = np.zeros((len(SEGMENTS), 1 + len(FEATURES)))
+    import multiprocessing
+
+    if multiprocessing.parent_process() is not None:
+        workers = 0
+    pool = _executor(workers) if workers else None
+    pending = collections.deque()
+    for batch in batches:
+        matrix = features(batch)
+        for start in range(0, len(matrix), chunk_rows):
+            chunk = matrix[start:start + chunk_rows]
+            if pool is None:
+                totals += _totals(chunk, thresholds)
+                continue
+            pending.append(pool.submit(_totals, chunk, thresholds))
+            while len(pending) > 2 * workers:
+                totals += pending.popleft().result()
+    while pending:
+        totals += pending.popleft().result()
+
+    out = pd.DataFrame(totals[:, 1:], columns=FEATURES)
+    out.insert(0, "Wallets", totals[:, 0].astype(np.int64))
+    out.insert(0, "Segment", SEGMENTS)
+    for column, share in (("Wallets", "Wallet Share"), ("volume", "Volume Share"), ("fees", "Fee Share")):
+        total = out[column].sum()
+        out[share] = out[column] / total if total else 0.0
+    out = out.rename(columns={"txns": "Transactions", "volume": "Volume ($USD)", "fees": "Fees"})
+    return out[["Segment", "Wallets", "Wallet Share", "Transactions", "Volume ($USD)", "Volume Share", "Fees", "Fee Share"]]
@@ -0,0 +1,155 @@
+"""Cross-process result store backed by Arrow IPC files.
+
+When several Streamlit processes serve the dashboard, each one would otherwise
+run the same warehouse queries and hold its own copy of every result. This
+store writes each loader result once as an uncompressed Arrow IPC file in a
+directory every worker can see (``/dev/shm`` on Linux keeps it in shared
+memory) and reads it back through a read-only memory map, so the pages of a
+result are shared by all workers and a hit in one process is a hit in all.
+The in-process cache counts such a frame at ``resident_nbytes``, the part of
+it that is not backed by the mapping.
+
+Configuration (environment):
+    AXELAR_SHARED_STORE_DIR   directory for the IPC files; the store is off when unset
+    AXELAR_SHARED_STORE_MB    size cap for the directory (default 2048)
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+MB = 1024 * 1024
+SUFFIX = ".arrow"
+TMP_SUFFIX = ".tmp"
+# A temporary file this old was left by a writer that died; live writes take seconds.
+STALE_TMP_SECONDS = 3600
+
+
+def resident_nbytes(frame):
+    """Bytes of a frame returned by ``get`` that live in this process rather than in the mapping.
+
+    Numeric, datetime, categorical and string columns (the index included) are
+    read without a copy; only object columns are materialized.
+    """
+    usage = frame.memory_usage(index=True, deep=True)
+    private = [column for column in frame.columns if frame[column].dtype == object]
+    if frame.index.dtype == object:
+        private.append("Index")
+    return int(usage[private].sum())
+
+
+class SharedResultStore:
+    def __init__(self, root, max_bytes=2048 * MB):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._prune_tmp()
+
+    def path_for(self, loader, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.root, f"{loader}-{digest}{SUFFIX}")
+
+    def get(self, loader, key, ttl=None):
+        """Return the stored frame, or None when absent or older than ``ttl`` seconds."""
+        path = self.path_for(loader, key)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        if ttl and mtime + ttl <= time.time():
+            self._unlink(path)
+            return None
+        import pyarrow as pa
+
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            self._unlink(path)
+            return None
+        # split_blocks keeps primitive columns backed by the mapped buffers
+        # instead of consolidating them into freshly allocated 2-D blocks.
+        return table.to_pandas(split_blocks=True)
+
+    def put(self, loader, key, frame):
+        """Publish ``frame`` atomically; concurrent writers of the same key are harmless."""
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+            return False
+        path = self.path_for(loader, key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._unlink(tmp_path)
+            return False
+        self._prune()
+        return True
+
+    def clear(self, loader=None):
+        for name in os.listdir(self.root):
+            if name.endswith(SUFFIX) and (loader is None or name.startswith(f"{loader}-")):
+                self._unlink(os.path.join(self.root, name))
+
+    def usage(self):
+        """``(files, bytes)`` currently held in the store directory."""
+        files = nbytes = 0
+        for name in os.listdir(self.root):
+            if name.endswith(SUFFIX):
+                try:
+                    nbytes += os.stat(os.path.join(self.root, name)).st_size
+                except FileNotFoundError:
+                    continue
+                files += 1
+        return files, nbytes
+
+    def _prune(self):
+        files = []
+        for name in os.listdir(self.root):
+            if name.endswith(SUFFIX):
+                try:
+                    st = os.stat(os.path.join(self.root, name))
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            # Unlinking is safe for readers that still hold a mapping of the file.
+            self._unlink(os.path.join(self.root, name))
+            total -= size
+
+    def _prune_tmp(self):
+        """Remove the temporary files of writes that never completed."""
+        cutoff = time.time() - STALE_TMP_SECONDS
+        for name in os.listdir(self.root):
+            if name.endswith(TMP_SUFFIX):
+                path = os.path.join(self.root, name)
+                try:
+                    if os.stat(path).st_mtime < cutoff:
+                        self._unlink(path)
+                except FileNotFoundError:
+                    continue
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _from_env():
+    root = os.environ.get("AXELAR_SHARED_STORE_DIR")
+    if not root:
+        return None
+    return SharedResultStore(root, int(float(os.environ.get("AXELAR_SHARED_STORE_MB", "2048")) * MB))
+
+
+shared_store = _from_env()
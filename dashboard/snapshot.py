@@ -0,0 +1,216 @@
+"""Render static snapshots of every dashboard page for a list of parameter sets.
+
+Usage:
+    python -m dashboard.snapshot --out ./snapshots --range 2024-01-01:2024-03-31 [--range ...]
+                                 [--timeframes month week] [--pages squid satellite user_behaviour]
+                                 [--workers 4] [--parquet-root ./data]
+
+Every (range, timeframe) pair is one parameter set. The loader calls all sets
+need are planned up front and deduplicated on the arguments each loader
+actually takes, so a loader that ignores the timeframe, or takes no
+parameters at all, runs once for every set that shares its arguments. The
+unique calls run across a process pool. Each page script is then run headless
+(Streamlit's AppTest) against those results, and its figures and tables are
+written to a standalone HTML file next to the loaders' data as Parquet and CSV.
+
+With ``--parquet-root`` (or ``AXELAR_PARQUET_ROOT``) the loaders answer from
+the local Parquet store wherever it covers a range; otherwise they query the
+warehouse.
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import datetime
+import html
+import importlib
+import inspect
+import io
+import logging
+import os
+import pathlib
+
+PAGES = {
+    "user_behaviour": "1_📊User_Behaviour_Analysis.py",
+    "squid": "2_📚Squid_Analysis.py",
+    "satellite": "3_📋Satellite_Analysis.py",
+}
+PAGES_DIR = pathlib.Path(__file__).resolve().parent.parent / "pages"
+
+
+# --- Planning -----------------------------------------------------------------------------------------------------
+def page_loaders(page):
+    """``{name: loader}`` of the loaders the page calls, as listed in ``dashboard.loaders.<page>.__all__``."""
+    module = importlib.import_module(f"dashboard.loaders.{page}")
+    return {name: getattr(module, name) for name in module.__all__}
+
+
+def call_arguments(loader, params):
+    """The subset of ``params`` that ``loader`` takes, as sorted items (the dedup key)."""
+    names = [name for name in inspect.signature(loader).parameters if name != "approximate"]
+    return tuple((name, params[name]) for name in sorted(names))
+
+
+def plan(pages, parameter_sets):
+    """Unique ``(page, loader name, arguments)`` calls needed to render every page for every set."""
+    calls = {}
+    for page in pages:
+        for name, loader in page_loaders(page).items():
+            for params in parameter_sets:
+                calls.setdefault((page, name, call_arguments(loader, params)), None)
+    return list(calls)
+
+
+def run_call(page, name, arguments):
+    """Worker: run one loader call and return its result as a single DataFrame."""
+    import pandas as pd
+
+    result = page_loaders(page)[name](**dict(arguments))
+    if inspect.isgenerator(result):
+        batches = list(result)
+        result = pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+    return result
+
+
+# --- Rendering ----------------------------------------------------------------------------------------------------
+@contextlib.contextmanager
+def serving(page, results):
+    """Replace the page's loaders with lookups into ``results`` while its script runs."""
+    module = importlib.import_module(f"dashboard.loaders.{page}")
+    originals = page_loaders(page)
+
+    def replacement(name, loader):
+        def lookup(*args, **kwargs):
+            bound = inspect.signature(loader).bind(*args, **kwargs)
+            bound.apply_defaults()
+            return results[(page, name, call_arguments(loader, bound.arguments))]
+
+        if inspect.isgeneratorfunction(inspect.unwrap(loader)):
+            def stream(*args, **kwargs):
+                yield lookup(*args, **kwargs)
+            return stream
+        return lookup
+
+    for name, loader in originals.items():
+        setattr(module, name, replacement(name, loader))
+    try:
+        yield
+    finally:
+        for name, loader in originals.items():
+            setattr(module, name, loader)
+
+
+def render_page(page, params, results):
+    """Run ``page`` headless for ``params``; returns ``(title, figures, tables)``."""
+    import plotly.io as pio
+    from streamlit.testing.v1 import AppTest
+
+    # Bare-mode warnings from setting up the headless run are noise here.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    with serving(page, results), contextlib.redirect_stderr(io.StringIO()):
+        app = AppTest.from_file(str(PAGES_DIR / PAGES[page]), default_timeout=300)
+        for name in ("timeframe", "start_date", "end_date"):
+            app.session_state[name] = params[name]
+        app.run()
+    if app.exception:
+        raise RuntimeError(f"{page}: {app.exception[0].value}")
+    figures = [pio.from_json(chart.proto.spec) for chart in app.get("plotly_chart")]
+    tables = [table.value for table in app.dataframe]
+    title = app.title[0].value if app.title else page
+    return title, figures, tables
+
+
+def write_html(path, title, subtitle, figures, tables):
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>{html.escape(title)}</title></head><body style='font-family: sans-serif'>",
+        f"<h1>{html.escape(title)}</h1><p>{html.escape(subtitle)}</p>",
+    ]
+    for index, figure in enumerate(figures):
+        # The first figure embeds plotly.js so the file works offline.
+        parts.append(figure.to_html(full_html=False, include_plotlyjs=index == 0))
+    for table in tables:
+        parts.append(table.to_html(border=0))
+    parts.append("</body></html>")
+    path.write_text("\n".join(parts), encoding="utf-8")
+
+
+def label(params):
+    return f"{params['start_date']}_{params['end_date']}_{params['timeframe']}"
+
+
+# --- CLI ----------------------------------------------------------------------------------------------------------
+def parse_range(value):
+    start, _, end = value.partition(":")
+    return datetime.date.fromisoformat(start), datetime.date.fromisoformat(end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, type=pathlib.Path)
+    parser.add_argument("--range", dest="ranges", action="append", type=parse_range, required=True,
+                        help="START:END in ISO dates; repeat for several ranges")
+    parser.add_argument("--timeframes", nargs="+", choices=["day", "week", "month"], default=["month"])
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=sorted(PAGES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--parquet-root", help="local dataset root (default: $AXELAR_PARQUET_ROOT)")
+    args = parser.parse_args(argv)
+    if args.parquet_root:
+        # Read by dashboard.parquet_store at import, here and in the workers.
+        os.environ["AXELAR_PARQUET_ROOT"] = args.parquet_root
+
+    parameter_sets = [
+        {"start_date": start, "end_date": end, "timeframe": timeframe}
+        for start, end in args.ranges for timeframe in args.timeframes
+    ]
+    calls = plan(args.pages, parameter_sets)
+    total = sum(len(page_loaders(page)) for page in args.pages) * len(parameter_sets)
+    print(f"{len(parameter_sets)} parameter sets, {len(calls)} unique loader calls ({total} before deduplication)")
+
+    results = {}
+    failed = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run_call, *call): call for call in calls}
+        for future in concurrent.futures.as_completed(futures):
+            call = futures[future]
+            try:
+                results[call] = future.result()
+            except Exception as error:
+                failed[call] = error
+                print(f"  failed {call[0]}.{call[1]}{dict(call[2])}: {error!r}")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    index = []
+    for params in parameter_sets:
+        directory = args.out / label(params)
+        (directory / "data").mkdir(parents=True, exist_ok=True)
+        for page in args.pages:
+            loaders = page_loaders(page)
+            keys = {name: (page, name, call_arguments(loader, params)) for name, loader in loaders.items()}
+            if any(key in failed for key in keys.values()):
+                print(f"  skipped {page} for {label(params)}: a loader failed")
+                continue
+            for name, key in keys.items():
+                results[key].to_parquet(directory / "data" / f"{page}.{name}.parquet", index=False)
+                results[key].to_csv(directory / "data" / f"{page}.{name}.csv", index=False)
+            try:
+                title, figures, tables = render_page(page, params, results)
+            except RuntimeError as error:
+                failed[(page, label(params))] = error
+                print(f"  failed {label(params)}/{page}.html: {error}")
+                continue
+            subtitle = f"{params['start_date']} to {params['end_date']}, by {params['timeframe']}"
+            write_html(directory / f"{page}.html", title, subtitle, figures, tables)
+            index.append((f"{label(params)}/{page}.html", f"{title} ({subtitle})"))
+            print(f"  {label(params)}/{page}.html: {len(figures)} figures, {len(tables)} tables")
+
+    links = "".join(f"<li><a href='{html.escape(href)}'>{html.escape(text)}</a></li>" for href, text in index)
+    (args.out / "index.html").write_text(
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Snapshots</title></head>"
+        f"<body style='font-family: sans-serif'><h1>Snapshots</h1><ul>{links}</ul></body></html>",
+        encoding="utf-8"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,27 @@
+"""Pandas equivalents of the Snowflake functions used by the page queries."""
+import numpy as np
+import pandas as pd
+
+
+def sql_round(value, digits=0):
+    """``ROUND`` with Snowflake's half-away-from-zero rule; NULL stays NULL."""
+    if value is None or (np.isscalar(value) and pd.isna(value)):
+        return None
+    scale = 10.0 ** digits
+    rounded = np.sign(value) * np.floor(np.abs(value) * scale + 0.5) / scale
+    if digits == 0 and np.isscalar(rounded):
+        return int(rounded)
+    return rounded
+
+
+def date_trunc(timeframe, values):
+    """``DATE_TRUNC('day' | 'week' | 'month', ...)``; weeks start on Monday as in Snowflake."""
+    values = pd.to_datetime(values)
+    days = values.dt.normalize()
+    if timeframe == "day":
+        return days
+    if timeframe == "week":
+        return days - pd.to_timedelta(days.dt.weekday, unit="D")
+    if timeframe == "month":
+        return days - pd.to_timedelta(days.dt.day - 1, unit="D")
+    raise ValueError(f"unsupported timeframe: {timeframe!r}")
@@ -0,0 +1,261 @@
+"""Squid swap aggregates computed from the local Parquet store.
+
+Mirrors the SQL of the Squid page: token transfers sent by a Squid router
+plus GMP calls approved for a Squid contract, executed and received.
+"""
+import pandas as pd
+
+from dashboard.parquet_store import parquet_store
+from dashboard.sqlfuncs import date_trunc, sql_round
+
+SQUID_CONTRACTS = [
+    "0xce16F69375520ab01377ce7B88f5BA8C48F8D666",  # Squid
+    "0x492751eC3c57141deb205eC2da8bFcb410738630",  # Squid-blast
+    "0xDC3D8e1Abe590BCa428a8a2FC4CfDbD1AcF57Bd9",  # Squid-fraxtal
+    "0xdf4fFDa22270c12d0b5b3788F1669D709476111E",  # Squid coral
+    "0xe6B3949F9bBF168f4E3EFc82bc8FD849868CC6d8",  # Squid coral hub
+]
+
+SYMBOLS = {
+    "arb-wei": "ARB",
+    "avalanche-uusdc": "Avalanche USDC",
+    "avax-wei": "AVAX",
+    "bnb-wei": "BNB",
+    "busd-wei": "BUSD",
+    "cbeth-wei": "cbETH",
+    "cusd-wei": "cUSD",
+    "dai-wei": "DAI",
+    "dot-planck": "DOT",
+    "eeur": "EURC",
+    "ern-wei": "ERN",
+    "eth-wei": "ETH",
+    "fil-wei": "FIL",
+    "frax-wei": "FRAX",
+    "ftm-wei": "FTM",
+    "glmr-wei": "GLMR",
+    "hzn-wei": "HZN",
+    "link-wei": "LINK",
+    "matic-wei": "MATIC",
+    "mkr-wei": "MKR",
+    "mpx-wei": "MPX",
+    "oath-wei": "OATH",
+    "op-wei": "OP",
+    "orbs-wei": "ORBS",
+    "factory/sei10hud5e5er4aul2l7sp2u9qp2lag5u4xf8mvyx38cnjvqhlgsrcls5qn5ke/seilor": "SEILOR",
+    "pepe-wei": "PEPE",
+    "polygon-uusdc": "Polygon USDC",
+    "reth-wei": "rETH",
+    "ring-wei": "RING",
+    "shib-wei": "SHIB",
+    "sonne-wei": "SONNE",
+    "stuatom": "stATOM",
+    "uatom": "ATOM",
+    "uaxl": "AXL",
+    "ukuji": "KUJI",
+    "ulava": "LAVA",
+    "uluna": "LUNA",
+    "ungm": "NGM",
+    "uni-wei": "UNI",
+    "uosmo": "OSMO",
+    "usomm": "SOMM",
+    "ustrd": "STRD",
+    "utia": "TIA",
+    "uumee": "UMEE",
+    "uusd": "USTC",
+    "uusdc": "USDC",
+    "uusdt": "USDT",
+    "vela-wei": "VELA",
+    "wavax-wei": "WAVAX",
+    "wbnb-wei": "WBNB",
+    "wbtc-satoshi": "WBTC",
+    "weth-wei": "WETH",
+    "wfil-wei": "WFIL",
+    "wftm-wei": "WFTM",
+    "wglmr-wei": "WGLMR",
+    "wmai-wei": "WMAI",
+    "wmatic-wei": "WMATIC",
+    "wsteth-wei": "wstETH",
+    "yield-eth-wei": "yieldETH",
+}
+
+EVENT_COLUMNS = ["created_at", "source_chain", "destination_chain", "user", "amount", "amount_usd", "fee", "id", "service", "raw_asset"]
+
+
+# --- Base events ----------------------------------------------------------------------------------------------------
+def _contains_any(column, needles):
+    """Pushed-down ``column ILIKE '%needle%' OR ...``."""
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    expression = None
+    for needle in needles:
+        match = pc.match_substring(ds.field(column), needle, ignore_case=True)
+        expression = match if expression is None else expression | match
+    return expression
+
+
+def covers(start_date, end_date):
+    return (
+        parquet_store is not None
+        and parquet_store.covers("transfers", start_date, end_date)
+        and parquet_store.covers("squid_gmp", start_date, end_date)
+    )
+
+
+def events(start_date, end_date, lower_gmp_chains=False):
+    """Squid token transfers and GMP calls created in the range, one row per event."""
+    transfers = parquet_store.read(
+        "transfers", start_date, end_date,
+        columns=["created_at", "source_chain", "destination_chain", "recipient_address",
+                 "amount", "amount_usd", "fee", "id", "raw_asset"],
+        filter=_contains_any("sender_address", SQUID_CONTRACTS)
+    )
+    transfers = transfers.rename(columns={"recipient_address": "user"}).assign(service="Token Transfers")
+
+    gmp = parquet_store.read(
+        "squid_gmp", start_date, end_date,
+        columns=["created_at", "source_chain", "destination_chain", "user",
+                 "amount", "amount_usd", "fee", "id", "raw_asset"],
+        filter=_contains_any("contract_address", SQUID_CONTRACTS)
+    )
+    gmp = gmp.assign(service="GMP")
+    if lower_gmp_chains:
+        gmp = gmp.assign(source_chain=gmp["source_chain"].str.lower(), destination_chain=gmp["destination_chain"].str.lower())
+
+    return pd.concat([transfers[EVENT_COLUMNS + ["date"]], gmp[EVENT_COLUMNS + ["date"]]], ignore_index=True)
+
+
+def symbol(raw_asset):
+    mapped = raw_asset.map(SYMBOLS)
+    seilor = raw_asset.fillna("").str.lower().str.startswith("factory/sei10hub")
+    mapped = mapped.mask(seilor & mapped.isna(), "SEILOR")
+    return mapped.fillna(raw_asset)
+
+
+def symbol_sql(column):
+    """SQL twin of ``symbol`` over the raw asset ``column``."""
+    cases = "\n".join(f"WHEN {column} = '{raw}' THEN '{name}'" for raw, name in SYMBOLS.items())
+    return f"CASE {cases}\nWHEN {column} ILIKE 'factory/sei10hub%' THEN 'SEILOR'\nELSE {column} END"
+
+
+def _path(frame):
+    return frame["source_chain"] + "➡" + frame["destination_chain"]
+
+
+# --- Aggregates -------------------------------------------------------------------------------------------------------
+def kpis(start_date, end_date):
+    df = events(start_date, end_date)
+    swaps = df["id"].nunique()
+    users = df["user"].nunique()
+    volume = df["amount_usd"].sum(min_count=1)
+    days = df["date"].nunique()
+    return pd.DataFrame([{
+        "NUMBER_OF_TRANSFERS": swaps,
+        "NUMBER_OF_USERS": users,
+        "VOLUME_OF_TRANSFERS": sql_round(volume),
+        "AVG_SWAP_TIME": sql_round(days * 24 * 60 * 60 / swaps) if swaps else None,
+        "AVG_SWAP_COUNT_PER_USER": sql_round(swaps / users) if users else None,
+        "AVG_SWAP_VOLUME_PER_USER": sql_round(volume / users) if users else None,
+    }])
+
+
+def time_series(timeframe, start_date, end_date):
+    df = events(start_date, end_date)
+    grouped = df.groupby(date_trunc(timeframe, df["created_at"]).rename("DATE"))
+    out = pd.DataFrame({
+        "SWAP_COUNT": grouped["id"].nunique(),
+        "SWAPPER_COUNT": grouped["user"].nunique(),
+        "SWAP_VOLUME": sql_round(grouped["amount_usd"].sum(min_count=1)),
+    })
+    out["SWAP_VOLUME_PER_SWAPPER"] = sql_round(grouped["amount_usd"].sum(min_count=1) / out["SWAPPER_COUNT"])
+    return out.reset_index().sort_values("DATE", ignore_index=True)
+
+
+def _by_chain(df, column, label):
+    grouped = df.groupby(column, dropna=False)
+    out = pd.DataFrame({
+        "SWAP_COUNT": grouped["id"].nunique(),
+        "SWAPPER_COUNT": grouped["user"].nunique(),
+        "SWAP_VOLUME": sql_round(grouped["amount_usd"].sum(min_count=1)),
+    })
+    out.index.name = label
+    return out.reset_index().sort_values("SWAP_COUNT", ascending=False, ignore_index=True)
+
+
+def by_source_chain(start_date, end_date):
+    return _by_chain(events(start_date, end_date), "source_chain", "SOURCE_CHAIN")
+
+
+def by_destination_chain(start_date, end_date):
+    return _by_chain(events(start_date, end_date), "destination_chain", "DESTINATION_CHAIN")
+
+
+def by_symbol(start_date, end_date):
+    df = events(start_date, end_date)
+    df = df.assign(SYMBOL=symbol(df["raw_asset"]))
+    grouped = df[df["SYMBOL"].notna()].groupby("SYMBOL")
+    out = pd.DataFrame({
+        "SWAP_COUNT": grouped["id"].nunique(),
+        "SWAP_VOLUME": sql_round(grouped["amount_usd"].sum(min_count=1)),
+    })
+    return out.reset_index().sort_values("SWAP_COUNT", ascending=False, ignore_index=True)
+
+
+def source_chain_symbol_metrics(start_date, end_date):
+    df = events(start_date, end_date)
+    df = df.assign(symbol=symbol(df["raw_asset"]))
+    grouped = df.groupby(["source_chain", "symbol"], dropna=False)
+    out = pd.DataFrame({
+        "Volume of Transfers (USD)": sql_round(grouped["amount_usd"].sum(min_count=1)),
+        "Number of Transfers": grouped["id"].nunique(),
+    })
+    out.index.names = ["Source Chain", "Symbol"]
+    return out.reset_index().sort_values("Number of Transfers", ascending=False, ignore_index=True)
+
+
+def daily_path_volumes(start_date, end_date):
+    df = events(start_date, end_date, lower_gmp_chains=True)
+    grouped = df.groupby([df["date"].rename("Date"), _path(df).rename("Path")])
+    out = pd.DataFrame({"Volume": grouped["amount_usd"].sum(min_count=1)})
+    return out.reset_index().sort_values(["Date", "Path"], ignore_index=True)
+
+
+def chain_flows(start_date, end_date):
+    df = events(start_date, end_date, lower_gmp_chains=True)
+    grouped = df.groupby(["source_chain", "destination_chain"])
+    out = pd.DataFrame({
+        "SWAP_COUNT": grouped["id"].nunique(),
+        "SWAP_VOLUME": sql_round(grouped["amount_usd"].sum(min_count=1)),
+    })
+    out.index.names = ["SOURCE_CHAIN", "DESTINATION_CHAIN"]
+    return out.reset_index().sort_values("SWAP_COUNT", ascending=False, ignore_index=True)
+
+
+def wallet_features(start_date, end_date):
+    """One row per swapper with the ``dashboard.segments`` features."""
+    df = events(start_date, end_date, lower_gmp_chains=True)
+    df = df.assign(path=_path(df))
+    grouped = df.groupby("user")
+    return pd.DataFrame({
+        "txns": grouped["id"].nunique(),
+        "days": grouped["date"].nunique(),
+        "paths": grouped["path"].nunique(),
+        "volume": grouped["amount_usd"].sum(),
+        "fees": grouped["fee"].sum(),
+        "tokens": grouped["raw_asset"].nunique(),
+    }).reset_index(drop=True)
+
+
+def top_users(start_date, end_date, limit=20):
+    df = events(start_date, end_date, lower_gmp_chains=True)
+    df = df.assign(path=_path(df))
+    grouped = df.groupby("user", dropna=False)
+    out = pd.DataFrame({
+        "Swap Count": grouped["id"].nunique(),
+        "Swap Volume": sql_round(grouped["amount_usd"].sum(min_count=1), 1),
+        "Swapped Token Count": grouped["raw_asset"].nunique(),
+        "Path Count": grouped["path"].nunique(),
+        "Paid Swap Fee": sql_round(grouped["fee"].sum(min_count=1), 1),
+    })
+    out.index.name = "Swapper"
+    return out.reset_index().sort_values("Swap Count", ascending=False, ignore_index=True).head(limit)
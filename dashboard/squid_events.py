@@ -0,0 +1,270 @@
+"""Typed Squid event projection: the VARIANT fields of every Squid event, parsed once.
+
+Every Squid aggregate reads the same events: token transfers sent by a Squid
+router and GMP calls approved for a Squid contract, executed and received.
+``PROJECTION`` flattens them into typed columns (``amount``, ``amount_usd``,
+``fee`` and ``latency`` as doubles, ``raw_asset`` and the chains as strings) in three
+layers: the inner select pulls each VARIANT path out once, the middle one
+converts each to a number once, and the outer one combines the numbers. The
+range is pushed into both source scans instead of filtering the full history
+after parsing it.
+
+With ``AXELAR_SQUID_EVENTS_TABLE`` set, the projection is also persisted in
+that table and maintained incrementally; the loaders read it for any range it
+covers and fall back to the inline projection otherwise.
+
+Usage:
+    python -m dashboard.squid_events [--table DB.SCHEMA.SQUID_EVENTS] [--start 2024-01-01] [--end 2024-01-31]
+
+Without ``--start`` the table resumes from its last loaded day (pulled again,
+as it may have been partial) or from the origin. Each run replaces the days it
+loads in one transaction, so it is safe to rerun.
+
+The local Parquet store's ``transfers`` and ``squid_gmp`` datasets are the
+same projection on disk (see ``dashboard.extract`` and ``dashboard.squid``).
+
+Configuration (environment):
+    AXELAR_SQUID_EVENTS_TABLE   fully qualified table holding the projection; inline only when unset
+"""
+import argparse
+import datetime
+import os
+
+from dashboard.cache import cached
+from dashboard.parquet_store import DATASETS
+from dashboard.squid import SQUID_CONTRACTS
+
+TABLE = os.environ.get("AXELAR_SQUID_EVENTS_TABLE")
+ORIGIN = DATASETS["squid_gmp"]["origin"]
+COLUMNS = [
+    ("date", "DATE"),
+    ("created_at", "TIMESTAMP_NTZ"),
+    ("id", "STRING"),
+    ("service", "STRING"),
+    ("source_chain", "STRING"),
+    ("destination_chain", "STRING"),
+    ("user", "STRING"),
+    ("amount", "DOUBLE"),
+    ("amount_usd", "DOUBLE"),
+    ("fee", "DOUBLE"),
+    ("raw_asset", "STRING"),
+    ("latency", "DOUBLE"),
+]
+
+PROJECTION = """
+    SELECT
+        created_at::date AS date,
+        created_at,
+        id,
+        service,
+        source_chain,
+        destination_chain,
+        user,
+        amount,
+        IFF(service = 'GMP', value_usd, amount * price) AS amount_usd,
+        IFF(service = 'GMP', COALESCE(gas_used * gas_price, express_fee), fee_value) AS fee,
+        raw_asset,
+        COALESCE(time_spent, executed_at - called_at) AS latency
+    FROM (
+        SELECT
+            created_at, id, service, source_chain, destination_chain, user, raw_asset,
+            {amount} AS amount,
+            {price} AS price,
+            {fee_value} AS fee_value,
+            {value_usd} AS value_usd,
+            {gas_used} AS gas_used,
+            {gas_price} AS gas_price,
+            {express_fee} AS express_fee,
+            {time_spent} AS time_spent,
+            {called_at} AS called_at,
+            {executed_at} AS executed_at
+        FROM (
+            -- Token Transfers
+            SELECT
+                created_at,
+                id,
+                'Token Transfers' AS service,
+                LOWER(data:send:original_source_chain) AS source_chain,
+                LOWER(data:send:original_destination_chain) AS destination_chain,
+                recipient_address AS user,
+                data:link:asset::STRING AS raw_asset,
+                data:send:amount AS amount_v,
+                data:link:price AS price_v,
+                data:send:fee_value AS fee_value_v,
+                NULL::VARIANT AS value_usd_v,
+                NULL::VARIANT AS gas_used_v,
+                NULL::VARIANT AS gas_price_v,
+                NULL::VARIANT AS express_fee_v,
+                data:time_spent:total AS time_spent_v,
+                NULL::VARIANT AS called_at_v,
+                NULL::VARIANT AS executed_at_v
+            FROM axelar.axelscan.fact_transfers
+            WHERE status = 'executed'
+              AND simplified_status = 'received'
+              AND ({senders})
+              AND created_at::date >= '{start}' AND created_at::date <= '{end}'
+
+            UNION ALL
+
+            -- GMP
+            SELECT
+                created_at,
+                id,
+                'GMP' AS service,
+                data:call.chain::STRING AS source_chain,
+                data:call.returnValues.destinationChain::STRING AS destination_chain,
+                data:call.transaction.from::STRING AS user,
+                data:symbol::STRING AS raw_asset,
+                data:amount AS amount_v,
+                NULL::VARIANT AS price_v,
+                NULL::VARIANT AS fee_value_v,
+                data:value AS value_usd_v,
+                data:gas:gas_used_amount AS gas_used_v,
+                data:gas_price_rate:source_token.token_price.usd AS gas_price_v,
+                data:fees:express_fee_usd AS express_fee_v,
+                data:time_spent:total AS time_spent_v,
+                data:call.block_timestamp AS called_at_v,
+                data:executed.block_timestamp AS executed_at_v
+            FROM axelar.axelscan.fact_gmp
+            WHERE status = 'executed'
+              AND simplified_status = 'received'
+              AND ({contracts})
+              AND created_at::date >= '{start}' AND created_at::date <= '{end}'
+        )
+    )
+"""
+
+
+def _number(variant):
+    """A VARIANT path as a double: NULL for arrays, objects and anything that does not parse."""
+    return f"IFF(IS_ARRAY({variant}) OR IS_OBJECT({variant}), NULL, TRY_TO_DOUBLE({variant}::STRING))"
+
+
+def _day(value):
+    return value.strftime("%Y-%m-%d")
+
+
+def projection(start_date, end_date):
+    """The inline projection of the Squid events created in the range."""
+    return PROJECTION.format(
+        start=_day(start_date),
+        end=_day(end_date),
+        senders=" OR ".join(f"sender_address ILIKE '%{address}%'" for address in SQUID_CONTRACTS),
+        contracts=" OR ".join(
+            f"data:approved:returnValues:contractAddress ILIKE '%{address}%'" for address in SQUID_CONTRACTS
+        ),
+        **{
+            name: _number(f"{name}_v")
+            for name in (
+                "amount", "price", "fee_value", "value_usd", "gas_used", "gas_price", "express_fee",
+                "time_spent", "called_at", "executed_at",
+            )
+        },
+    )
+
+
+# --- Reading ------------------------------------------------------------------------------------------------------
+@cached(quota_mb=1, ttl=300, shared=False)
+def table_range():
+    """``(first day, last day)`` loaded in the projection table, or None when it is empty or unset."""
+    from snowflake.connector.errors import ProgrammingError
+
+    from dashboard.warehouse import read_sql
+
+    if not TABLE:
+        return None
+    try:
+        frame = read_sql(f"SELECT MIN(date) AS first_day, MAX(date) AS last_day FROM {TABLE}")
+    except ProgrammingError:
+        # Not created yet: the loaders use the inline projection until the first refresh.
+        return None
+    first, last = frame.iloc[0]["FIRST_DAY"], frame.iloc[0]["LAST_DAY"]
+    if first is None or last is None or first != first:
+        return None
+    return _as_date(first), _as_date(last)
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def source(start_date, end_date, lower_chains=False):
+    """SELECT over the typed Squid events in the range, for a loader's ``axelar_service`` CTE.
+
+    ``lower_chains`` lower-cases the GMP chain names too (transfer chains
+    always are), for the aggregates that compare chains across services.
+    """
+    chains = (
+        "LOWER(source_chain) AS source_chain, LOWER(destination_chain) AS destination_chain"
+        if lower_chains else "source_chain, destination_chain"
+    )
+    loaded = table_range() if TABLE else None
+    if loaded and loaded[0] <= _as_date(start_date) and _as_date(end_date) <= loaded[1]:
+        events = f"""
+        SELECT * FROM {TABLE}
+        WHERE date >= '{_day(start_date)}' AND date <= '{_day(end_date)}'
+        """
+    else:
+        events = projection(start_date, end_date)
+    return f"""
+        SELECT created_at, {chains}, user, amount, amount_usd, fee, id, service AS "Service", raw_asset, latency
+        FROM ({events})
+    """
+
+
+# --- Maintenance --------------------------------------------------------------------------------------------------
+def refresh(table, start, end, log=print):
+    """Replace days ``start`` .. ``end`` of ``table`` with freshly projected events, in one transaction."""
+    from dashboard.warehouse import connection
+
+    columns = ", ".join(f"{name} {kind}" for name, kind in COLUMNS)
+    with connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns}) CLUSTER BY (date)")
+            # Tables created before the latency column: its days are NULL until they are loaded again.
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS latency DOUBLE")
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(f"DELETE FROM {table} WHERE date >= '{_day(start)}' AND date <= '{_day(end)}'")
+                cursor.execute(
+                    f"INSERT INTO {table} ({', '.join(name for name, _ in COLUMNS)}) {projection(start, end)}"
+                )
+                rows = cursor.rowcount
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        finally:
+            cursor.close()
+    table_range.clear()
+    log(f"{table}: {start} .. {end}  {rows:,} rows")
+
+
+def resume_day(table):
+    """The day an incremental refresh of ``table`` starts from."""
+    from dashboard.warehouse import read_sql
+
+    from snowflake.connector.errors import ProgrammingError
+
+    try:
+        last = read_sql(f"SELECT MAX(date) AS last_day FROM {table}").iloc[0]["LAST_DAY"]
+    except ProgrammingError:
+        return ORIGIN
+    return ORIGIN if last is None or last != last else _as_date(last)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--table", default=TABLE, help="projection table (default: $AXELAR_SQUID_EVENTS_TABLE)")
+    parser.add_argument("--start", type=datetime.date.fromisoformat)
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=datetime.date.today())
+    args = parser.parse_args(argv)
+    if not args.table:
+        parser.error("--table or AXELAR_SQUID_EVENTS_TABLE is required")
+
+    refresh(args.table, args.start or resume_day(args.table), args.end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Progressive rendering of streamed loader results."""
+import time
+
+
+def render_progressively(batches, placeholder=None, prepare=None, min_interval=0.5, preview_rows=None,
+                         finish=None, **dataframe_kwargs):
+    """Show DataFrame ``batches`` in one table as they arrive and return the full frame.
+
+    The first batch is drawn as soon as it exists; later batches are folded in
+    at most every ``min_interval`` seconds so a long stream does not resend the
+    growing table for every chunk. ``prepare`` formats a frame for display,
+    ``preview_rows`` caps the rows shown while loading, and ``finish`` (called
+    with the full frame inside the placeholder) replaces the final table.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    placeholder = placeholder or st.empty()
+    prepare = prepare or (lambda frame: frame)
+    frames = []
+    rows = 0
+    last_draw = None
+    for batch in batches:
+        frames.append(batch)
+        rows += len(batch)
+        now = time.monotonic()
+        if last_draw is None or now - last_draw >= min_interval:
+            if preview_rows is not None and len(frames[0]) >= preview_rows:
+                shown = frames[0].head(preview_rows)
+            else:
+                frames = [pd.concat(frames, ignore_index=True)] if len(frames) > 1 else frames
+                shown = frames[0] if preview_rows is None else frames[0].head(preview_rows)
+            with placeholder.container():
+                st.dataframe(prepare(shown), **dataframe_kwargs)
+                st.caption(f"⏳Loading… {rows:,} rows so far")
+            last_draw = now
+    result = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    if finish is None:
+        placeholder.dataframe(prepare(result), **dataframe_kwargs)
+    else:
+        with placeholder.container():
+            finish(result)
+    return result
@@ -0,0 +1,140 @@
+"""Paginated, server-side sorted tables.
+
+Only the current page of a cached result is formatted and sent to the
+browser. Rows are ordered by the chosen column with the row position as a
+tie-breaker, and pages are addressed by keyset: a page starts right after the
+(sort value, row position) of the last row of the previous page, found by
+binary search in the sorted keys. The sort permutation is computed once per
+result, column and direction.
+"""
+import weakref
+
+import numpy as np
+
+_orders = {}
+
+
+# --- Sorting ------------------------------------------------------------------------------------------------------
+class SortedOrder:
+    """Rows of a frame ordered by one column, with integer sort keys for seeking."""
+
+    def __init__(self, frame, column, ascending):
+        import pandas as pd
+
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Order by value rather than category order, and seek among plain values.
+            values = values.astype(values.cat.categories.dtype)
+        codes, uniques = pd.factorize(values, sort=True)
+        nulls = codes < 0
+        keys = codes.astype(np.int64)
+        if ascending:
+            keys[nulls] = len(uniques)
+        else:
+            keys = -keys
+            keys[nulls] = 1
+        positions = np.arange(len(frame))
+        self.order = np.lexsort((positions, keys))
+        self.keys = keys[self.order]
+        self.uniques = uniques
+        self.ascending = ascending
+
+    def __len__(self):
+        return len(self.order)
+
+    def key_of(self, value):
+        """Sort key of ``value``; a value no longer present maps between its neighbours."""
+        if value is None:
+            return len(self.uniques) if self.ascending else 1
+        index = int(self.uniques.searchsorted(value))
+        code = float(index) if index < len(self.uniques) and self.uniques[index] == value else index - 0.5
+        return code if self.ascending else -code
+
+    def seek(self, cursor):
+        """Index in sorted order of the first row after ``cursor``."""
+        if cursor is None:
+            return 0
+        value, position = cursor
+        key = self.key_of(value)
+        lo = int(np.searchsorted(self.keys, key, "left"))
+        hi = int(np.searchsorted(self.keys, key, "right"))
+        return lo + int(np.searchsorted(self.order[lo:hi], position, "right"))
+
+    def cursor_at(self, index, frame, column):
+        import pandas as pd
+
+        position = int(self.order[index])
+        value = frame[column].iloc[position]
+        return (None if pd.isna(value) else value, position)
+
+
+def sorted_order(frame, column, ascending):
+    """Cached ``SortedOrder`` for a frame; entries go away with the frame."""
+    frame_id = id(frame)
+    orders = _orders.get(frame_id)
+    if orders is None:
+        orders = _orders[frame_id] = {}
+        weakref.finalize(frame, _orders.pop, frame_id, None)
+    order = orders.get((column, ascending))
+    if order is None:
+        order = orders[(column, ascending)] = SortedOrder(frame, column, ascending)
+    return order
+
+
+# --- Component ----------------------------------------------------------------------------------------------------
+def paginated_table(frame, key, page_size=25, prepare=None, default_sort=None, ascending=False, **dataframe_kwargs):
+    """Render one page of ``frame`` with sort and paging controls; returns the page shown.
+
+    ``key`` namespaces the widget state, ``prepare`` formats the page for
+    display and ``default_sort`` is the initial sort column.
+    """
+    import streamlit as st
+
+    columns = list(frame.columns)
+    state = st.session_state
+    stack_key = f"{key}_cursors"
+
+    def reset():
+        state[stack_key] = [None]
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        column = st.selectbox(
+            "Sort by", columns,
+            index=columns.index(default_sort) if default_sort in columns else 0,
+            key=f"{key}_sort", on_change=reset
+        )
+    with col2:
+        direction = st.radio(
+            "Order", ["Descending", "Ascending"], index=0 if not ascending else 1,
+            horizontal=True, key=f"{key}_dir", on_change=reset
+        )
+    with col3:
+        page_size = st.selectbox(
+            "Rows", sorted({10, 25, 50, 100, page_size}),
+            index=sorted({10, 25, 50, 100, page_size}).index(page_size),
+            key=f"{key}_size", on_change=reset
+        )
+
+    if stack_key not in state:
+        reset()
+    order = sorted_order(frame, column, direction == "Ascending")
+    cursors = state[stack_key]
+    start = min(order.seek(cursors[-1]), max(len(order) - 1, 0))
+    stop = min(start + page_size, len(order))
+
+    page = frame.iloc[order.order[start:stop]]
+    page.index = range(start + 1, stop + 1)
+    st.dataframe(prepare(page) if prepare else page, **dataframe_kwargs)
+
+    def go_next():
+        state[stack_key] = cursors + [order.cursor_at(stop - 1, frame, column)]
+
+    def go_previous():
+        state[stack_key] = cursors[:-1]
+
+    col1, col2, col3 = st.columns([1, 4, 1])
+    col1.button("◀ Previous", key=f"{key}_prev", on_click=go_previous, disabled=len(cursors) <= 1)
+    col2.caption(f"Rows {start + 1 if stop else 0:,}–{stop:,} of {len(order):,}")
+    col3.button("Next ▶", key=f"{key}_next", on_click=go_next, disabled=stop >= len(order))
+    return page
@@ -0,0 +1,138 @@
+import os
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from dashboard.cache import cache_stats, result_cache
+from dashboard.memory import (
+    cache_entries,
+    live_objects,
+    other_caches,
+    rss,
+    rss_bytes,
+    session_usage,
+    start_monitoring
+)
+
+# --- Page Config ------------------------------------------------------------------------------------------------------
+st.set_page_config(
+    page_title="Axelar User Behaviour Analysis Dashboard",
+    page_icon="https://img.cryptorank.io/coins/axelar1663924228506.png",
+    layout="wide"
+)
+
+start_monitoring()
+
+# --- Title -----------------------------------------------------------------------------------------------------
+st.title("🧮Memory Admin")
+
+# --- Access ----------------------------------------------------------------------------------------------------
+admin_token = os.environ.get("AXELAR_ADMIN_TOKEN")
+if admin_token and st.sidebar.text_input("Admin token", type="password", key="admin_token") != admin_token:
+    st.warning("🔒Enter the admin token in the sidebar to view memory usage.")
+    st.stop()
+
+st.button("🔄Refresh")
+
+# --- Row 1: Totals ---------------------------------------------------------------------------------------------
+totals = cache_stats()["total"]
+sessions = session_usage()
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Process RSS", f"{rss_bytes() / 2**20:,.0f} MB")
+with col2:
+    st.metric("Result Cache", f"{totals['nbytes'] / 2**20:,.1f} MB", f"of {totals['budget_bytes'] / 2**20:,.0f} MB budget", delta_color="off")
+with col3:
+    st.metric("Cached Results", f"{totals['entries']:,}", f"hit ratio {totals['hit_ratio']:.0%}", delta_color="off")
+with col4:
+    st.metric("Sessions", f"{len(sessions):,}", f"{sum(s['nbytes'] for s in sessions) / 2**20:,.1f} MB session state", delta_color="off")
+
+col5, col6, col7, col8 = st.columns(4)
+with col5:
+    st.metric(
+        "Compressed Results", f"{totals['compressed_entries']:,}",
+        f"{totals['compressed_raw_nbytes'] / 2**20:,.1f} MB held in {totals['compressed_nbytes'] / 2**20:,.1f} MB", delta_color="off"
+    )
+with col6:
+    st.metric("Compression Ratio", f"{totals['compression_ratio']:.1f}x" if totals["compression_ratio"] else "–")
+with col7:
+    st.metric("Decompressions", f"{totals['decompressions']:,}", f"{totals['compressions']:,} compressions", delta_color="off")
+with col8:
+    mean_ms = 1000 * totals["decompress_seconds"] / totals["decompressions"] if totals["decompressions"] else None
+    st.metric("Mean Decompression", f"{mean_ms:,.1f} ms" if mean_ms is not None else "–")
+
+# --- Row 2: RSS over time --------------------------------------------------------------------------------------
+history = pd.DataFrame(rss.history(), columns=["Time", "RSS"])
+history["Time"] = pd.to_datetime(history["Time"], unit="s")
+history["RSS (MB)"] = history["RSS"] / 2**20
+fig = px.line(history, x="Time", y="RSS (MB)", title="Process RSS Over Time", color_discrete_sequence=["#717aff"])
+fig.update_layout(xaxis_title="", yaxis_title="MB")
+st.plotly_chart(fig, use_container_width=True)
+
+# --- Row 3: Result cache by loader -----------------------------------------------------------------------------
+st.subheader("🗄️Result Cache by Loader")
+loaders = pd.DataFrame.from_dict(cache_stats()["loaders"], orient="index")
+loaders.index.name = "Loader"
+loaders["MB"] = loaders["nbytes"] / 2**20
+loaders["Quota MB"] = loaders["quota"] / 2**20
+loaders["ratio"] = loaders["compression_ratio"]
+st.dataframe(
+    loaders[["entries", "MB", "Quota MB", "hits", "misses", "coalesced", "evictions", "expirations", "rejected",
+             "compressed_entries", "ratio", "decompressions"]]
+    .sort_values("MB", ascending=False)
+    .style.format({"MB": "{:,.2f}", "Quota MB": "{:,.0f}", "ratio": "{:,.1f}x"}, na_rep="–"),
+    use_container_width=True
+)
+
+# --- Row 4: Result cache entries -------------------------------------------------------------------------------
+st.subheader("📦Cached Results")
+entries = pd.DataFrame(cache_entries(), columns=[
+    "loader", "arguments", "nbytes", "raw_nbytes", "codec", "hits", "decompressions", "decompress_ms", "expires_in"
+])
+entries["MB"] = entries["nbytes"] / 2**20
+entries["Ratio"] = entries["raw_nbytes"] / entries["nbytes"]
+entries = entries.rename(columns={
+    "loader": "Loader", "arguments": "Arguments", "codec": "Codec", "hits": "Hits",
+    "decompressions": "Decompressions", "decompress_ms": "Decompress (ms)", "expires_in": "Expires In (s)"
+})
+st.dataframe(
+    entries[["Loader", "Arguments", "MB", "Codec", "Ratio", "Hits", "Decompressions", "Decompress (ms)", "Expires In (s)"]]
+    .style.format(
+        {"MB": "{:,.3f}", "Ratio": "{:,.1f}x", "Decompress (ms)": "{:,.1f}", "Expires In (s)": "{:,.0f}"}, na_rep="–"
+    ),
+    use_container_width=True,
+    hide_index=True
+)
+if st.button("🧹Clear result cache"):
+    result_cache.clear()
+    st.rerun()
+
+# --- Row 5: Other caches and sessions --------------------------------------------------------------------------
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("🧰Other Caches")
+    others = pd.DataFrame.from_dict(other_caches(), orient="index")
+    others.index.name = "Cache"
+    others["MB"] = others["nbytes"] / 2**20
+    st.dataframe(others[["entries", "MB"]].style.format({"MB": "{:,.3f}"}), use_container_width=True)
+
+with col2:
+    st.subheader("👥Sessions")
+    sessions_df = pd.DataFrame(sessions, columns=["session", "active", "keys", "nbytes", "largest"])
+    sessions_df["KB"] = sessions_df["nbytes"] / 1024
+    st.dataframe(
+        sessions_df[["session", "active", "keys", "KB", "largest"]].style.format({"KB": "{:,.1f}"}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# --- Row 6: Live objects ---------------------------------------------------------------------------------------
+st.subheader("🔎Live Objects")
+if st.button("Count live DataFrames and figures", help="Walks every object in the process; takes a moment."):
+    objects = pd.DataFrame.from_dict(live_objects(), orient="index")
+    objects.index.name = "Type"
+    objects["MB"] = objects["nbytes"] / 2**20
+    st.dataframe(objects[["count", "MB"]].style.format({"MB": "{:,.2f}"}), use_container_width=True)
@@ -0,0 +1,130 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from dashboard.address_index import activity, address_index, summary
+from dashboard.memory import start_monitoring
+from dashboard.profiling import page_profiler
+
+# --- Page Config ------------------------------------------------------------------------------------------------------
+st.set_page_config(
+    page_title="Axelar User Behaviour Analysis Dashboard",
+    page_icon="https://img.cryptorank.io/coins/axelar1663924228506.png",
+    layout="wide"
+)
+
+start_monitoring()
+profiler = page_profiler("wallet_lookup")
+
+# --- Title -----------------------------------------------------------------------------------------------------
+st.title("🔎Wallet Lookup")
+
+st.info("🔎Enter an address to see its full history across Axelar core transactions, Satellite bridges and Squid swaps.")
+
+# --- Sidebar Footer Slightly Left-Aligned ---
+st.sidebar.markdown(
+    """
+    <style>
+    .sidebar-footer {
+        position: fixed;
+        bottom: 20px;
+        width: 250px;
+        font-size: 13px;
+        color: gray;
+        margin-left: 5px; # -- MOVE LEFT
+        text-align: left;  
+    }
+    .sidebar-footer img {
+        width: 16px;
+        height: 16px;
+        vertical-align: middle;
+        border-radius: 50%;
+        margin-right: 5px;
+    }
+    .sidebar-footer a {
+        color: gray;
+        text-decoration: none;
+    }
+    </style>
+
+    <div class="sidebar-footer">
+        <div>
+            <a href="https://x.com/axelar" target="_blank">
+                <img src="https://img.cryptorank.io/coins/axelar1663924228506.png" alt="Axelar Logo">
+                Powered by Axelar
+            </a>
+        </div>
+        <div style="margin-top: 5px;">
+            <a href="https://x.com/0xeman_raz" target="_blank">
+                <img src="https://pbs.twimg.com/profile_images/1841479747332608000/bindDGZQ_400x400.jpg" alt="Eman Raz">
+                Built by Eman Raz
+            </a>
+        </div>
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+# --- Address Input -------------------------------------------------------------------------------------------------
+if address_index is None:
+    st.warning(
+        "🗄️Wallet lookup reads the local Parquet store. Set AXELAR_PARQUET_ROOT, then run "
+        "`python -m dashboard.extract` and `python -m dashboard.address_index`."
+    )
+    st.stop()
+
+address = st.text_input("Wallet Address", key="wallet_address", placeholder="0x… or axelar1…").strip()
+if not address:
+    st.stop()
+
+products = activity(address_index.current().history(address))
+if not products:
+    st.info("No activity found for this address in the local data.")
+    st.stop()
+
+df_summary = summary(products)
+
+# --- Row 1: KPIs -------------------------------------------------------------------------------------------------
+profiler.section("Row 1")
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.markdown("**Total Transactions**")
+    st.markdown(f"{df_summary['Transactions'].sum():,} Txns")
+with col2:
+    st.markdown("**Total Volume ($USD)**")
+    st.markdown(f"${df_summary['Volume ($USD)'].sum():,.0f}")
+with col3:
+    st.markdown("**First Seen**")
+    st.markdown(f"{df_summary['First Seen'].min():%Y-%m-%d}")
+with col4:
+    st.markdown("**Last Seen**")
+    st.markdown(f"{df_summary['Last Seen'].max():%Y-%m-%d}")
+
+st.dataframe(df_summary, use_container_width=True, hide_index=True)
+
+# --- Row 2: Daily Activity ---------------------------------------------------------------------------------------
+profiler.section("Row 2")
+df_daily = pd.concat(
+    [frame.assign(Product=product, Date=frame["Time"].dt.floor("D")) for product, frame in products.items()],
+    ignore_index=True
+).groupby(["Date", "Product"], as_index=False)["Transaction"].nunique()
+
+fig_daily = px.bar(
+    df_daily,
+    x="Date",
+    y="Transaction",
+    color="Product",
+    title="Daily Transactions by Product",
+    color_discrete_sequence=["#717aff", "#ff7f27", "#00a3a3"]
+)
+fig_daily.update_layout(xaxis_title="", yaxis_title="Txns count", legend_title="", bargap=0.2)
+st.plotly_chart(fig_daily, use_container_width=True)
+
+# --- Row 3: History ----------------------------------------------------------------------------------------------
+profiler.section("Row 3")
+st.subheader("📜Transaction History")
+for tab, (product, frame) in zip(st.tabs(list(products)), products.items()):
+    with tab:
+        st.dataframe(frame, use_container_width=True, hide_index=True)
+
+profiler.finish()
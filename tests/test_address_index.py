@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dashboard import address_index
+from dashboard.address_index import AddressIndex, _row_runs
+
+ALICE = "0xAbC0000000000000000000000000000000000001"
+BOB = "0xbob0000000000000000000000000000000000002"
+
+
+def write_partition(root, day, senders):
+    path = os.path.join(root, "satellite", f"date={day}", "part-0.parquet")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame = pd.DataFrame({
+        "block_timestamp": pd.Timestamp(day) + pd.to_timedelta(range(len(senders)), unit="min"),
+        "tx_hash": [f"{day}-{n}" for n in range(len(senders))],
+        "source_chain": "ethereum",
+        "destination_chain": "osmosis",
+        "sender": senders,
+        "token_symbol": "USDC",
+    })
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), path)
+    return path
+
+
+def index(tmp_path):
+    return AddressIndex(str(tmp_path / "_indexes" / "address_index.parquet"), str(tmp_path))
+
+
+def test_row_runs_merge_consecutive_rows_per_address():
+    runs = _row_runs(["a", "a", "b", "a", None, "b"])
+    assert runs.to_dict("list") == {
+        "address": ["a", "a", "b", "b"], "row_start": [0, 3, 2, 5], "row_stop": [2, 4, 3, 6],
+    }
+
+
+def test_history_takes_only_the_rows_of_the_address_in_any_case(tmp_path):
+    write_partition(tmp_path, "2024-01-01", [ALICE, ALICE, BOB, ALICE.lower()])
+    write_partition(tmp_path, "2024-01-02", [BOB])
+    idx = index(tmp_path)
+    idx.refresh()
+    [frame] = idx.history(ALICE.upper()).values()
+    assert frame["tx_hash"].tolist() == ["2024-01-01-0", "2024-01-01-1", "2024-01-01-3"]
+    assert idx.history("0xnobody") == {}
+
+
+def test_refresh_reindexes_rewritten_partitions_and_drops_removed_ones(tmp_path):
+    write_partition(tmp_path, "2024-01-01", [ALICE])
+    removed = write_partition(tmp_path, "2024-01-02", [ALICE])
+    idx = index(tmp_path)
+    idx.refresh()
+    os.remove(removed)
+    write_partition(tmp_path, "2024-01-01", [BOB, ALICE, ALICE])
+    os.utime(os.path.join(tmp_path, "satellite", "date=2024-01-01", "part-0.parquet"), ns=(1, 1))
+
+    # Before the refresh the rewritten partition is filtered on the address rather than taken by position.
+    assert idx.history(ALICE)["satellite"]["tx_hash"].tolist() == ["2024-01-01-1", "2024-01-01-2"]
+    idx.refresh()
+    assert set(idx.partitions) == {"satellite/2024-01-01"}
+    assert idx.runs(ALICE)[["row_start", "row_stop"]].values.tolist() == [[1, 3]]
+
+
+def test_index_is_off_without_a_path(monkeypatch):
+    monkeypatch.delenv("AXELAR_ADDRESS_INDEX_PATH", raising=False)
+    monkeypatch.delenv("AXELAR_PARQUET_ROOT", raising=False)
+    assert address_index._from_env() is None
@@ -0,0 +1,87 @@
+import datetime
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import anomaly
+from dashboard.anomaly import Monitor, RollingStats
+
+
+def daily(days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(1_000 + 50 * np.sin(np.arange(days) / 7) + rng.normal(0, 20, days))
+
+
+@pytest.mark.parametrize("window", [2, 7, 28])
+def test_rolling_state_matches_pandas_rolling_window(window):
+    values = daily()
+    # Each day is scored against the days before it.
+    mean = values.rolling(window, min_periods=1).mean().shift()
+    std = values.rolling(window, min_periods=2).std(ddof=0).shift()
+    ewma = values.ewm(alpha=0.2, adjust=False).mean().shift()
+    stats = RollingStats(window=window, alpha=0.2)
+    for i, value in enumerate(values):
+        reading = stats.score(i, value)
+        if i == 0:
+            assert math.isnan(reading.expected) and math.isnan(reading.ewma)
+        else:
+            assert reading.expected == pytest.approx(mean[i], rel=1e-9)
+            assert reading.ewma == pytest.approx(ewma[i], rel=1e-9)
+        if min(i, window) > 1:
+            assert reading.std == pytest.approx(std[i], rel=1e-6)
+            assert reading.zscore == pytest.approx((value - mean[i]) / std[i], rel=1e-6)
+        else:
+            assert math.isnan(reading.std)
+        stats.push(value)
+    assert len(stats.values) == window and stats.seen == len(values)
+
+
+def test_spike_is_flagged_once_enough_history_is_seen():
+    stats = RollingStats(window=28)
+    values = daily(days=anomaly.MIN_HISTORY + 10)
+    for value in values:
+        assert not stats.score(None, value).anomalous
+        stats.push(value)
+    spike = stats.score(None, values.mean() + 10 * values.std())
+    assert spike.anomalous and spike.zscore > anomaly.Z_THRESHOLD
+
+
+def test_monitor_folds_closed_days_once_and_scores_the_open_day():
+    days = pd.date_range("2024-01-01", periods=40, freq="D")
+    frame = pd.DataFrame({"Date": days, "Volume": daily(40).to_numpy()})
+    monitor = Monitor("volume", source=None, date="Date", value="Volume")
+    monitor.update(frame)
+    monitor.update(frame)  # the same (cached) result again changes nothing
+    series = monitor.series[""]
+    assert series.stats.seen == 39
+    assert series.folded == days[-2].date()
+    assert series.open.day == days[-1].date()
+
+    # Missing days count as zero; the former open day is folded once a later day arrives.
+    later = pd.DataFrame({"Date": [days[-1], days[-1] + pd.Timedelta(days=3)], "Volume": [frame["Volume"].iloc[-1], 5.0]})
+    monitor.update(later)
+    assert series.stats.seen == 42
+    assert [series.readings[days[-1].date() + datetime.timedelta(days=n)].value for n in (1, 2)] == [0.0, 0.0]
+    assert series.latest().day == days[-1].date() + datetime.timedelta(days=3)
+
+
+def test_scoring_a_range_leaves_the_monitor_alone():
+    def month(start):
+        days = pd.date_range(start, periods=31, freq="D")
+        return pd.DataFrame({"Date": days, "Path": "eth➡base", "Volume": daily(31).to_numpy()})
+
+    monitor = Monitor("path_volume", source=lambda: month("2025-01-01"), date="Date", value="Volume", by="Path")
+    monitor.update()
+    before = monitor.state()
+
+    # Visitors looking at other ranges: each is scored on its own, nothing is folded into the monitor.
+    january_2024 = monitor.score(month("2024-01-01"))
+    monitor.score(month("2023-01-01"))
+    assert monitor.state() == before
+    assert monitor.series["eth➡base"].stats.seen == 30
+
+    [reading] = january_2024
+    assert reading["day"] == "2024-01-31" and reading["series"] == "eth➡base"
+    assert monitor.score(month("2024-01-01")) == january_2024
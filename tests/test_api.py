@@ -0,0 +1,97 @@
+import http.client
+import http.server
+import io
+import json
+import threading
+
+import pandas as pd
+import pandas.testing as pdt
+import pyarrow as pa
+import pytest
+
+from dashboard import api
+
+FRAME = pd.DataFrame({"Path": ["ethereum➡osmosis", "osmosis➡base", "base➡ethereum"], "Transfers": [3, 2, 1]})
+
+
+def load_paths(start_date, end_date, approximate=False):
+    return FRAME
+
+
+def stream_paths(timeframe):
+    yield FRAME.iloc[:2]
+    yield FRAME.iloc[2:]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(api, "ENDPOINTS", {"paths": load_paths, "stream": stream_paths})
+    monkeypatch.setattr(api, "CHUNK_ROWS", 2)
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), api.Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(address, path, headers=None):
+    connection = http.client.HTTPConnection(*address)
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_index_lists_parameters_without_the_preview_flag(server):
+    response, body = get(server, "/")
+    assert json.loads(body) == {"paths": ["start_date", "end_date"], "stream": ["timeframe"]}
+
+
+@pytest.mark.parametrize("query, message", [
+    ("start_date=2024-01-01", "missing parameter: end_date"),
+    ("start_date=2024-01-01&end_date=June", "end_date must be an ISO date"),
+])
+def test_bad_parameters_are_rejected(server, query, message):
+    response, body = get(server, f"/paths?{query}")
+    assert response.status == 400 and message in response.reason
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "arrow", "parquet"])
+def test_every_format_round_trips_across_chunks(server, fmt):
+    response, body = get(server, f"/paths?start_date=2024-01-01&end_date=2024-01-31&format={fmt}")
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    if fmt == "json":
+        frame = pd.DataFrame(json.loads(body))
+    elif fmt == "csv":
+        frame = pd.read_csv(io.BytesIO(body))
+    elif fmt == "arrow":
+        frame = pa.ipc.open_stream(body).read_pandas()
+    else:
+        frame = pd.read_parquet(io.BytesIO(body))
+    pdt.assert_frame_equal(frame, FRAME, check_dtype=False)
+
+
+def test_matching_etag_answers_not_modified(server):
+    response, _ = get(server, "/paths?start_date=2024-01-01&end_date=2024-01-31")
+    tag = response.getheader("ETag")
+    response, body = get(server, "/paths?start_date=2024-01-01&end_date=2024-01-31", {"If-None-Match": tag})
+    assert response.status == 304 and body == b""
+    response, _ = get(server, "/paths?start_date=2024-01-01&end_date=2024-01-31&format=csv", {"If-None-Match": tag})
+    assert response.status == 200  # the validator is per format
+
+
+def test_streamed_results_are_forwarded_without_an_etag(server):
+    response, body = get(server, "/stream?timeframe=day")
+    assert response.getheader("ETag") is None
+    assert pd.DataFrame(json.loads(body))["Transfers"].tolist() == [3, 2, 1]
+
+
+def test_empty_results_still_carry_their_header():
+    sink = io.StringIO()
+    api.write_body(sink, [FRAME.iloc[:0]], "csv")
+    assert sink.getvalue().strip() == "Path,Transfers"
+    sink = io.BytesIO()
+    api.write_body(sink, [FRAME.iloc[:0]], "arrow")
+    assert pa.ipc.open_stream(sink.getvalue()).schema.names == ["Path", "Transfers"]
@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+
+from dashboard.cache import ResultCache, cached, flights
+
+
+def key(name):
+    """A cache key as ``make_key`` builds it: (argument, value) pairs."""
+    return (("name", name),)
+
+
+def cache(budget_bytes=1_000, **kwargs):
+    result = ResultCache(budget_bytes=budget_bytes, compress_min_bytes=kwargs.pop("compress_min_bytes", 0))
+    result.register("a", kwargs.pop("quota_bytes", None))
+    result.register("b")
+    return result
+
+
+# --- Eviction and quotas ------------------------------------------------------------------------------------------
+def test_global_budget_evicts_least_recently_used():
+    c = cache(budget_bytes=300)
+    for name in ("k1", "k2", "k3"):
+        c.put("a", key(name), name, nbytes=100)
+    assert c.get("a", key("k1")) == (True, "k1")  # k1 is now the most recently used
+    c.put("b", key("k4"), "k4", nbytes=100)
+    assert c.get("a", key("k2")) == (False, None)
+    assert c.get("a", key("k1")) == (True, "k1")
+    assert c.nbytes == 300
+    assert c.stats()["loaders"]["a"]["evictions"] == 1
+
+
+def test_quota_evicts_only_the_offending_loader():
+    c = cache(budget_bytes=1_000, quota_bytes=150)
+    c.put("b", key("other"), "other", nbytes=100)
+    c.put("a", key("k1"), "k1", nbytes=100)
+    c.put("a", key("k2"), "k2", nbytes=100)
+    stats = c.stats()["loaders"]
+    assert c.get("a", key("k1")) == (False, None)
+    assert c.get("a", key("k2")) == (True, "k2")
+    assert c.get("b", key("other")) == (True, "other")
+    assert (stats["a"]["evictions"], stats["a"]["nbytes"], stats["b"]["evictions"]) == (1, 100, 0)
+
+
+def test_value_larger_than_quota_is_rejected():
+    c = cache(quota_bytes=150)
+    assert c.put("a", key("big"), "big", nbytes=200) is False
+    assert c.get("a", key("big")) == (False, None)
+    assert c.stats()["loaders"]["a"]["rejected"] == 1
+    assert c.nbytes == 0
+
+
+def test_replacing_a_key_accounts_for_the_new_size():
+    c = cache()
+    c.put("a", key("k"), "old", nbytes=400)
+    c.put("a", key("k"), "new", nbytes=100)
+    assert c.get("a", key("k")) == (True, "new")
+    assert c.nbytes == c.stats()["loaders"]["a"]["nbytes"] == 100
+
+
+# --- Cached loaders -----------------------------------------------------------------------------------------------
+class FailingCache(ResultCache):
+    def put(self, loader, key, value, nbytes=None, ttl=None):
+        raise MemoryError("cannot store")
+
+
+def test_empty_stream_caches_an_empty_frame():
+    store, calls = ResultCache(), []
+
+    @cached(name="test_empty_stream", cache=store, shared=False)
+    def load(day):
+        calls.append(day)
+        yield from ()
+
+    for _ in range(2):
+        [batch] = list(load("2024-01-01"))
+        assert batch.empty
+    assert calls == ["2024-01-01"]
+    assert flights.in_flight() == 0
+
+
+def test_flight_is_finished_when_the_result_cannot_be_saved():
+    @cached(name="test_unsaved_frame", cache=FailingCache(), shared=False)
+    def load(day):
+        return pd.DataFrame({"day": [day]})
+
+    @cached(name="test_unsaved_batches", cache=FailingCache(), shared=False)
+    def load_batches(day):
+        yield pd.DataFrame({"day": [day]})
+
+    with pytest.raises(MemoryError):
+        load("2024-01-01")
+    assert flights.in_flight() == 0
+    with pytest.raises(MemoryError):
+        list(load_batches("2024-01-01"))
+    assert flights.in_flight() == 0
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dashboard.cache import LZ4_MIN_HITS, ResultCache, compress, decompress
+
+
+def frame(rows=20_000, seed=0):
+    """A frame that compresses well: repetitive strings, small integers, a date column."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "chain": rng.choice(["ethereum", "arbitrum", "osmosis", "polygon"], rows),
+        "count": rng.integers(0, 10, rows),
+        "volume": np.round(rng.integers(0, 100, rows) * 1.5, 1),
+        "day": pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 30, rows), unit="D"),
+    })
+
+
+def key(name):
+    """A cache key as ``make_key`` builds it: (argument, value) pairs."""
+    return (("name", name),)
+
+
+def cache(budget_bytes=1_000, **kwargs):
+    result = ResultCache(budget_bytes=budget_bytes, compress_min_bytes=kwargs.pop("compress_min_bytes", 0))
+    result.register("a", kwargs.pop("quota_bytes", None))
+    result.register("b")
+    return result
+
+
+# --- Compression --------------------------------------------------------------------------------------------------
+@pytest.mark.parametrize("codec", ["lz4", "zstd"])
+def test_compress_round_trip(codec):
+    df = frame().assign(label=lambda df: df["chain"].astype("category"))
+    df.index = pd.RangeIndex(5, 5 + len(df))
+    buffer = compress(df, codec)
+    assert buffer.size < df.memory_usage(deep=True).sum()
+    pdt.assert_frame_equal(decompress(buffer), df)
+
+
+def test_compact_compresses_idle_entries_and_get_restores_them():
+    df = frame()
+    raw = int(df.memory_usage(index=True, deep=True).sum())
+    c = cache(budget_bytes=10 * raw, compress_min_bytes=1)
+    c.put("a", key("k"), df)
+    c.compact(idle_seconds=0)
+    [entry] = c.entries()
+    assert entry["codec"] == "zstd"
+    assert entry["raw_nbytes"] == raw and entry["nbytes"] < raw
+    assert c.nbytes == entry["nbytes"]
+
+    hit, value = c.get("a", key("k"))
+    assert hit
+    pdt.assert_frame_equal(value, df)
+    [entry] = c.entries()
+    assert (entry["codec"], entry["nbytes"], entry["decompressions"]) == (None, raw, 1)
+    assert c.get("a", key("k"))[1] is value  # kept uncompressed while it is read
+
+
+def test_frequently_read_entries_get_lz4():
+    c = cache(budget_bytes=100 * 1024 * 1024, compress_min_bytes=1)
+    c.put("a", key("k"), frame())
+    for _ in range(LZ4_MIN_HITS):
+        c.get("a", key("k"))
+    c.compact(idle_seconds=0)
+    assert c.entries()[0]["codec"] == "lz4"
+
+
+def test_incompressible_entries_stay_raw():
+    noise = pd.DataFrame(np.random.default_rng(1).random((20_000, 4)), columns=list("wxyz"))
+    c = cache(budget_bytes=100 * 1024 * 1024, compress_min_bytes=1)
+    c.put("a", key("k"), noise)
+    c.compact(idle_seconds=0)
+    assert c.entries()[0]["codec"] is None
+    assert c.get("a", key("k"))[1] is noise
+
+
+def test_put_compresses_before_evicting():
+    first, second = frame(seed=1), frame(seed=2)
+    raw = int(first.memory_usage(index=True, deep=True).sum())
+    c = cache(budget_bytes=int(1.5 * raw), compress_min_bytes=1)
+    c.put("a", key("first"), first)
+    c.put("a", key("second"), second)
+    assert c.stats()["loaders"]["a"]["evictions"] == 0
+    assert {entry["arguments"]: entry["codec"] for entry in c.entries()} == {"name=first": "zstd", "name=second": None}
+    pdt.assert_frame_equal(c.get("a", key("first"))[1], first)
@@ -0,0 +1,201 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from dashboard import warehouse
+from dashboard.cache import ResultCache, cached
+from dashboard.concurrency import QueryCancelled, QueryRegistry
+
+
+class FakeWarehouse:
+    """Queries run until they are finished or aborted; an aborted one errors like Snowflake's."""
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.finished = set()
+        self.aborted = set()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_query_status_throw_if_error(self, query_id):
+        if query_id in self.aborted:
+            raise RuntimeError(f"SQL execution canceled: {query_id}")
+        return "SUCCESS" if query_id in self.finished else "RUNNING"
+
+    @staticmethod
+    def is_still_running(status):
+        return status == "RUNNING"
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sfqid = None
+
+    def execute_async(self, query):
+        self.sfqid = f"q{next(self.connection.ids)}"
+
+    def get_results_from_sfqid(self, query_id):
+        pass
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    result = FakeWarehouse()
+    registry = QueryRegistry()
+    monkeypatch.setattr(warehouse, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(warehouse, "running_queries", registry)
+    monkeypatch.setattr(warehouse, "_abort", result.aborted.add)
+    result.registry = registry
+    return result
+
+
+def run_in(monkeypatch, session, run):
+    monkeypatch.setattr(warehouse, "_script_run", lambda: (session, run, None))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_a_newer_run_supersedes_only_the_other_runs_of_its_session():
+    registry, cancelled = QueryRegistry(), []
+    first, second = object(), object()
+    registry.register("s1", first, "q1", cancelled.append)
+    registry.register("s1", first, "q2", cancelled.append)
+    registry.register("s2", first, "q3", cancelled.append)
+    assert cancelled == []
+    registry.register("s1", second, "q4", cancelled.append)
+    assert sorted(cancelled) == ["q1", "q2"]
+    assert registry.was_superseded("q1") and not registry.was_superseded("q3")
+    assert registry.stats() == {"sessions": 2, "in_flight": 2, "cancelled": 2}
+    registry.unregister("s1", "q1")
+    assert not registry.was_superseded("q1")
+
+
+def test_runs_without_an_identity_never_supersede_each_other():
+    registry, cancelled = QueryRegistry(), []
+    registry.register("s1", None, "q1", cancelled.append)
+    registry.register("s1", None, "q2", cancelled.append)
+    assert cancelled == [] and registry.stats()["in_flight"] == 2
+
+
+def test_superseded_query_is_aborted_and_raises_query_cancelled(fake, monkeypatch):
+    run_in(monkeypatch, "s1", "old run")
+    outcome = {}
+
+    def old_run():
+        try:
+            warehouse._execute(fake.cursor(), "SELECT 1")
+        except BaseException as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=old_run)
+    thread.start()
+    wait_for(lambda: fake.registry.stats()["in_flight"] == 1)
+
+    # The session's next run starts its own query, which supersedes the old one.
+    fake.registry.register("s1", "new run", "q99", fake.aborted.add)
+    thread.join(5)
+    assert fake.aborted == {"q1"}
+    assert isinstance(outcome["error"], QueryCancelled)
+    assert fake.registry.stats() == {"sessions": 1, "in_flight": 1, "cancelled": 1}
+
+
+def test_a_query_failing_on_its_own_is_not_reported_as_cancelled(fake, monkeypatch):
+    run_in(monkeypatch, "s1", "run")
+    fake.aborted.add("q1")  # e.g. a warehouse-side error
+    with pytest.raises(RuntimeError):
+        warehouse._execute(fake.cursor(), "SELECT 1")
+    assert fake.registry.stats() == {"sessions": 0, "in_flight": 0, "cancelled": 0}
+
+
+def test_stopped_run_aborts_its_query(fake, monkeypatch):
+    class RerunRequested(BaseException):
+        pass
+
+    checks = []
+
+    def yield_check():
+        checks.append(None)
+        if len(checks) > 1:  # the rerun is requested while the query runs
+            raise RerunRequested
+
+    monkeypatch.setattr(warehouse, "_script_run", lambda: ("s1", "run", yield_check))
+    with pytest.raises(RerunRequested):
+        warehouse._execute(fake.cursor(), "SELECT 1")
+    assert fake.aborted == {"q1"}
+    assert fake.registry.stats()["cancelled"] == 1
+
+
+def test_followers_of_a_cancelled_leader_run_the_loader_themselves():
+    store = ResultCache()
+    release = threading.Event()
+    calls = []
+
+    @cached(name="test_cancelled_leader", cache=store, shared=False)
+    def load(day):
+        calls.append(day)
+        if len(calls) == 1:
+            release.wait(5)
+            raise QueryCancelled("superseded")
+        return f"rows of {day}"
+
+    results = {}
+
+    def visit(name):
+        try:
+            results[name] = load("2024-01-01")
+        except Exception as error:
+            results[name] = error
+
+    leader = threading.Thread(target=visit, args=("leader",))
+    leader.start()
+    wait_for(lambda: calls)
+    follower = threading.Thread(target=visit, args=("follower",))
+    follower.start()
+    wait_for(lambda: store.stats()["loaders"]["test_cancelled_leader"]["coalesced"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert isinstance(results["leader"], QueryCancelled)
+    assert results["follower"] == "rows of 2024-01-01"
+    assert len(calls) == 2
+
+
+def test_followers_of_a_failed_leader_share_its_error():
+    store = ResultCache()
+    release = threading.Event()
+    calls = []
+
+    @cached(name="test_failed_leader", cache=store, shared=False)
+    def load(day):
+        calls.append(day)
+        release.wait(5)
+        raise ValueError("bad query")
+
+    results = {}
+
+    def visit(name):
+        try:
+            results[name] = load("2024-01-01")
+        except Exception as error:
+            results[name] = error
+
+    threads = [threading.Thread(target=visit, args=(name,)) for name in ("leader", "follower")]
+    threads[0].start()
+    wait_for(lambda: calls)
+    threads[1].start()
+    wait_for(lambda: store.stats()["loaders"]["test_failed_leader"]["coalesced"] == 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert all(isinstance(error, ValueError) for error in results.values())
+    assert len(calls) == 1
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import chain_matrix
+from dashboard.chain_matrix import CHAINS, PathCube, pair_codes, path_names, shares
+
+
+def daily_pairs():
+    return pd.DataFrame({
+        "date": ["2024-01-01", "2024-01-01", "2024-01-03", "2024-01-03", None],
+        "source_chain": ["ethereum", "osmosis", "ethereum", None, "ethereum"],
+        "destination_chain": ["osmosis", "ethereum", "osmosis", "base", "base"],
+        "transfers": [4, 1, 2, 9, 9],
+        "users": [2, 1, 4, 9, 9],
+        "volume": [10.0, 5.0, 30.0, 9.0, 9.0],
+    })
+
+
+def test_paths_round_trip_and_missing_chains_are_minus_one():
+    codes = pair_codes(["ethereum", "osmosis", None], ["osmosis", "ethereum", "base"])
+    assert codes[2] == -1 and codes[0] != codes[1]
+    assert path_names(codes).tolist() == ["ethereum➡osmosis", "osmosis➡ethereum", None]
+    assert (pair_codes(["ethereum"], ["osmosis"]) == codes[:1]).all()  # codes are stable across calls
+
+
+def test_cube_totals_sum_transfers_and_average_daily_users():
+    cube = PathCube.from_frame(daily_pairs())
+    assert (cube.days == np.arange("2024-01-01", "2024-01-04", dtype="datetime64[D]")).all()
+    assert sorted(cube.chains) == ["ethereum", "osmosis"]  # rows without a day or chain are dropped
+    ethereum, osmosis = (int(np.searchsorted(cube.sources, code)) for code in CHAINS.encode(["ethereum", "osmosis"]))
+    assert cube.total("transfers")[ethereum, osmosis] == 6
+    assert cube.total("users")[ethereum, osmosis] == pytest.approx(2.0)  # (2 + 0 + 4) / 3 days
+    assert cube.daily("volume").tolist() == [15.0, 0.0, 30.0]
+
+
+def test_select_slices_chains_and_inclusive_days():
+    cube = PathCube.from_frame(daily_pairs())
+    window = cube.select(sources=["ethereum"], start="2024-01-02", end="2024-01-03")
+    assert len(window.days) == 2 and list(CHAINS.decode(window.sources)) == ["ethereum"]
+    assert window.total("transfers").sum() == 2
+    assert cube.select(start="2025-01-01").total("transfers").sum() == 0
+
+
+def test_shares_leave_empty_rows_at_zero():
+    matrix = np.array([[1.0, 3.0], [0.0, 0.0]])
+    assert shares(matrix).sum() == pytest.approx(1.0)
+    assert shares(matrix, by="source").tolist() == [[0.25, 0.75], [0.0, 0.0]]
+    assert shares(matrix, by="destination").tolist() == [[1.0, 1.0], [0.0, 0.0]]
+
+
+def test_path_cube_is_cached_per_frame_until_the_frame_goes_away():
+    frame = daily_pairs()
+    assert chain_matrix.path_cube(frame) is chain_matrix.path_cube(frame)
+    frame_id = id(frame)
+    del frame
+    assert frame_id not in chain_matrix._cubes
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from dashboard.concurrency import AdmissionController, SingleFlight
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+# --- Single flight ------------------------------------------------------------------------------------------------
+def test_concurrent_callers_share_one_execution():
+    flights, release, calls = SingleFlight(), threading.Event(), []
+
+    def load():
+        calls.append(None)
+        release.wait(5)
+        return "rows"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("key", load))) for _ in range(5)]
+    threads[0].start()
+    wait_for(lambda: calls)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: flights._calls["key"].followers == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["rows"] * 5 and len(calls) == 1
+    assert flights.in_flight() == 0
+
+
+def test_leader_error_reaches_the_followers_and_the_next_call_runs_again():
+    flights, release = SingleFlight(), threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("bad query")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do("key", fail)
+        except ValueError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: "key" in flights._calls and flights._calls["key"].followers == 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flights.do("key", lambda: "fresh") == "fresh"
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flights, release = SingleFlight(), threading.Event()
+    thread = threading.Thread(target=flights.do, args=("slow", lambda: release.wait(5)))
+    thread.start()
+    wait_for(lambda: flights.in_flight() == 1)
+    assert flights.do("fast", lambda: 1) == 1
+    release.set()
+    thread.join(5)
+
+
+# --- Admission control --------------------------------------------------------------------------------------------
+def test_admission_caps_concurrent_slots_and_serves_waiters_in_order():
+    admission = AdmissionController(max_concurrent=2)
+    release = threading.Event()
+    running, peak, order, positions = [0], [0], [], {}
+    lock = threading.Lock()
+
+    def query(name):
+        def on_wait(position):
+            positions.setdefault(name, []).append(position)
+
+        with admission.slot(on_wait=on_wait, poll_interval=0.01):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                order.append(name)
+            release.wait(5)
+            with lock:
+                running[0] -= 1
+
+    threads = []
+    for name in range(5):
+        threads.append(threading.Thread(target=query, args=(name,)))
+        threads[-1].start()
+        wait_for(lambda: admission.stats()["running"] + admission.stats()["waiting"] == name + 1)
+    assert admission.stats()["running"] == 2 and admission.stats()["waiting"] == 3
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert peak[0] == 2 and order == [0, 1, 2, 3, 4]
+    # Waiters saw their place in the queue, then 0 once admitted.
+    assert positions[2][0] == 1 and positions[4][0] == 3
+    assert all(seen[-1] == 0 for seen in positions.values())
+    assert admission.stats() == {"max_concurrent": 2, "running": 0, "waiting": 0, "admitted": 5, "queued": 3}
+
+
+def test_a_waiter_that_gives_up_leaves_the_queue():
+    admission = AdmissionController(max_concurrent=1)
+
+    class Stopped(BaseException):
+        pass
+
+    def on_wait(position):
+        raise Stopped
+
+    with admission.slot():
+        with pytest.raises(Stopped):
+            with admission.slot(on_wait=on_wait):
+                pass
+        assert admission.stats()["waiting"] == 0
+    with admission.slot():
+        assert admission.stats()["running"] == 1
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.first_seen import FirstSeenIndex
+
+
+def rows(*senders):
+    """``_new_rows`` result: (sender, first_seen, last_seen) triples."""
+    return pd.DataFrame(senders, columns=["sender", "first_seen", "last_seen"])
+
+
+def index_with(tmp_path, monkeypatch, *batches):
+    index = FirstSeenIndex(str(tmp_path / "first_seen.parquet"))
+    calls = []
+    batches = list(batches)
+
+    def new_rows(since, until):
+        calls.append(since)
+        return batches.pop(0)
+
+    monkeypatch.setattr(index, "_new_rows", new_rows)
+    return index, calls
+
+
+def test_refresh_keeps_the_earliest_timestamp_and_reads_from_the_watermark_day(tmp_path, monkeypatch):
+    index, calls = index_with(
+        tmp_path, monkeypatch,
+        rows(("a", "2024-01-02 10:00", "2024-01-05 08:00"), ("b", "2024-01-05 07:00", "2024-01-05 07:00")),
+        rows(("a", "2024-01-05 09:00", "2024-01-06 00:00"), ("c", "2024-01-06 00:00", "2024-01-06 00:00")),
+    )
+    index.refresh()
+    index.refresh()
+    assert calls == [None, pd.Timestamp("2024-01-05 08:00").date()]
+    assert index.watermark == pd.Timestamp("2024-01-06")
+    first = index.lookup(["a", "b", "c", "unknown"])
+    expected = pd.to_datetime(["2024-01-02 10:00", "2024-01-05 07:00", "2024-01-06 00:00"])
+    assert pd.DatetimeIndex(first[:3]).tolist() == expected.tolist()
+    assert np.isnat(first[3])
+
+
+def test_another_process_reads_the_persisted_index(tmp_path, monkeypatch):
+    index, _ = index_with(tmp_path, monkeypatch, rows(("a", "2024-01-02", "2024-01-03")))
+    index.refresh()
+    reader = FirstSeenIndex(index.path)
+    reader._load()
+    assert reader.watermark == pd.Timestamp("2024-01-03")
+    assert reader.lookup(["a"])[0] == np.datetime64("2024-01-02")
+
+
+def test_senders_are_new_only_in_the_period_of_their_first_transfer(tmp_path, monkeypatch):
+    index, _ = index_with(tmp_path, monkeypatch, rows(("old", "2023-06-01", "2024-01-01")))
+    index.refresh()
+    activity = pd.DataFrame({
+        "activity_date": ["2024-01-01", "2024-01-01", "2024-01-08", "2024-01-08"],
+        "sender": ["old", "fresh", "old", "fresh"],  # "fresh" is newer than the watermark
+    })
+    series = index.user_time_series("week", activity).set_index("Date")
+    assert series["New Users"].tolist() == [1, 0]
+    assert series["Returning Users"].tolist() == [1, 2]
+    assert series["Total Users"].tolist() == [2, 2]
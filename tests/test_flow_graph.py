@@ -0,0 +1,50 @@
+import math
+
+import pandas as pd
+import pytest
+
+from dashboard.flow_graph import LayoutCache, build_graph, flow_figure, split_paths
+
+
+def flows(transfers=(10, 5, 1)):
+    paths = pd.DataFrame({
+        "🔀Path": ["ethereum➡osmosis", "osmosis➡ethereum", "ethereum➡osmosis", "broken"],
+        "Transfers": [*transfers, 7],
+        "Volume": [100.0, None, 1.0, 7.0],
+    })
+    return split_paths(paths)
+
+
+def test_repeated_paths_are_summed_and_rows_without_a_chain_skipped():
+    graph = build_graph(flows(), "Transfers", "Volume")
+    assert sorted(graph.edges) == [("ethereum", "osmosis"), ("osmosis", "ethereum")]
+    edge = graph["ethereum"]["osmosis"]
+    assert (edge["transfers"], edge["volume"]) == (11, 101.0)
+    assert edge["weight"] == pytest.approx(math.log1p(11))
+    assert graph["osmosis"]["ethereum"]["volume"] == 0.0
+
+
+def test_layout_is_reused_then_warm_started_when_only_weights_change():
+    layouts = LayoutCache()
+    first = layouts.layout(build_graph(flows(), "Transfers", "Volume"))
+    assert layouts.layout(build_graph(flows(), "Transfers", "Volume")) is first
+    layouts.layout(build_graph(flows((500, 5, 1)), "Transfers", "Volume"))
+    assert layouts.stats() == {"entries": 1, "hits": 1, "warm_starts": 1, "misses": 1}
+
+
+def test_layout_cache_keeps_only_the_newest_graphs():
+    def single(chain):
+        paths = pd.DataFrame({"🔀Path": [f"ethereum➡{chain}"], "Transfers": [1], "Volume": [1.0]})
+        return build_graph(split_paths(paths), "Transfers", "Volume")
+
+    layouts = LayoutCache(max_entries=1)
+    for chain in ("osmosis", "base", "osmosis"):
+        layouts.layout(single(chain))
+    assert layouts.stats() == {"entries": 1, "hits": 0, "warm_starts": 0, "misses": 3}
+    assert layouts.layout(single("osmosis").subgraph([])) == {}
+
+
+def test_figure_draws_every_chain_once():
+    graph = build_graph(flows(), "Transfers", "Volume")
+    fig = flow_figure(graph, LayoutCache().layout(graph), metric="volume")
+    assert list(fig.data[-1].text) == list(graph.nodes)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from dashboard.fusion import FusedQuery, GroupingSet
+from dashboard.loaders.squid import BREAKDOWNS
+
+# What the warehouse computes for each fused measure of BREAKDOWNS, over the base rows.
+AGGREGATES = {
+    "swaps": lambda rows: rows["id"].nunique(),
+    "swappers": lambda rows: rows["user"].nunique(),
+    "volume": lambda rows: round(rows["amount_usd"].sum()),
+}
+
+
+def events(rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "src": rng.choice(["ethereum", "arbitrum", "osmosis", "base"], rows),
+        "dst": rng.choice(["polygon", "avalanche", "ethereum"], rows),
+        "symbol": rng.choice(["USDC", "axlUSDC", "WETH", None], rows),
+        "id": rng.integers(0, 300, rows),
+        "user": rng.integers(0, 80, rows),
+        "amount_usd": rng.random(rows) * 1000,
+    })
+
+
+def grouped(base, keys, measures):
+    """One row per group of ``keys`` (NULL keys included) with the named fused measures."""
+    groups = base.groupby(keys, dropna=False, sort=False)
+    return pd.DataFrame([
+        {**dict(zip(keys, key if isinstance(key, tuple) else (key,))), **{m: AGGREGATES[m](rows) for m in measures}}
+        for key, rows in groups
+    ])
+
+
+def fused_result(fused, base, seed=0):
+    """The GROUPING SETS result the warehouse returns, rows in no particular order."""
+    parts = []
+    for grouping_set in fused.sets:
+        part = grouped(base, list(dict.fromkeys(grouping_set.keys.values())), fused.measures)
+        parts.append(part.assign(_set=fused.set_id(grouping_set)))
+    result = pd.concat(parts, ignore_index=True)[["_set", *fused.keys, *fused.measures]]
+    return result.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def separately(grouping_set, base):
+    """The set computed on its own, as its loader used to."""
+    part = grouped(base, list(grouping_set.keys.values()), list(dict.fromkeys(grouping_set.measures.values())))
+    part = pd.DataFrame({name: part[column] for name, column in {**grouping_set.keys, **grouping_set.measures}.items()})
+    if grouping_set.drop_null_keys:
+        part = part.dropna(subset=list(grouping_set.keys))
+    return part
+
+
+def by_keys(frame, keys):
+    return frame.sort_values(keys, na_position="last", kind="stable").reset_index(drop=True)
+
+
+def test_set_ids_flag_the_keys_a_set_does_not_group_by():
+    ids = {grouping_set.name: BREAKDOWNS.set_id(grouping_set) for grouping_set in BREAKDOWNS.sets}
+    # Fused keys in order (src, dst, symbol); a 1 bit marks a key left out.
+    assert ids == {
+        "by_source_chain": 0b011,
+        "by_destination_chain": 0b101,
+        "by_symbol": 0b110,
+        "source_chain_symbol": 0b010,
+    }
+
+
+def test_split_matches_each_set_computed_separately():
+    base = events()
+    parts = BREAKDOWNS.split(fused_result(BREAKDOWNS, base))
+    assert list(parts) == [grouping_set.name for grouping_set in BREAKDOWNS.sets]
+    for grouping_set in BREAKDOWNS.sets:
+        part = parts[grouping_set.name]
+        assert list(part.columns) == [*grouping_set.keys, *grouping_set.measures]
+        assert part[grouping_set.order_by].is_monotonic_decreasing
+        keys = list(grouping_set.keys)
+        pdt.assert_frame_equal(by_keys(part, keys), by_keys(separately(grouping_set, base), keys), check_dtype=False)
+
+
+def test_null_keys_stay_in_their_own_set():
+    parts = BREAKDOWNS.split(fused_result(BREAKDOWNS, events()))
+    # A NULL symbol is a group of its own in source × symbol, and dropped where the set asks for it.
+    assert parts["source_chain_symbol"]["Symbol"].isna().any()
+    assert not parts["by_symbol"]["SYMBOL"].isna().any()
+    assert len(parts["by_source_chain"]) == 4
+
+
+def test_split_applies_order_and_limit():
+    fused = FusedQuery(
+        keys={"a": "a", "b": "b"},
+        measures={"swaps": "COUNT(DISTINCT id)"},
+        sets=[
+            GroupingSet("top_a", keys={"A": "a"}, measures={"N": "swaps"}, order_by="N", limit=2),
+            GroupingSet("b", keys={"B": "b"}, measures={"N": "swaps"}, order_by="N", ascending=True),
+        ]
+    )
+    result = pd.DataFrame({
+        "_set": [1, 1, 1, 2, 2],
+        "a": ["x", "y", "z", None, None],
+        "b": [None, None, None, "p", "q"],
+        "swaps": [5, 9, 7, 3, 1],
+    })
+    parts = fused.split(result)
+    pdt.assert_frame_equal(parts["top_a"], pd.DataFrame({"A": ["y", "z"], "N": [9, 7]}))
+    pdt.assert_frame_equal(parts["b"], pd.DataFrame({"B": ["q", "p"], "N": [1, 3]}))
@@ -0,0 +1,105 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dashboard import latency
+from dashboard.parquet_store import ParquetStore
+
+
+def swaps(rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 30, rows), unit="D"),
+        "source_chain": rng.choice(["ethereum", "arbitrum", "osmosis"], rows),
+        "destination_chain": rng.choice(["base", "polygon"], rows),
+        "service": rng.choice(["GMP", "Token Transfers"], rows),
+        # Long-tailed seconds, with some instant ones.
+        "latency": np.where(rng.random(rows) < 0.02, 0.0, rng.lognormal(4, 1.2, rows)),
+    })
+
+
+def sketch(events):
+    """Sketch rows of ``events`` as ``SKETCH_QUERY`` returns them."""
+    rows = events.assign(bucket=latency.bucket_of(events["latency"]))
+    keys = ["date", "source_chain", "destination_chain", "service", "bucket"]
+    return rows.groupby(keys, as_index=False).size().rename(columns={"size": "count"})
+
+
+def exact(values, q):
+    """Nearest-rank quantile: the value of rank ``q * (n - 1)``, as ``quantiles`` reads it from the buckets."""
+    values = np.sort(np.asarray(values))
+    return values[int(q * (len(values) - 1))]
+
+
+def assert_close(estimate, value):
+    assert abs(estimate - value) <= latency.RELATIVE_ACCURACY * value + 1e-9
+
+
+def test_bucket_value_is_within_accuracy_of_its_latencies():
+    values = np.geomspace(1e-3, 1e6, 5_000)
+    estimates = latency.value_of(latency.bucket_of(values))
+    assert np.all(np.abs(estimates - values) <= latency.RELATIVE_ACCURACY * values * (1 + 1e-9))
+    assert latency.value_of(latency.bucket_of([0.0, -1.0])).tolist() == [0.0, 0.0]
+
+
+def test_merged_daily_sketches_give_the_quantiles_of_all_events():
+    events = swaps()
+    result = latency.quantiles(sketch(events))
+    assert result["Swaps"].tolist() == [len(events)]
+    for name, q in latency.QUANTILES.items():
+        assert_close(result[name].iloc[0], exact(events["latency"], q))
+
+
+@pytest.mark.parametrize("by", [("service",), ("source_chain", "destination_chain")])
+def test_quantiles_per_group_match_each_group_exactly(by):
+    events = swaps()
+    result = latency.quantiles(sketch(events), by=by).set_index(list(by))
+    for key, group in events.groupby(list(by)):
+        row = result.loc[key if len(by) > 1 else key[0]]
+        assert row["Swaps"] == len(group)
+        for name, q in latency.QUANTILES.items():
+            assert_close(row[name], exact(group["latency"], q))
+
+
+def test_sketches_of_a_date_window_merge_like_the_window_of_events():
+    events = swaps()
+    window = events[(events["date"] >= "2024-01-10") & (events["date"] <= "2024-01-20")]
+    sketches = sketch(events)
+    merged = latency.quantiles(sketches[(sketches["date"] >= "2024-01-10") & (sketches["date"] <= "2024-01-20")])
+    pdt.assert_frame_equal(merged, latency.quantiles(sketch(window)))
+
+
+def test_stored_sketches_fetch_each_closed_day_once(tmp_path):
+    events = swaps()
+    events["date"] = events["date"].dt.date
+    fetched = []
+
+    def fetch(start, end):
+        fetched.append((start, end))
+        return sketch(events[(events["date"] >= start) & (events["date"] <= end)])
+
+    store, day = ParquetStore(str(tmp_path)), datetime.date
+    today = day(2024, 1, 25)
+
+    def load(start, end):
+        return latency.stored_sketches(store, start, end, fetch, today=today)
+
+    first = load(day(2024, 1, 10), day(2024, 1, 20))
+    assert fetched == [(day(2024, 1, 10), day(2024, 1, 20))]
+    load(day(2024, 1, 12), day(2024, 1, 18))
+    assert len(fetched) == 1
+    # Before and after the stored days: only the missing ones, and today every time.
+    wide = load(day(2024, 1, 5), day(2024, 1, 25))
+    assert fetched[1:] == [
+        (day(2024, 1, 5), day(2024, 1, 9)), (day(2024, 1, 21), day(2024, 1, 24)), (today, today),
+    ]
+    assert store.manifest(latency.DATASET) == {"start": day(2024, 1, 5), "end": day(2024, 1, 24)}
+
+    pdt.assert_frame_equal(latency.quantiles(first), latency.quantiles(fetch(day(2024, 1, 10), day(2024, 1, 20))))
+    pdt.assert_frame_equal(
+        latency.quantiles(wide, by=("service",)),
+        latency.quantiles(fetch(day(2024, 1, 5), day(2024, 1, 25)), by=("service",)),
+    )
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from dashboard import warehouse
+from dashboard.live import LiveFeed, MinuteRing
+
+
+def test_ring_sums_per_minute_and_forgets_minutes_that_slid_out():
+    ring = MinuteRing(["Swaps"], minutes=3)
+    ring.add([100, 100, 101], [[1], [2], [5]])
+    ring.add([103, 99], [[7], [9]])  # 100 slides out; 99 is already outside the window
+    _, window = ring.snapshot()
+    assert window["Swaps"].tolist() == [5.0, 7.0]
+    assert window["Minute"].tolist() == list(pd.to_datetime([101, 103], unit="m"))
+
+
+def test_changes_hold_only_the_minutes_touched_after_a_revision():
+    ring = MinuteRing(["Swaps"], minutes=10)
+    ring.add([100, 101], [[1], [1]])
+    revision, _ = ring.snapshot()
+    ring.add([101, 102], [[1], [1]])
+    latest, changed = ring.changes(revision)
+    assert latest == revision + 1
+    assert changed["Swaps"].tolist() == [2.0, 1.0]
+    assert ring.changes(latest)[1].empty
+
+
+def test_feed_polls_from_the_last_row_seen_at_most_once_per_interval(monkeypatch):
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None).floor("min")
+    results = [
+        pd.DataFrame({"minute": [now], "last_seen": [now + pd.Timedelta(seconds=40)], "Swaps": [3]}),
+        pd.DataFrame({
+            "minute": [now, now + pd.Timedelta(minutes=1)],
+            "last_seen": [now + pd.Timedelta(seconds=50), now + pd.Timedelta(seconds=70)],
+            "Swaps": [1, 2],
+        }),
+    ]
+    sinces = []
+    monkeypatch.setattr(warehouse, "read_sql", lambda sql: results.pop(0))
+    feed = LiveFeed("swaps", ["Swaps"], lambda since: sinces.append(since) or "", window_minutes=60, poll_seconds=3600)
+    feed.poll()
+    feed.poll()  # within the interval: no query
+    assert len(sinces) == 1
+    feed._polled = 0.0
+    feed.poll()
+    assert sinces[1] == now + pd.Timedelta(seconds=40)
+    assert feed.last_seen == now + pd.Timedelta(seconds=70)
+    assert feed.ring.snapshot()[1]["Swaps"].tolist() == [4.0, 2.0]
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from dashboard import cache, memory
+from dashboard.cache import ResultCache
+
+
+@pytest.fixture
+def results(monkeypatch):
+    store = ResultCache()
+    monkeypatch.setattr(memory, "result_cache", store)
+    monkeypatch.setattr(memory.anomaly, "state", lambda refresh=False: [])
+    return store
+
+
+def test_rss_is_sampled_into_a_bounded_history():
+    sampler = memory.RssSampler(history=2)
+    for _ in range(3):
+        sampler.sample()
+    assert len(sampler.history()) == 2 and all(rss > 0 for _, rss in sampler.history())
+
+
+def test_metrics_report_each_cached_result_with_escaped_labels(results):
+    frame = pd.DataFrame({"volume": range(1_000)})
+    results.register("load_paths")
+    results.put("load_paths", (("chain", '"osmosis"'),), frame)
+    text = memory.prometheus_metrics()
+    assert "# TYPE axelar_cache_bytes gauge" in text
+    assert f'axelar_cache_bytes{{loader="load_paths"}} {cache.sizeof(frame)}' in text
+    assert 'axelar_cache_entry_bytes{loader="load_paths",arguments="chain=\\"osmosis\\""}' in text
+    assert "axelar_sessions 0" in text  # no Streamlit server in the test process
+    assert text.endswith("\n")
+
+
+def test_live_objects_count_the_frames_alive_in_the_process():
+    frames = [pd.DataFrame({"a": range(100)}) for _ in range(3)]
+    counts = memory.live_objects()
+    assert counts["DataFrame"]["count"] >= len(frames)
+    assert counts["DataFrame"]["nbytes"] >= sum(cache.sizeof(frame) for frame in frames)
+
+
+def test_other_caches_include_path_cubes_while_their_frame_lives():
+    from dashboard import chain_matrix
+
+    frame = pd.DataFrame({
+        "date": ["2024-01-01"], "source_chain": ["ethereum"], "destination_chain": ["osmosis"], "transfers": [1],
+    })
+    before = memory.other_caches()["path_cubes"]["entries"]
+    chain_matrix.path_cube(frame)
+    assert memory.other_caches()["path_cubes"]["entries"] == before + 1
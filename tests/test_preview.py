@@ -0,0 +1,90 @@
+import concurrent.futures
+import threading
+import time
+import types
+
+import pytest
+from streamlit.runtime import scriptrunner
+
+from dashboard import preview, warehouse
+from dashboard.concurrency import QueryCancelled, QueryRegistry
+from dashboard.profiling import submit
+
+
+def test_approximate_sql_swaps_every_exact_distinct_count():
+    query = "SELECT COUNT(DISTINCT sender), count ( distinct  tx ), COUNT(*) FROM t"
+    assert preview.approximate_sql(query) == (
+        "SELECT APPROX_COUNT_DISTINCT(sender), APPROX_COUNT_DISTINCT(tx ), COUNT(*) FROM t"
+    )
+
+
+@pytest.fixture
+def script_thread(monkeypatch):
+    """A Streamlit run on the test's thread only; worker threads have none, as in the server."""
+    ctx = types.SimpleNamespace(session_id="s1", cursors={}, yield_check=None)
+    main = threading.current_thread()
+    monkeypatch.setattr(
+        scriptrunner, "get_script_run_ctx",
+        lambda suppress_warning=False: ctx if threading.current_thread() is main else None,
+    )
+    return ctx
+
+
+class Query:
+    """A warehouse query that runs until it is aborted."""
+
+    def __init__(self):
+        self.connection = self
+        self.sfqid = None
+        self.aborted = threading.Event()
+
+    def execute_async(self, query):
+        self.sfqid = "q1"
+
+    def get_query_status_throw_if_error(self, query_id):
+        if self.aborted.is_set():
+            raise RuntimeError("SQL execution canceled")
+        return "RUNNING"
+
+    @staticmethod
+    def is_still_running(status):
+        return status == "RUNNING"
+
+
+def test_background_work_runs_under_the_owning_run(script_thread):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    stop = threading.Event()
+    with warehouse.background_run(stop):
+        owner = submit(executor, warehouse._script_run).result()
+    assert owner[:2] == ("s1", script_thread.cursors)
+    assert submit(executor, warehouse._script_run).result() == (None, None, None)
+
+    owner[2]()  # nothing to stop yet
+    stop.set()
+    with pytest.raises(QueryCancelled):
+        owner[2]()
+
+
+def test_stopping_the_run_aborts_its_background_query(script_thread, monkeypatch):
+    registry, query = QueryRegistry(), Query()
+    monkeypatch.setattr(warehouse, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(warehouse, "running_queries", registry)
+    monkeypatch.setattr(warehouse, "_abort", lambda query_id: query.aborted.set())
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    stop = threading.Event()
+    with warehouse.background_run(stop):
+        running = submit(executor, warehouse._execute, query, "SELECT 1")
+        queued = submit(executor, preview._unless_stopped, stop, warehouse._execute, Query(), "SELECT 2")
+    deadline = time.monotonic() + 5
+    while registry.stats()["in_flight"] == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert registry.stats()["sessions"] == 1
+
+    stop.set()  # the session's next run has started
+    with pytest.raises(QueryCancelled):
+        running.result(5)
+    assert query.aborted.is_set() and registry.stats() == {"sessions": 0, "in_flight": 0, "cancelled": 1}
+    # A load still waiting for a worker never starts its query.
+    with pytest.raises(concurrent.futures.CancelledError):
+        queued.result(5)
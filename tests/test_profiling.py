@@ -0,0 +1,59 @@
+import json
+import os
+import time
+
+import pytest
+import streamlit as st
+
+from dashboard import profiling
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    monkeypatch.delenv("AXELAR_PROFILE", raising=False)
+    return tmp_path
+
+
+@pytest.mark.parametrize("allow_url, enabled", [(False, False), (True, True)])
+def test_query_parameter_switches_profiling_only_when_allowed(profile_dir, monkeypatch, allow_url, enabled):
+    monkeypatch.setattr(profiling, "ALLOW_URL", allow_url)
+    monkeypatch.setattr(st, "query_params", {"profile": "1"})
+    profiler = profiling.page_profiler("squid")
+    assert profiler.enabled is enabled
+    if enabled:
+        profiler.trace.finish()
+
+
+def test_environment_switch_does_not_need_the_url(profile_dir, monkeypatch):
+    monkeypatch.setenv("AXELAR_PROFILE", "1")
+    monkeypatch.setattr(st, "query_params", {})
+    profiler = profiling.page_profiler("squid")
+    assert profiler.enabled
+    profiler.trace.finish()
+
+
+def test_trace_records_sections_with_their_own_work_as_transform(profile_dir):
+    trace = profiling.Trace("squid")
+    trace.section("Row 1")
+    with profiling.span("read_sql", "warehouse"):
+        time.sleep(0.01)
+    time.sleep(0.01)
+    trace.section("Row 2")
+    path = trace.finish()
+
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    names = [event["name"] for event in events if event["ph"] == "X"]
+    assert names.count("transform") >= 2
+    assert {"read_sql", "Row 1", "Row 2", "rerun squid"} <= set(names)
+    assert profiling._current.get() is None
+
+
+def test_only_the_newest_traces_are_kept(profile_dir):
+    for n in range(5):
+        path = profile_dir / f"squid-{n}{profiling.TRACE_SUFFIX}"
+        path.write_text("{}", encoding="utf-8")
+        os.utime(path, (1_000 + n, 1_000 + n))
+    (profile_dir / "notes.txt").write_text("kept", encoding="utf-8")
+    profiling._prune_traces(keep=2)
+    assert sorted(os.listdir(profile_dir)) == ["notes.txt", "squid-3.trace.json", "squid-4.trace.json"]
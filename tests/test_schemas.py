@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pyarrow as pa
+
+from dashboard.cache import compress, decompress
+from dashboard.schemas import conform
+from dashboard.shared_store import SharedResultStore
+
+
+def chain_pairs(rows=1_000, seed=0):
+    """``load_daily_chain_pairs`` as the connector returns it: 64-bit numbers and object columns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": rng.choice(["2024-01-01", "2024-01-02", "2024-01-03"], rows).astype(object),
+        "source_chain": rng.choice(["ethereum", "arbitrum", "osmosis"], rows).astype(object),
+        "destination_chain": rng.choice(["base", "polygon"], rows).astype(object),
+        "transfers": rng.integers(0, 1_000, rows, dtype=np.int64),
+        "users": rng.integers(0, 100, rows, dtype=np.int64),
+        "volume": rng.integers(0, 10_000, rows).astype(np.float64) / 4,  # quarters survive float32
+    })
+
+
+def test_declared_columns_are_narrowed_without_changing_values():
+    raw = chain_pairs()
+    typed = conform("load_daily_chain_pairs", raw)
+    assert pd.api.types.is_datetime64_any_dtype(typed["date"])
+    assert typed.drop(columns="date").dtypes.map(str).to_dict() == {
+        "source_chain": "category", "destination_chain": "category",
+        "transfers": "int32", "users": "int32", "volume": "float32",
+    }
+    assert typed.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum() / 2
+    pdt.assert_frame_equal(
+        typed.astype({"source_chain": object, "destination_chain": object, "transfers": np.int64, "users": np.int64,
+                      "volume": np.float64}),
+        raw.assign(date=pd.to_datetime(raw["date"])),
+        check_dtype=False,
+    )
+
+
+def test_values_that_do_not_fit_keep_their_width():
+    raw = pd.DataFrame({
+        "transfers": [1, 2**40], "users": [1.5, 2.0], "volume": [0.1, 1.0],
+        "date": ["2024-01-01", None],
+    })
+    typed = conform("load_daily_chain_pairs", raw)
+    assert typed["transfers"].dtype == np.int64  # beyond int32
+    assert typed["users"].dtype == np.float64  # not whole numbers
+    assert typed["volume"].dtype == np.float64 and typed["volume"][0] == 0.1  # 0.1 does not survive float32
+    assert typed["date"].isna().tolist() == [False, True]
+
+
+def test_unlisted_loaders_and_missing_columns_are_left_alone():
+    raw = pd.DataFrame({"transfers": np.arange(3, dtype=np.int64)})
+    assert conform("not_a_loader", raw) is raw
+    assert conform("load_daily_chain_pairs", raw)["transfers"].dtype == np.int32
+    assert conform("load_daily_chain_pairs", {"kpi": 1}) == {"kpi": 1}
+
+
+def test_conformed_dtypes_survive_compression_and_the_shared_store(tmp_path):
+    typed = conform("load_daily_chain_pairs", chain_pairs())
+    pdt.assert_frame_equal(decompress(compress(typed, "zstd")), typed)
+    pdt.assert_frame_equal(decompress(compress(typed, "lz4")), typed)
+
+    store = SharedResultStore(str(tmp_path))
+    key = (("start_date", "'2024-01-01'"),)
+    assert store.put("load_daily_chain_pairs", key, typed)
+    pdt.assert_frame_equal(store.get("load_daily_chain_pairs", key), typed)
+    assert pa.types.is_dictionary(pa.Table.from_pandas(typed).schema.field("source_chain").type)
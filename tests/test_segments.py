@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dashboard import segments
+
+
+def wallets(rows=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 40, rows)
+    return pd.DataFrame({
+        "TXNS": days * rng.integers(1, 80, rows),
+        "DAYS": days,
+        "PATHS": rng.integers(1, 6, rows),
+        "VOLUME": rng.lognormal(8, 2.5, rows),
+        "FEES": rng.random(rows),
+        "TOKENS": rng.integers(1, 4, rows),
+    })
+
+
+def expected(frame):
+    """The segment rules written out row by row."""
+    def rule(row):
+        if row["VOLUME"] >= segments.WHALE_USD:
+            return segments.SEGMENTS[0]
+        if row["DAYS"] and row["TXNS"] / row["DAYS"] >= segments.BOT_TXNS_PER_DAY:
+            return segments.SEGMENTS[1]
+        if row["DAYS"] >= segments.POWER_DAYS:
+            return segments.SEGMENTS[2]
+        return segments.SEGMENTS[3]
+
+    return frame.apply(rule, axis=1)
+
+
+def test_first_matching_rule_wins():
+    frame = wallets()
+    codes = segments.classify(segments.features(frame))
+    assert (np.array(segments.SEGMENTS)[codes] == expected(frame).to_numpy()).all()
+
+
+def test_summary_matches_a_groupby_over_all_wallets():
+    frame = wallets()
+    summary = segments.segment([frame], workers=0).set_index("Segment")
+    groups = frame.groupby(expected(frame))
+    for name in segments.SEGMENTS:
+        group = groups.get_group(name)
+        assert summary.loc[name, "Wallets"] == len(group)
+        assert summary.loc[name, "Volume ($USD)"] == pytest.approx(group["VOLUME"].sum())
+        assert summary.loc[name, "Transactions"] == group["TXNS"].sum()
+    assert summary["Wallet Share"].sum() == pytest.approx(1.0)
+
+
+def test_chunks_and_batches_do_not_change_the_summary():
+    frame = wallets()
+    whole = segments.segment([frame], workers=0)
+    batches = [frame.iloc[start:start + 3_000] for start in range(0, len(frame), 3_000)]
+    pdt.assert_frame_equal(segments.segment(batches, workers=0, chunk_rows=1_000), whole)
+
+
+def test_missing_features_count_as_zero_and_no_wallets_share_nothing():
+    summary = segments.segment([pd.DataFrame({"days": [1.0, 20.0]})], workers=0)
+    assert summary["Wallets"].tolist() == [0, 0, 1, 1]
+    empty = segments.segment([], workers=0)
+    assert empty["Wallets"].sum() == 0 and (empty["Wallet Share"] == 0).all()
@@ -0,0 +1,73 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from dashboard import cache, shared_store
+from dashboard.cache import ResultCache, cached, sizeof
+from dashboard.shared_store import SharedResultStore
+
+KEY = (("start_date", "'2024-01-01'"),)
+
+
+def transfers(rows=50_000):
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "chain": pd.Categorical(np.where(np.arange(rows) % 3, "ethereum", "osmosis")),
+        "count": np.arange(rows, dtype=np.int32),
+        "volume": np.arange(rows, dtype=np.float64) / 3,
+    })
+
+
+def test_published_frame_is_read_back_by_another_store(tmp_path):
+    frame = transfers()
+    assert SharedResultStore(str(tmp_path)).put("load", KEY, frame)
+    pdt.assert_frame_equal(SharedResultStore(str(tmp_path)).get("load", KEY), frame)
+    assert SharedResultStore(str(tmp_path)).get("load", (("start_date", "'2023-01-01'"),)) is None
+
+
+def test_frames_arrow_cannot_hold_are_not_published(tmp_path):
+    store = SharedResultStore(str(tmp_path))
+    for frame in (pd.DataFrame({"a": [1j]}), pd.DataFrame({"a": [b"x", 1]}), pd.DataFrame({"a": [object()]})):
+        assert store.put("load", KEY, frame) is False
+    assert os.listdir(tmp_path) == []
+
+
+def test_expired_and_oversized_entries_are_removed(tmp_path):
+    store = SharedResultStore(str(tmp_path), max_bytes=1)
+    store.put("load", KEY, transfers(10))
+    assert store.usage() == (0, 0)  # nothing fits in one byte
+
+    store = SharedResultStore(str(tmp_path))
+    store.put("load", KEY, transfers(10))
+    os.utime(store.path_for("load", KEY), (time.time() - 120, time.time() - 120))
+    assert store.get("load", KEY, ttl=60) is None
+    assert store.usage() == (0, 0)
+
+
+def test_abandoned_temporary_files_are_removed_at_startup(tmp_path):
+    stale, live = tmp_path / "tmpold.tmp", tmp_path / "tmpnew.tmp"
+    stale.write_bytes(b"partial")
+    live.write_bytes(b"partial")
+    old = time.time() - shared_store.STALE_TMP_SECONDS - 60
+    os.utime(stale, (old, old))
+    SharedResultStore(str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["tmpnew.tmp"]
+
+
+def test_mapped_hits_count_only_their_private_bytes(tmp_path, monkeypatch):
+    frame = transfers()
+    SharedResultStore(str(tmp_path)).put("load_mapped", (("day", "'2024-01-01'"),), frame)
+    monkeypatch.setattr(cache, "shared_store", SharedResultStore(str(tmp_path)))
+    store = ResultCache(compress_min_bytes=0)
+
+    @cached(name="load_mapped", cache=store)
+    def load_mapped(day):
+        raise AssertionError("served from the shared store")
+
+    pdt.assert_frame_equal(load_mapped("2024-01-01"), frame)
+    assert store.nbytes == 0 < sizeof(frame)
+    labelled = frame.assign(label=pd.Series(["x"] * len(frame), dtype=object))
+    assert shared_store.resident_nbytes(labelled) > shared_store.resident_nbytes(frame) == 0
@@ -0,0 +1,60 @@
+import datetime
+import inspect
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from dashboard import snapshot
+from dashboard.loaders import satellite, squid
+
+JAN = {"timeframe": "month", "start_date": datetime.date(2024, 1, 1), "end_date": datetime.date(2024, 1, 31)}
+JAN_WEEKS = {**JAN, "timeframe": "week"}
+
+
+def test_calls_are_planned_once_per_distinct_arguments():
+    calls = snapshot.plan(["squid"], [JAN, JAN_WEEKS])
+    assert len(calls) == len(set(calls))
+    per_loader = {}
+    for page, name, arguments in calls:
+        per_loader.setdefault(name, []).append(arguments)
+    for name, loader in snapshot.page_loaders("squid").items():
+        takes_timeframe = "timeframe" in inspect.signature(loader).parameters
+        assert len(per_loader[name]) == (2 if takes_timeframe else 1)
+
+
+def test_arguments_leave_out_the_preview_flag_and_unused_parameters():
+    assert snapshot.call_arguments(squid.load_kpi_data, JAN) == tuple(
+        (name, JAN[name]) for name in sorted(inspect.signature(squid.load_kpi_data).parameters) if name != "approximate"
+    )
+
+
+def test_serving_answers_from_the_results_and_restores_the_loaders():
+    name = "get_path_data"
+    original = getattr(satellite, name)
+    arguments = snapshot.call_arguments(original, JAN)
+    frame = pd.DataFrame({"🔀Path": ["ethereum➡osmosis"]})
+    with snapshot.serving("satellite", {("satellite", name, arguments): frame}):
+        result = getattr(satellite, name)(**dict(arguments))
+        if inspect.isgenerator(result):
+            [result] = list(result)
+        assert result is frame
+    assert getattr(satellite, name) is original
+
+
+def test_streamed_results_are_joined_into_one_frame(monkeypatch):
+    def paths(start_date):
+        yield pd.DataFrame({"a": [1]})
+        yield pd.DataFrame({"a": [2]})
+
+    monkeypatch.setattr(snapshot, "page_loaders", lambda page: {"paths": paths})
+    assert snapshot.run_call("satellite", "paths", (("start_date", JAN["start_date"]),))["a"].tolist() == [1, 2]
+
+
+def test_html_embeds_plotly_once_and_escapes_the_title(tmp_path):
+    path = tmp_path / "page.html"
+    figures = [go.Figure(go.Bar(x=[1], y=[1])), go.Figure(go.Bar(x=[2], y=[2]))]
+    snapshot.write_html(path, "Squid <Analysis>", snapshot.label(JAN), figures, [pd.DataFrame({"a": [1]})])
+    text = path.read_text(encoding="utf-8")
+    assert "<h1>Squid &lt;Analysis&gt;</h1>" in text and "2024-01-01_2024-01-31_month" in text
+    assert text.count("plotly.js v") == 1
+    assert snapshot.parse_range("2024-01-01:2024-03-31") == (datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))
@@ -0,0 +1,89 @@
+import contextlib
+import datetime
+
+import pandas as pd
+import pytest
+from snowflake.connector.errors import ProgrammingError
+
+from dashboard import squid_events, warehouse
+
+JAN = datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)
+
+
+class FakeCursor:
+    rowcount = 42
+
+    def __init__(self, fail_on=None):
+        self.statements = []
+        self.fail_on = fail_on
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        self.statements.append(sql.split()[0])
+        if self.fail_on and sql.startswith(self.fail_on):
+            raise ProgrammingError("insert failed")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRange:
+    def __init__(self, loaded):
+        self.loaded = loaded
+        self.cleared = 0
+
+    def __call__(self):
+        return self.loaded
+
+    def clear(self):
+        self.cleared += 1
+
+
+def test_projection_pushes_the_range_into_both_scans():
+    sql = squid_events.projection(*JAN)
+    assert sql.count("created_at::date >= '2024-01-01' AND created_at::date <= '2024-01-31'") == 2
+    assert sql.count("TRY_TO_DOUBLE(") == 10
+
+
+@pytest.mark.parametrize("loaded, from_table", [
+    ((datetime.date(2023, 6, 1), datetime.date(2024, 2, 1)), True),
+    ((datetime.date(2024, 1, 10), datetime.date(2024, 2, 1)), False),  # starts after the range
+    (None, False),
+])
+def test_source_reads_the_table_only_when_it_covers_the_range(monkeypatch, loaded, from_table):
+    monkeypatch.setattr(squid_events, "TABLE", "DB.SCHEMA.SQUID_EVENTS")
+    monkeypatch.setattr(squid_events, "table_range", FakeRange(loaded))
+    sql = squid_events.source(*JAN, lower_chains=True)
+    assert ("FROM DB.SCHEMA.SQUID_EVENTS" in sql) is from_table
+    assert ("fact_gmp" in sql) is not from_table
+    assert "LOWER(source_chain) AS source_chain" in sql
+
+
+@pytest.mark.parametrize("fail_on, statements", [
+    (None, ["CREATE", "ALTER", "BEGIN", "DELETE", "INSERT", "COMMIT"]),
+    ("INSERT", ["CREATE", "ALTER", "BEGIN", "DELETE", "INSERT", "ROLLBACK"]),
+])
+def test_refresh_replaces_the_days_in_one_transaction(monkeypatch, fail_on, statements):
+    cursor = FakeCursor(fail_on)
+    loaded = FakeRange(None)
+    monkeypatch.setattr(warehouse, "connection", lambda: contextlib.nullcontext(cursor))
+    monkeypatch.setattr(squid_events, "table_range", loaded)
+    with contextlib.suppress(ProgrammingError):
+        squid_events.refresh("DB.SCHEMA.SQUID_EVENTS", *JAN, log=lambda line: None)
+    assert cursor.statements == statements and cursor.closed
+    assert loaded.cleared == (fail_on is None)
+
+
+def test_resume_day_falls_back_to_the_origin(monkeypatch):
+    def missing(sql):
+        raise ProgrammingError("does not exist")
+
+    monkeypatch.setattr(warehouse, "read_sql", missing)
+    assert squid_events.resume_day("DB.SCHEMA.SQUID_EVENTS") == squid_events.ORIGIN
+    monkeypatch.setattr(warehouse, "read_sql", lambda sql: pd.DataFrame({"LAST_DAY": [None]}))
+    assert squid_events.resume_day("DB.SCHEMA.SQUID_EVENTS") == squid_events.ORIGIN
+    monkeypatch.setattr(warehouse, "read_sql", lambda sql: pd.DataFrame({"LAST_DAY": [datetime.date(2024, 3, 1)]}))
+    assert squid_events.resume_day("DB.SCHEMA.SQUID_EVENTS") == datetime.date(2024, 3, 1)
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from snowflake.connector.errors import NotSupportedError
+
+from dashboard import warehouse
+from dashboard.concurrency import AdmissionController
+
+
+class FakeCursor:
+    description = [("PATH",), ("TRANSFERS",)]
+
+    def __init__(self, chunks, arrow=True):
+        self.chunks = chunks
+        self.arrow = arrow
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def fetch_pandas_batches(self):
+        if not self.arrow:
+            raise NotSupportedError("no Arrow result")
+        yield from self.chunks
+
+    def fetchmany(self, size):
+        rows = [tuple(row) for chunk in self.chunks for row in chunk.itertuples(index=False)]
+        taken, self.chunks = rows[:size], []
+        return taken
+
+    def close(self):
+        self.closed = True
+
+    @staticmethod
+    def is_closed():
+        return False
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    result = AdmissionController(max_concurrent=1)
+    monkeypatch.setattr(warehouse, "admission", result)
+    monkeypatch.setattr(warehouse, "_execute", lambda cursor, query: None)
+    monkeypatch.setattr(warehouse, "_idle", [])
+    return result
+
+
+def test_batches_are_yielded_without_holding_a_warehouse_slot(admission, monkeypatch):
+    chunks = [pd.DataFrame({"PATH": ["a➡b"], "TRANSFERS": [3]}), pd.DataFrame({"PATH": ["b➡c"], "TRANSFERS": [1]})]
+    cursor = FakeCursor(chunks)
+    monkeypatch.setattr(warehouse, "_connect", lambda: cursor)
+    batches = warehouse.iter_batches("SELECT 1")
+    first = next(batches)
+    # The page renders the first batch while another query can take the only slot.
+    assert admission.stats()["running"] == 0
+    with admission.slot():
+        pass
+    assert [first["PATH"].tolist()] + [batch["PATH"].tolist() for batch in batches] == [["a➡b"], ["b➡c"]]
+    assert cursor.closed and warehouse._idle == [cursor]
+
+
+def test_fallback_and_empty_results_keep_the_columns(admission, monkeypatch):
+    chunks = [pd.DataFrame({"PATH": ["a➡b", "b➡c"], "TRANSFERS": [3, 1]})]
+    monkeypatch.setattr(warehouse, "_connect", lambda: FakeCursor(chunks, arrow=False))
+    [batch] = list(warehouse.iter_batches("SELECT 1"))
+    assert batch.to_dict("list") == {"PATH": ["a➡b", "b➡c"], "TRANSFERS": [3, 1]}
+
+    monkeypatch.setattr(warehouse, "_idle", [])
+    monkeypatch.setattr(warehouse, "_connect", lambda: FakeCursor([pd.DataFrame()]))
+    [empty] = list(warehouse.iter_batches("SELECT 1"))
+    assert empty.empty and list(empty.columns) == ["PATH", "TRANSFERS"]
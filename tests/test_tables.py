@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.tables import SortedOrder, sorted_order
+
+
+def transfers(rows=103, seed=0):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 20, rows).astype("float64")
+    counts[rng.choice(rows, 7, replace=False)] = np.nan
+    return pd.DataFrame({
+        "count": counts,
+        "path": pd.Categorical(rng.choice(["eth➡base", "arb➡eth", "osmo➡arb", "base➡osmo"], rows)),
+    })
+
+
+def expected_order(values, ascending):
+    """Row positions by value (NULLs last) with the row position breaking ties."""
+    values = list(values)
+    present = [i for i, v in enumerate(values) if not pd.isna(v)]
+    nulls = [i for i, v in enumerate(values) if pd.isna(v)]
+    if ascending:
+        present.sort(key=lambda i: (values[i], i))
+    else:
+        # Descending value, ascending position among equal values.
+        present.sort(key=lambda i: i)
+        present.sort(key=lambda i: values[i], reverse=True)
+    return present + nulls
+
+
+def walk(order, frame, column, page_size):
+    """Row positions of every page, each page found by seeking past the last row of the previous one."""
+    pages, cursor = [], None
+    while True:
+        start = order.seek(cursor)
+        stop = min(start + page_size, len(order))
+        if start >= stop:
+            return pages
+        pages.append(list(order.order[start:stop]))
+        cursor = order.cursor_at(stop - 1, frame, column)
+
+
+@pytest.mark.parametrize("column", ["count", "path"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("page_size", [1, 10, 25, 103, 500])
+def test_keyset_pages_cover_the_sorted_rows_once(column, ascending, page_size):
+    frame = transfers()
+    order = SortedOrder(frame, column, ascending)
+    pages = walk(order, frame, column, page_size)
+    assert [len(page) for page in pages[:-1]] == [page_size] * (len(pages) - 1)
+    assert [row for page in pages for row in page] == expected_order(frame[column], ascending)
+
+
+def test_seek_past_a_value_that_is_gone():
+    frame = pd.DataFrame({"count": [1.0, 3.0, 5.0, 7.0]})
+    ascending, descending = SortedOrder(frame, "count", True), SortedOrder(frame, "count", False)
+    # 4 was on the previous page of an older result: the next page starts at the first row beyond it.
+    assert ascending.seek((4.0, 99)) == 2
+    assert descending.seek((4.0, 99)) == 2
+    assert ascending.seek((0.0, 0)) == 0
+    assert ascending.seek((9.0, 0)) == 4
+
+
+def test_sorted_order_is_cached_per_frame_column_and_direction():
+    frame = transfers()
+    assert sorted_order(frame, "count", True) is sorted_order(frame, "count", True)
+    assert sorted_order(frame, "count", True) is not sorted_order(frame, "count", False)
+    assert sorted_order(frame, "count", True) is not sorted_order(transfers(), "count", True)
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from dashboard import warehouse
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    result = []
+
+    def connect():
+        result.append(FakeConnection())
+        return result[-1]
+
+    monkeypatch.setattr(warehouse, "_connect", connect)
+    monkeypatch.setattr(warehouse, "_idle", [])
+    monkeypatch.setattr(warehouse, "POOL_SIZE", 2)
+    return result
+
+
+def test_sequential_queries_reuse_one_connection(opened):
+    for _ in range(3):
+        with warehouse.connection() as conn:
+            pass
+    assert opened == [conn] and warehouse._idle == [conn]
+
+
+def test_concurrent_queries_never_share_a_connection(opened):
+    barrier = threading.Barrier(4)
+    used = []
+
+    def query():
+        with warehouse.connection() as conn:
+            used.append(conn)
+            barrier.wait(5)
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len({id(conn) for conn in used}) == 4
+    # Only POOL_SIZE stay open for reuse.
+    assert len(warehouse._idle) == 2 and sum(conn.closed for conn in opened) == 2
+
+
+def test_closed_connections_are_not_handed_out(opened):
+    with warehouse.connection() as first:
+        pass
+    first.close()
+    with warehouse.connection() as second:
+        assert second is not first and not second.closed
+    with warehouse.connection() as conn:
+        second.close()
+    assert warehouse._idle == []
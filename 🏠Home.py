@@ -1,4 +1,5 @@
 import streamlit as st
+from dashboard.memory import start_monitoring
 
 # --- Page Config: Tab Title & Icon ---
 st.set_page_config(
@@ -7,6 +8,8 @@ st.set_page_config(
     layout="wide" 
 )
 
+start_monitoring()
+
 # --- Title with Logo ------------------------------------------------------------------------------------------------------------------
 st.markdown(
     """